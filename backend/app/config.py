@@ -19,6 +19,18 @@ class Settings(BaseSettings):
     supabase_anon_key: str
     supabase_service_role_key: str
     
+    # JWT verification (local). Leave the secret empty to verify HS256
+    # tokens with the auth server; asymmetric tokens use the project JWKS.
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
+    jwks_cache_ttl: float = 600.0
+    
+    # Service-role client pool
+    supabase_pool_size: int = 2
+    supabase_pool_max_connections: int = 20
+    supabase_pool_max_keepalive: int = 10
+    supabase_pool_keepalive_expiry: float = 30.0
+    
     # Database Connection (lowercase to match Supabase format)
     user: str
     password: str
@@ -40,6 +52,43 @@ class Settings(BaseSettings):
     rate_limit_default: int = 60  # General endpoints
     rate_limit_auth: int = 10     # Auth endpoints (login, signup)
     rate_limit_strict: int = 5    # Sensitive endpoints (password reset)
+    # Failed-login tracking (lockouts share RATE_LIMIT_STORAGE_URI when it's Redis)
+    login_tracker_max_keys: int = 100000  # emails tracked per worker in memory
+    login_tracker_sweep_interval: float = 300.0  # seconds, 0 disables
+    # Counter storage shared by all workers, e.g. redis://host:6379/0
+    # (memory:// counts per process). Strategy: sliding-window-counter,
+    # moving-window or fixed-window.
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_strategy: str = "sliding-window-counter"
+    
+    # Caching (seconds)
+    store_settings_cache_ttl: float = 5.0
+    role_cache_ttl: float = 60.0
+    role_cache_size: int = 4096
+    catalog_cache_ttl: float = 300.0
+    
+    # Idempotency keys for order creation (shared via RATE_LIMIT_STORAGE_URI
+    # when it's Redis)
+    idempotency_key_ttl: float = 86400.0  # seconds
+    idempotency_store_size: int = 10000  # keys per worker in memory
+    
+    # HTTP caching of public GETs (seconds): browsers, shared caches / CDN,
+    # and how long a shared cache may serve stale while it revalidates
+    http_cache_max_age: int = 30
+    http_cache_s_maxage: int = 60
+    http_cache_stale_while_revalidate: int = 300
+    
+    # WebSocket fan-out: messages buffered per client, and how long a
+    # client may take to accept one before it's disconnected (seconds)
+    websocket_queue_size: int = 32
+    websocket_send_timeout: float = 5.0
+    # Relays broadcasts between workers: empty for in-process, or a direct /
+    # session-mode Postgres URL (port 5432) for LISTEN/NOTIFY
+    event_bus_url: str = ""
+    
+    # Dashboard metrics
+    dashboard_period_days: int = 30
+    metrics_reconcile_interval: float = 900.0  # seconds, 0 disables
     
     # Cloudinary
     cloudinary_cloud_name: str = ""
@@ -1,7 +1,13 @@
 """
 Supabase client configuration.
 """
-from supabase import create_client, Client
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+from supabase import create_client, Client, AsyncClientOptions
 from supabase._async.client import AsyncClient, create_client as create_async_client
 
 from app.config import get_settings
@@ -9,6 +15,7 @@ from app.config import get_settings
 
 _supabase_client: Client | None = None
 _supabase_async_client: AsyncClient | None = None
+_admin_client_pool: "SupabaseClientPool | None" = None
 
 
 def get_supabase_client() -> Client:
@@ -35,10 +42,153 @@ async def get_supabase_async_client() -> AsyncClient:
     return _supabase_async_client
 
 
-def get_supabase_admin_client() -> Client:
-    """Get Supabase client with service role key for admin operations."""
-    settings = get_settings()
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key
-    )
+class SupabaseClientPool:
+    """
+    Pool of service-role async clients with bounded concurrency.
+    
+    Each client owns a keep-alive httpx connection pool, so leasing a client
+    reuses warm TLS connections instead of building a new session per call.
+    A lease takes one connection slot on the least busy client; once every
+    slot is taken, callers wait (and the wait is recorded in the metrics).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        size: int = 2,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.url = url
+        self.key = key
+        self.size = size
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.transport = transport
+        self.capacity = size * max_connections
+        self._clients: list[AsyncClient] = []
+        self._leases: list[int] = []
+        self._slots: asyncio.Semaphore | None = None
+        
+        # Metrics
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the pool's clients have been created."""
+        return self._slots is not None
+
+    def open(self) -> None:
+        """Create the pooled clients (idempotent)."""
+        if self.is_open:
+            return
+        
+        for _ in range(self.size):
+            http_client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                follow_redirects=True,
+                transport=self.transport,
+            )
+            self._clients.append(AsyncClient(
+                self.url,
+                self.key,
+                AsyncClientOptions(httpx_client=http_client),
+            ))
+            self._leases.append(0)
+        self._slots = asyncio.Semaphore(self.capacity)
+
+    async def close(self) -> None:
+        """Close every pooled client's HTTP connections."""
+        for client in self._clients:
+            await client.options.httpx_client.aclose()
+        self._clients.clear()
+        self._leases.clear()
+        self._slots = None
+        self._in_use = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncClient]:
+        """Lease a client, waiting if every connection slot is in use."""
+        self.open()
+        slots = self._slots
+        
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+        waited = time.perf_counter() - start
+        
+        index = min(range(len(self._leases)), key=self._leases.__getitem__)
+        self._leases[index] += 1
+        self._in_use += 1
+        self._acquired += 1
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+        try:
+            yield self._clients[index]
+        finally:
+            if self._slots is slots:
+                self._leases[index] -= 1
+                self._in_use -= 1
+            slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of pool usage metrics."""
+        return {
+            "clients": self.size,
+            "capacity": self.capacity,
+            "in_use": self._in_use,
+            "idle": self.capacity - self._in_use if self.is_open else 0,
+            "idle_clients": sum(1 for leases in self._leases if leases == 0),
+            "waiting": self._waiting,
+            "acquired": self._acquired,
+            "wait_time_avg_ms": round(self._wait_time_total / self._acquired * 1000, 3) if self._acquired else 0.0,
+            "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+        }
+
+
+def get_admin_client_pool() -> SupabaseClientPool:
+    """Get the shared service-role client pool (singleton)."""
+    global _admin_client_pool
+    if _admin_client_pool is None:
+        settings = get_settings()
+        _admin_client_pool = SupabaseClientPool(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            size=settings.supabase_pool_size,
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_pool_keepalive_expiry,
+        )
+    return _admin_client_pool
+
+
+async def close_admin_client_pool() -> None:
+    """Close the shared service-role client pool."""
+    global _admin_client_pool
+    if _admin_client_pool is not None:
+        await _admin_client_pool.close()
+        _admin_client_pool = None
+
+
+@asynccontextmanager
+async def admin_client() -> AsyncIterator[AsyncClient]:
+    """Lease a service-role client for admin / server-side operations."""
+    async with get_admin_client_pool().acquire() as client:
+        yield client
@@ -1,7 +1,8 @@
 """
 FastAPI application entry point.
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,7 +12,12 @@ from slowapi.errors import RateLimitExceeded
 
 from app.config import get_settings
 from app.api import api_router
+from app.database import get_admin_client_pool, close_admin_client_pool
+from app.services.admin.metrics import start_metrics_reconciler
+from app.services.products.catalog import get_product_catalog, sync_catalog
 from app.shared.rate_limit import limiter
+from app.shared.events import event_bus
+from app.shared.rate_limit_tracker import start_cleanup_task
 from app.shared.websocket import manager
 from app.shared.maintenance import check_maintenance_mode
 
@@ -22,8 +28,26 @@ async def lifespan(app: FastAPI):
     # Startup
     settings = get_settings()
     print(f"🚀 Starting ZenGlow API (debug={settings.debug})")
+    get_admin_client_pool().open()
+    # Warm the product catalog; requests fall back to the database if this fails
+    await get_product_catalog().ready()
+    reconciler = start_metrics_reconciler(settings.metrics_reconcile_interval)
+    sweeper = start_cleanup_task(settings.login_tracker_sweep_interval)
+    # Fan out product changes from every worker to this worker's sockets,
+    # and apply other workers' changes to this worker's catalog
+    event_bus.subscribe(manager.broadcast)
+    event_bus.subscribe(sync_catalog, local=False)
+    await event_bus.start()
     yield
     # Shutdown
+    for task in (reconciler, sweeper):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await event_bus.close()
+    await manager.close()
+    await close_admin_client_pool()
     print("👋 Shutting down ZenGlow API")
 
 
@@ -56,8 +80,9 @@ def create_app() -> FastAPI:
             "Accept",
             "Origin",
             "X-Requested-With",
+            "Idempotency-Key",
         ],
-        expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+        expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Idempotent-Replayed"],
         max_age=600,  # Cache preflight for 10 minutes
     )
     
@@ -83,6 +108,8 @@ def create_app() -> FastAPI:
                 # Keep connection alive - client can send ping
                 await websocket.receive_text()
         except WebSocketDisconnect:
+            pass
+        finally:
             manager.disconnect(websocket, "products")
     
     # Register API routes
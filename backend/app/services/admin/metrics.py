@@ -0,0 +1,31 @@
+"""
+Background reconciliation of the dashboard metrics store.
+
+daily_metrics is kept current by database triggers on orders, user_profiles
+and products. This job periodically rebuilds it from the source tables to
+repair any drift (bulk loads with triggers disabled, manual fixes).
+"""
+import asyncio
+
+from app.services.admin.repository import DashboardRepository
+
+
+async def reconcile_metrics_forever(interval: float) -> None:
+    """Reconcile daily_metrics every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            corrected = await DashboardRepository.reconcile_metrics()
+        except Exception as e:
+            print(f"⚠️ Dashboard metrics reconciliation failed: {e}")
+            continue
+        
+        if corrected:
+            print(f"🔧 Reconciled dashboard metrics ({corrected} rows corrected)")
+
+
+def start_metrics_reconciler(interval: float) -> asyncio.Task | None:
+    """Start the reconciliation task (None if disabled)."""
+    if interval <= 0:
+        return None
+    return asyncio.create_task(reconcile_metrics_forever(interval))
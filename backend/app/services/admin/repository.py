@@ -3,125 +3,117 @@ Repository layer for admin database operations.
 """
 from typing import Any
 
-from app.database import get_supabase_admin_client
+from supabase._async.client import AsyncClient
+
+from app.database import admin_client
+from app.services.orders.repository import AdminOrdersRepository
+from app.shared.pagination import CountMode, count_method, keyset_filter, paginate_rows
+from app.shared.security import invalidate_user_role
 
 
 class AdminRepository:
     """Data access layer for admin operations."""
 
     @staticmethod
-    async def get_all_users(page: int = 1, page_size: int = 20) -> tuple[list[dict[str, Any]], int]:
-        """
-        Get all users with their profiles.
-        Returns (users, total_count).
-        """
-        client = get_supabase_admin_client()
-        
-        # Get total count
-        count_response = client.table("user_profiles").select("id", count="exact").execute()
-        total = count_response.count or 0
-        
-        # Get paginated users with profiles
-        offset = (page - 1) * page_size
-        response = (
-            client.table("user_profiles")
-            .select("*")
-            .order("created_at", desc=True)
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-        
-        profiles = response.data or []
+    async def attach_orders_counts(client: AsyncClient, users: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Attach orders_count to each user from one grouped aggregate query."""
+        user_ids = [user["id"] for user in users]
+        counts: dict[str, int] = {}
+        
+        if user_ids:
+            response = await (
+                client.table("user_order_counts")
+                .select("user_id, orders_count")
+                .in_("user_id", user_ids)
+                .execute()
+            )
+            counts = {row["user_id"]: row["orders_count"] for row in response.data or []}
         
-        # Get auth users to get emails
-        users_with_emails = []
-        for profile in profiles:
-            try:
-                auth_user = client.auth.admin.get_user_by_id(profile["id"])
-                users_with_emails.append({
-                    **profile,
-                    "email": auth_user.user.email if auth_user.user else None,
-                    "auth_created_at": auth_user.user.created_at if auth_user.user else None,
-                })
-            except Exception:
-                # If user not found in auth, skip
-                users_with_emails.append({
-                    **profile,
-                    "email": None,
-                    "auth_created_at": None,
-                })
+        for user in users:
+            user["orders_count"] = counts.get(user["id"], 0)
         
-        return users_with_emails, total
+        return users
 
     @staticmethod
-    async def get_user_by_id(user_id: str) -> dict[str, Any] | None:
-        """Get a single user with profile."""
-        client = get_supabase_admin_client()
-        
-        # Get profile
-        profile_response = (
-            client.table("user_profiles")
-            .select("*")
-            .eq("id", user_id)
-            .execute()
-        )
-        
-        if not profile_response.data or len(profile_response.data) == 0:
-            return None
-        
-        profile = profile_response.data[0]
+    async def get_all_users(
+        page: int = 1,
+        page_size: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "estimated",
+    ) -> tuple[list[dict[str, Any]], int | None, str | None]:
+        """
+        Get all users with their profiles, emails and order counts.
+        Returns (users, total_count, next_cursor).
         
-        # Get auth user for email
-        try:
-            auth_user = client.auth.admin.get_user_by_id(user_id)
-            profile["email"] = auth_user.user.email if auth_user.user else None
-            profile["auth_created_at"] = auth_user.user.created_at if auth_user.user else None
-        except Exception:
-            profile["email"] = None
-            profile["auth_created_at"] = None
+        Pages resume after `cursor` when given (keyset); `page` is only used
+        without one. Emails are mirrored on user_profiles, so a page costs
+        two round trips: the profile page and one grouped order-count query.
+        """
+        async with admin_client() as client:
+            query = (
+                client.table("user_profiles")
+                .select("*", count=count_method(count))
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+            )
+            if cursor:
+                query = query.or_(keyset_filter(cursor)).limit(page_size + 1)
+            else:
+                offset = (page - 1) * page_size
+                query = query.range(offset, offset + page_size)
+            
+            response = await query.execute()
+            users, next_cursor = paginate_rows(response.data or [], page_size)
+            
+            await AdminRepository.attach_orders_counts(client, users)
         
-        return profile
+        return users, response.count, next_cursor
 
     @staticmethod
-    async def get_user_orders_count(user_id: str) -> int:
-        """Get count of orders for a user."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("orders")
-            .select("id", count="exact")
-            .eq("user_id", user_id)
-            .execute()
-        )
+    async def get_user_by_id(user_id: str) -> dict[str, Any] | None:
+        """Get a single user with profile, email and order count."""
+        async with admin_client() as client:
+            profile_response = await (
+                client.table("user_profiles")
+                .select("*")
+                .eq("id", user_id)
+                .execute()
+            )
+            
+            if not profile_response.data:
+                return None
+            
+            profile = profile_response.data[0]
+            await AdminRepository.attach_orders_counts(client, [profile])
         
-        return response.count or 0
+        return profile
 
     @staticmethod
     async def update_user_role(user_id: str, role: str) -> dict[str, Any] | None:
         """Update user role."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("user_profiles")
-            .update({"role": role})
-            .eq("id", user_id)
-            .execute()
-        )
+        async with admin_client() as client:
+            response = await (
+                client.table("user_profiles")
+                .update({"role": role})
+                .eq("id", user_id)
+                .execute()
+            )
         
+        invalidate_user_role(user_id)
         return response.data[0] if response.data else None
 
     @staticmethod
     async def update_user_status(user_id: str, status: str) -> dict[str, Any] | None:
         """Update user status."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("user_profiles")
-            .update({"status": status})
-            .eq("id", user_id)
-            .execute()
-        )
+        async with admin_client() as client:
+            response = await (
+                client.table("user_profiles")
+                .update({"status": status})
+                .eq("id", user_id)
+                .execute()
+            )
         
+        invalidate_user_role(user_id)
         return response.data[0] if response.data else None
 
 
@@ -131,137 +123,74 @@ class StoreSettingsRepository:
     @staticmethod
     async def get_settings() -> dict[str, Any] | None:
         """Get store settings (first row)."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("store_settings")
-            .select("*")
-            .limit(1)
-            .execute()
-        )
-        
-        return response.data[0] if response.data else None
+        async with admin_client() as client:
+            response = await (
+                client.table("store_settings")
+                .select("*")
+                .limit(1)
+                .execute()
+            )
+            
+            return response.data[0] if response.data else None
 
     @staticmethod
     async def update_settings(data: dict[str, Any]) -> dict[str, Any] | None:
         """Update store settings."""
-        client = get_supabase_admin_client()
-        
         # Get current settings ID
         current = await StoreSettingsRepository.get_settings()
-        if not current:
-            # Create if not exists
-            response = client.table("store_settings").insert(data).execute()
-            return response.data[0] if response.data else None
-        
-        # Update
-        response = (
-            client.table("store_settings")
-            .update(data)
-            .eq("id", current["id"])
-            .execute()
-        )
         
-        return response.data[0] if response.data else None
+        async with admin_client() as client:
+            if not current:
+                # Create if not exists
+                response = await client.table("store_settings").insert(data).execute()
+                return response.data[0] if response.data else None
+            
+            # Update
+            response = await (
+                client.table("store_settings")
+                .update(data)
+                .eq("id", current["id"])
+                .execute()
+            )
+            
+            return response.data[0] if response.data else None
 
 
 class DashboardRepository:
     """Data access layer for dashboard statistics."""
 
     @staticmethod
-    async def get_total_revenue() -> float:
-        """Get total revenue from completed orders."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("orders")
-            .select("total")
-            .eq("status", "completed")
-            .execute()
-        )
-        
-        orders = response.data or []
-        return sum(order.get("total", 0) for order in orders)
-
-    @staticmethod
-    async def get_orders_count(status: str | None = None) -> int:
-        """Get count of orders, optionally filtered by status."""
-        client = get_supabase_admin_client()
-        
-        query = client.table("orders").select("id", count="exact")
-        if status:
-            query = query.eq("status", status)
-        
-        response = query.execute()
-        return response.count or 0
-
-    @staticmethod
-    async def get_customers_count() -> int:
-        """Get total count of customers (users with customer role)."""
-        client = get_supabase_admin_client()
+    async def get_metrics(period_days: int = 30) -> dict[str, dict[str, Any]]:
+        """
+        Get precomputed dashboard metrics.
         
-        response = (
-            client.table("user_profiles")
-            .select("id", count="exact")
-            .eq("role", "customer")
-            .execute()
-        )
+        Returns "totals", "current" (last period_days) and "previous" (the
+        period before that), each mapping metric name to value. Read from
+        daily_metrics, so the cost doesn't grow with the number of orders.
+        """
+        async with admin_client() as client:
+            response = await client.rpc("dashboard_metrics", {"p_period_days": period_days}).execute()
         
-        return response.count or 0
+        return response.data or {}
 
     @staticmethod
-    async def get_products_count() -> int:
-        """Get total count of active products."""
-        client = get_supabase_admin_client()
+    async def reconcile_metrics() -> int:
+        """Rebuild daily_metrics from the source tables; returns rows corrected."""
+        async with admin_client() as client:
+            response = await client.rpc("reconcile_daily_metrics").execute()
         
-        response = (
-            client.table("products")
-            .select("id", count="exact")
-            .eq("is_active", True)
-            .execute()
-        )
-        
-        return response.count or 0
+        return response.data or 0
 
     @staticmethod
     async def get_recent_orders(limit: int = 5) -> list[dict]:
         """Get most recent orders with customer info."""
-        client = get_supabase_admin_client()
-        
-        # Get recent orders
-        orders_response = (
-            client.table("orders")
-            .select("*")
-            .order("created_at", desc=True)
-            .limit(limit)
-            .execute()
-        )
-        
-        orders = orders_response.data or []
-        
-        # Enrich with customer info and item count
-        for order in orders:
-            # Get customer name
-            try:
-                profile_response = (
-                    client.table("user_profiles")
-                    .select("full_name")
-                    .eq("id", order["user_id"])
-                    .single()
-                    .execute()
-                )
-                order["customer_name"] = profile_response.data.get("full_name") if profile_response.data else "Unknown"
-            except Exception:
-                order["customer_name"] = "Unknown"
-            
-            # Get item count
-            items_response = (
-                client.table("order_items")
-                .select("id", count="exact")
-                .eq("order_id", order["id"])
+        async with admin_client() as client:
+            response = await (
+                client.table("orders")
+                .select(AdminOrdersRepository.ORDER_LIST_SELECT)
+                .order("created_at", desc=True)
+                .limit(limit)
                 .execute()
             )
-            order["items_count"] = items_response.count or 0
-        
-        return orders
-
+            
+            return await AdminOrdersRepository.enrich_orders(client, response.data or [])
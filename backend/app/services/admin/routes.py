@@ -6,8 +6,17 @@ from typing import Any
 from fastapi import APIRouter, Depends, Request, Query
 
 from app.config import get_settings
-from app.shared.security import require_admin
+from app.database import get_admin_client_pool
+from app.shared.events import event_bus
+from app.shared.http_cache import http_cache_stats
+from app.shared.idempotency import idempotency_store
+from app.shared.pagination import CountMode
+from app.shared.rate_limit_tracker import login_tracker
+from app.shared.security import require_admin, role_cache
+from app.shared.store_config import store_settings_cache
+from app.shared.websocket import manager
 from app.shared.rate_limit import limiter
+from app.services.products.catalog import get_product_catalog
 from app.services.admin.schemas import (
     AdminUserResponse,
     AdminUserListResponse,
@@ -53,14 +62,20 @@ async def list_users(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("estimated"),
     current_user: dict[str, Any] = Depends(require_admin)
 ) -> AdminUserListResponse:
     """
-    Get paginated list of all users.
+    Get paginated list of all users, newest first.
+    
+    Pass the returned `next_cursor` as `cursor` for the next page; cursor
+    pages cost the same at any depth. `count` picks an exact total, a
+    cheap estimate for large tables, or none.
     
     Requires admin role.
     """
-    return await AdminService.list_users(page, page_size)
+    return await AdminService.list_users(page, page_size, cursor=cursor, count=count)
 
 
 @router.get(
@@ -122,6 +137,33 @@ async def update_user_status(
     return await AdminService.update_user_status(user_id, data)
 
 
+@router.get(
+    "/metrics",
+    summary="Get runtime metrics",
+)
+@limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
+async def get_runtime_metrics(
+    request: Request,
+    current_user: dict[str, Any] = Depends(require_admin)
+) -> dict[str, Any]:
+    """
+    Get in-process runtime metrics (connection pools, caches).
+    
+    Requires admin role.
+    """
+    return {
+        "supabase_pool": get_admin_client_pool().stats(),
+        "store_settings_cache": store_settings_cache.stats(),
+        "role_cache": role_cache.stats(),
+        "product_catalog": get_product_catalog().stats(),
+        "http_cache": http_cache_stats.stats(),
+        "idempotency": idempotency_store.stats(),
+        "login_tracker": login_tracker.stats(),
+        "websockets": manager.stats(),
+        "event_bus": event_bus.stats(),
+    }
+
+
 # Store Settings Routes
 @router.get(
     "/settings",
@@ -23,10 +23,11 @@ class AdminUserResponse(BaseModel):
 class AdminUserListResponse(BaseModel):
     """Paginated list of users."""
     users: list[AdminUserResponse]
-    total: int
+    total: int | None = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
 
 
 class UserRoleUpdate(BaseModel):
@@ -46,6 +47,8 @@ class DashboardStat(BaseModel):
     value: str
     change: str
     change_positive: bool = True
+    # What `change` measures, when it isn't obvious from the name
+    change_label: str | None = None
 
 
 class RecentOrderResponse(BaseModel):
@@ -1,13 +1,17 @@
 """
 Admin service - business logic layer.
 """
-import math
+import asyncio
 from typing import Any
 
+from app.config import get_settings
 from app.shared.exceptions import NotFoundError
+from app.shared.pagination import CountMode, total_pages
+from app.shared.store_config import get_store_settings, invalidate_store_settings, set_store_settings
 from app.services.admin.schemas import (
     AdminUserResponse,
     AdminUserListResponse,
+    DashboardStat,
     UserRoleUpdate,
     UserStatusUpdate,
 )
@@ -22,36 +26,42 @@ class AdminService:
     """Admin business logic."""
 
     @staticmethod
-    async def list_users(page: int = 1, page_size: int = 20) -> AdminUserListResponse:
+    def _to_response(user: dict[str, Any]) -> AdminUserResponse:
+        """Build an admin user response from a repository row."""
+        return AdminUserResponse(
+            id=user["id"],
+            email=user.get("email") or "",
+            full_name=user.get("full_name"),
+            phone=user.get("phone"),
+            avatar_url=user.get("avatar_url"),
+            role=user.get("role", "customer"),
+            status=user.get("status", "active"),
+            created_at=user.get("created_at"),
+            updated_at=user.get("updated_at"),
+            orders_count=user.get("orders_count", 0),
+        )
+
+    @staticmethod
+    async def list_users(
+        page: int = 1,
+        page_size: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "estimated",
+    ) -> AdminUserListResponse:
         """Get paginated list of all users."""
-        users_data, total = await AdminRepository.get_all_users(page, page_size)
-        
-        users = []
-        for user in users_data:
-            # Get orders count for each user
-            orders_count = await AdminRepository.get_user_orders_count(user["id"])
-            
-            users.append(AdminUserResponse(
-                id=user["id"],
-                email=user.get("email") or "",
-                full_name=user.get("full_name"),
-                phone=user.get("phone"),
-                avatar_url=user.get("avatar_url"),
-                role=user.get("role", "customer"),
-                status=user.get("status", "active"),
-                created_at=user.get("auth_created_at") or user.get("created_at"),
-                updated_at=user.get("updated_at"),
-                orders_count=orders_count,
-            ))
+        users_data, total, next_cursor = await AdminRepository.get_all_users(
+            page, page_size, cursor=cursor, count=count
+        )
         
-        total_pages = math.ceil(total / page_size) if total > 0 else 1
+        users = [AdminService._to_response(user) for user in users_data]
         
         return AdminUserListResponse(
             users=users,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            total_pages=total_pages(total, page_size),
+            next_cursor=next_cursor,
         )
 
     @staticmethod
@@ -62,20 +72,7 @@ class AdminService:
         if not user:
             raise NotFoundError("User")
         
-        orders_count = await AdminRepository.get_user_orders_count(user_id)
-        
-        return AdminUserResponse(
-            id=user["id"],
-            email=user.get("email") or "",
-            full_name=user.get("full_name"),
-            phone=user.get("phone"),
-            avatar_url=user.get("avatar_url"),
-            role=user.get("role", "customer"),
-            status=user.get("status", "active"),
-            created_at=user.get("auth_created_at") or user.get("created_at"),
-            updated_at=user.get("updated_at"),
-            orders_count=orders_count,
-        )
+        return AdminService._to_response(user)
 
     @staticmethod
     async def update_user_role(user_id: str, data: UserRoleUpdate) -> AdminUserResponse:
@@ -111,8 +108,8 @@ class StoreSettingsService:
 
     @staticmethod
     async def get_settings() -> StoreSettingsResponse:
-        """Get store settings."""
-        settings = await StoreSettingsRepository.get_settings()
+        """Get store settings (served from the in-process cache)."""
+        settings = await get_store_settings()
         
         if not settings:
             # Return defaults
@@ -147,11 +144,53 @@ class StoreSettingsService:
         update_data = data.model_dump(exclude_none=True)
         
         if update_data:
-            await StoreSettingsRepository.update_settings(update_data)
+            try:
+                updated = await StoreSettingsRepository.update_settings(update_data)
+            except Exception:
+                # The write may have landed; don't keep serving the old row
+                invalidate_store_settings()
+                raise
+            
+            if updated:
+                set_store_settings(updated)
+            else:
+                invalidate_store_settings()
         
         return await StoreSettingsService.get_settings()
 
 
+def _percent_change(current: Any, previous: Any) -> float:
+    """Period-over-period change in percent (0 when there's no baseline)."""
+    current = float(current or 0)
+    previous = float(previous or 0)
+    if previous == 0:
+        return 0.0
+    return (current - previous) / previous * 100
+
+
+def _count_stat(
+    name: str, metric: str, totals: dict[str, Any], current: dict[str, Any], change_label: str
+) -> DashboardStat:
+    """
+    Build a count stat whose change is the net contribution of rows created
+    this period.
+
+    daily_metrics credits every +1/-1 to the row's created_at day (see
+    migration 010), so a status change on an older row moves an earlier
+    day, not this period. The change therefore isn't "net added this period"
+    for status-based metrics; `change_label` says what it does measure.
+    """
+    total = int(totals.get(metric) or 0)
+    added = int(current.get(metric) or 0)
+    return DashboardStat(
+        name=name,
+        value=f"{total:,}",
+        change=f"{added:+,}",
+        change_positive=added >= 0,
+        change_label=change_label,
+    )
+
+
 class DashboardService:
     """Dashboard business logic."""
 
@@ -161,46 +200,39 @@ class DashboardService:
         from app.services.admin.schemas import DashboardStat, RecentOrderResponse, DashboardResponse
         from app.services.admin.repository import DashboardRepository
         
-        # Fetch all stats
-        total_revenue = await DashboardRepository.get_total_revenue()
-        active_orders = await DashboardRepository.get_orders_count(status="pending")
-        total_customers = await DashboardRepository.get_customers_count()
-        total_products = await DashboardRepository.get_products_count()
+        # Independent pieces run concurrently: precomputed metrics, recent
+        # orders (orders + one profile lookup) and store settings for the currency.
+        period_days = get_settings().dashboard_period_days
+        metrics, recent_orders_data, settings = await asyncio.gather(
+            DashboardRepository.get_metrics(period_days=period_days),
+            DashboardRepository.get_recent_orders(limit=5),
+            StoreSettingsService.get_settings(),
+        )
         
-        # Format currency - get store settings for currency symbol
-        settings = await StoreSettingsService.get_settings()
+        totals = metrics.get("totals") or {}
+        current = metrics.get("current") or {}
+        previous = metrics.get("previous") or {}
         currency_symbol = settings.currency_symbol
         
+        total_revenue = float(totals.get("revenue") or 0)
+        revenue_change = _percent_change(current.get("revenue"), previous.get("revenue"))
+        
         stats = [
             DashboardStat(
                 name="Total Revenue",
                 value=f"{currency_symbol}{total_revenue:,.2f}",
-                change="+0%",  # Would need historical data for real change
-                change_positive=True,
-            ),
-            DashboardStat(
-                name="Active Orders",
-                value=str(active_orders),
-                change="+0",
-                change_positive=True,
-            ),
-            DashboardStat(
-                name="Total Customers",
-                value=f"{total_customers:,}",
-                change="+0",
-                change_positive=True,
-            ),
-            DashboardStat(
-                name="Products",
-                value=str(total_products),
-                change="+0",
-                change_positive=True,
+                change=f"{revenue_change:+.1f}%",
+                change_positive=revenue_change >= 0,
+                change_label=f"Completed orders placed in the last {period_days} days vs the {period_days} before",
             ),
+            _count_stat("Active Orders", "orders_pending", totals, current,
+                        f"Still pending among orders placed in the last {period_days} days"),
+            _count_stat("Total Customers", "customers", totals, current,
+                        f"Signed up in the last {period_days} days"),
+            _count_stat("Products", "products_active", totals, current,
+                        f"Active among products added in the last {period_days} days"),
         ]
         
-        # Get recent orders
-        recent_orders_data = await DashboardRepository.get_recent_orders(limit=5)
-        
         recent_orders = []
         for order in recent_orders_data:
             created_at = order.get("created_at", "")
@@ -114,10 +114,7 @@ class AuthService:
             
             if not response.user or not response.session:
                 # Record failed attempt
-                await login_tracker.record_failed_attempt(data.email)
-                
-                # Get remaining attempts
-                remaining = await login_tracker.get_remaining_attempts(data.email)
+                remaining = await login_tracker.record_failed_attempt(data.email)
                 
                 if remaining > 0:
                     raise AuthenticationError(
@@ -148,10 +145,7 @@ class AuthService:
             raise
         except Exception:
             # Record failed attempt
-            await login_tracker.record_failed_attempt(data.email)
-            
-            # Get remaining attempts
-            remaining = await login_tracker.get_remaining_attempts(data.email)
+            remaining = await login_tracker.record_failed_attempt(data.email)
             
             if remaining > 0:
                 raise AuthenticationError(
@@ -237,7 +231,7 @@ class AuthService:
             phone=profile.get("phone") if profile else None,
             avatar_url=profile.get("avatar_url") if profile else None,
             role=profile.get("role", "customer") if profile else "customer",
-            created_at=user_data.get("created_at"),
+            created_at=user_data.get("created_at") or (profile.get("created_at") if profile else None),
             updated_at=profile.get("updated_at") if profile else None,
         )
 
@@ -0,0 +1,133 @@
+"""
+Server-side order pricing.
+
+Checkout and cart quotes are priced here from live product rows and the
+cached store settings; the client only supplies product IDs and quantities.
+All lines are resolved with one batched product lookup, amounts stay Decimal
+throughout, and each line and total is rounded to cents exactly once.
+"""
+import asyncio
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable
+
+from app.shared.exceptions import ValidationError
+from app.shared.store_config import get_store_settings
+from app.services.products.repository import ProductRepository
+
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Convert a NUMERIC value from PostgREST (number, string or None) without float error."""
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def to_money(amount: Decimal) -> Decimal:
+    """Round an amount to cents, half up."""
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def merge_lines(items: Iterable[dict[str, Any]]) -> dict[str, int]:
+    """Collapse order lines to {product_id: quantity}, keeping first-seen order."""
+    quantities: dict[str, int] = {}
+    for item in items:
+        quantities[item["product_id"]] = quantities.get(item["product_id"], 0) + item["quantity"]
+    return quantities
+
+
+def _is_available(product: dict[str, Any] | None, quantity: int) -> bool:
+    # Same rule as place_order(), so a quote that passes doesn't fail at checkout
+    return (
+        bool(product)
+        and product.get("is_active", True)
+        and product.get("in_stock", True)
+        and (product.get("stock") or 0) >= quantity
+    )
+
+
+def price_lines(
+    quantities: dict[str, int],
+    products: dict[str, dict[str, Any]],
+    settings: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """
+    Price order lines against product rows and store settings.
+
+    Args:
+        quantities: {product_id: quantity}, as from merge_lines
+        products: Product rows by ID
+        settings: store_settings row (None prices with no tax or shipping)
+
+    Returns:
+        Priced items plus Decimal subtotal, shipping, tax and total
+
+    Raises:
+        ValidationError: If a product is unknown, inactive or short of stock
+    """
+    unavailable = [
+        product_id for product_id, quantity in quantities.items()
+        if not _is_available(products.get(product_id), quantity)
+    ]
+    if unavailable:
+        raise ValidationError(f"Products not available: {', '.join(unavailable)}")
+
+    items = []
+    subtotal = ZERO
+    for product_id, quantity in quantities.items():
+        product = products[product_id]
+        price = to_money(to_decimal(product["price"]))
+        line_total = price * quantity
+        subtotal += line_total
+        images = product.get("images") or []
+        items.append({
+            "product_id": product_id,
+            "name": product["name"],
+            "type": product.get("product_type"),
+            "price": price,
+            "quantity": quantity,
+            "image": images[0] if images else None,
+            "line_total": line_total,
+        })
+
+    settings = settings or {}
+    tax_rate = to_decimal(settings.get("tax_rate"))
+    free_shipping_threshold = to_decimal(settings.get("free_shipping_threshold"))
+
+    # A threshold of 0 (or none) disables free shipping
+    if free_shipping_threshold > 0 and subtotal >= free_shipping_threshold:
+        shipping = ZERO
+    else:
+        shipping = to_money(to_decimal(settings.get("shipping_fee")))
+
+    # tax_rate is a percentage of the merchandise subtotal
+    tax = to_money(subtotal * tax_rate / 100)
+
+    return {
+        "items": items,
+        "subtotal": subtotal,
+        "shipping": shipping,
+        "tax": tax,
+        "total": subtotal + shipping + tax,
+        "currency": settings.get("currency", "USD"),
+    }
+
+
+async def quote_order(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Price order lines from live product prices and the cached store settings.
+
+    The product lookup is one query for all lines; settings are usually
+    served from memory.
+    """
+    quantities = merge_lines(items)
+    products, settings = await asyncio.gather(
+        ProductRepository.get_by_ids(list(quantities)),
+        get_store_settings(),
+    )
+    return price_lines(quantities, {product["id"]: product for product in products}, settings)
@@ -3,252 +3,249 @@ Repository layer for orders database operations.
 """
 from typing import Any
 
-from app.database import get_supabase_client
+from supabase._async.client import AsyncClient
+
+from app.database import admin_client
+from app.shared.constants import DEFAULT_PAGE_SIZE
+from app.shared.pagination import CountMode, count_method, keyset_filter, paginate_rows
+
+
+# place_order() error raised when a line can't be filled
+INSUFFICIENT_STOCK = "insufficient_stock"
 
 
 class OrdersRepository:
     """Data access layer for orders."""
 
     @staticmethod
-    async def get_orders_by_user(user_id: str) -> list[dict[str, Any]]:
-        """Get all orders for a user with their items."""
-        client = get_supabase_client()
-        
-        # Get orders
-        response = (
-            client.table("orders")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
-        
-        orders = response.data or []
-        
-        # Get items for each order
-        for order in orders:
-            items_response = (
-                client.table("order_items")
-                .select("*")
-                .eq("order_id", order["id"])
+    async def get_orders_by_user(
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get a page of a user's orders with their items.
+        
+        Items are embedded in the same PostgREST request, so a page costs
+        one round trip. Returns (orders, next_cursor).
+        """
+        async with admin_client() as client:
+            query = (
+                client.table("orders")
+                .select("*, items:order_items(*)")
+                .eq("user_id", user_id)
+            )
+            
+            if cursor:
+                query = query.or_(keyset_filter(cursor))
+            
+            response = await (
+                query
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+                .limit(limit + 1)
                 .execute()
             )
-            order["items"] = items_response.data or []
         
-        return orders
+        return paginate_rows(response.data or [], limit)
 
     @staticmethod
     async def get_order_by_id(order_id: str, user_id: str) -> dict[str, Any] | None:
         """Get a single order with items."""
-        client = get_supabase_client()
-        
-        response = (
-            client.table("orders")
-            .select("*")
-            .eq("id", order_id)
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
-        
-        if not response.data:
-            return None
-        
-        order = response.data
-        
-        # Get items
-        items_response = (
-            client.table("order_items")
-            .select("*")
-            .eq("order_id", order_id)
-            .execute()
-        )
-        order["items"] = items_response.data or []
+        async with admin_client() as client:
+            response = await (
+                client.table("orders")
+                .select("*, items:order_items(*)")
+                .eq("id", order_id)
+                .eq("user_id", user_id)
+                .execute()
+            )
         
-        return order
+        return response.data[0] if response.data else None
 
     @staticmethod
     async def create_order(user_id: str, order_data: dict[str, Any]) -> dict[str, Any]:
-        """Create a new order with items."""
-        client = get_supabase_client()
-        
-        items = order_data.pop("items", [])
-        
-        # Calculate totals
-        subtotal = sum(item["price"] * item["quantity"] for item in items)
-        shipping = 0  # Could be calculated based on address
-        tax = subtotal * 0.08  # 8% tax example
-        total = subtotal + shipping + tax
-        
-        # Create order
-        order_response = (
-            client.table("orders")
-            .insert({
-                "user_id": user_id,
-                "subtotal": subtotal,
-                "shipping": shipping,
-                "tax": tax,
-                "total": total,
-                "shipping_address": order_data.get("shipping_address"),
-                "status": "pending",
-            })
-            .execute()
-        )
-        
-        order = order_response.data[0]
-        
-        # Create order items
-        if items:
-            items_data = [
-                {
-                    "order_id": order["id"],
-                    "product_id": item["product_id"],
-                    "name": item["name"],
-                    "type": item.get("type"),
-                    "price": item["price"],
-                    "quantity": item["quantity"],
-                    "image": item.get("image"),
-                }
-                for item in items
-            ]
-            items_response = client.table("order_items").insert(items_data).execute()
-            order["items"] = items_response.data
-        else:
-            order["items"] = []
-        
-        return order
+        """
+        Create a new order with items and reserve its stock.
+        
+        Expects an order priced by pricing.quote_order: items with their
+        resolved prices plus subtotal, shipping, tax and total. The
+        place_order() function writes the order, its items and the stock
+        decrements in one transaction and returns the order with `items` and
+        the updated `products` rows.
+        
+        Raises:
+            APIError: With message INSUFFICIENT_STOCK (product IDs in
+                details) if any line can't be filled; nothing is written
+        """
+        items = [
+            {
+                "product_id": item["product_id"],
+                "name": item["name"],
+                "type": item.get("type"),
+                "price": str(item["price"]),
+                "quantity": item["quantity"],
+                "image": item.get("image"),
+            }
+            for item in order_data.get("items", [])
+        ]
+        
+        async with admin_client() as client:
+            response = await client.rpc("place_order", {
+                "p_user_id": user_id,
+                "p_items": items,
+                "p_subtotal": str(order_data["subtotal"]),
+                "p_shipping": str(order_data["shipping"]),
+                "p_tax": str(order_data["tax"]),
+                "p_total": str(order_data["total"]),
+                "p_shipping_address": order_data.get("shipping_address"),
+            }).execute()
+        
+        return response.data
 
 
 class AdminOrdersRepository:
     """Data access layer for admin order operations."""
 
+    # Orders select with the per-order item count aggregated by PostgREST
+    ORDER_LIST_SELECT = "*, order_items(count)"
+
+    @staticmethod
+    async def enrich_orders(client: AsyncClient, orders: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Attach customer names and item counts to a page of orders.
+        
+        Expects rows selected with ORDER_LIST_SELECT. Customer names come from
+        one batched user_profiles lookup, so the cost is constant per page.
+        """
+        user_ids = list({order["user_id"] for order in orders})
+        names: dict[str, str | None] = {}
+        
+        if user_ids:
+            try:
+                profiles_response = await (
+                    client.table("user_profiles")
+                    .select("id, full_name")
+                    .in_("id", user_ids)
+                    .execute()
+                )
+                names = {
+                    profile["id"]: profile.get("full_name")
+                    for profile in profiles_response.data or []
+                }
+            except Exception:
+                names = {}
+        
+        for order in orders:
+            order["customer_name"] = names.get(order["user_id"]) or "Unknown"
+            counts = order.pop("order_items", None) or [{}]
+            order["items_count"] = counts[0].get("count", 0)
+        
+        return orders
+
     @staticmethod
     async def get_all_orders(
         page: int = 1,
         page_size: int = 20,
         status: str | None = None,
         search: str | None = None,
-    ) -> tuple[list[dict[str, Any]], int]:
-        """Get all orders with pagination and filters."""
-        from app.database import get_supabase_admin_client
-        
-        client = get_supabase_admin_client()
-        
-        # Build query
-        query = client.table("orders").select("*", count="exact")
-        
-        if status:
-            query = query.eq("status", status)
-        
-        # Get total count
-        count_query = client.table("orders").select("id", count="exact")
-        if status:
-            count_query = count_query.eq("status", status)
-        count_response = count_query.execute()
-        total = count_response.count or 0
-        
-        # Get paginated orders
-        offset = (page - 1) * page_size
-        orders_response = (
-            query
-            .order("created_at", desc=True)
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
+        cursor: str | None = None,
+        count: CountMode = "estimated",
+    ) -> tuple[list[dict[str, Any]], int | None, str | None]:
+        """
+        Get all orders with pagination and filters.
+        
+        Pages resume after `cursor` when given (keyset), so deep pages cost
+        the same as the first; `page` is only used without a cursor.
+        Costs two round trips regardless of page size: the page (with
+        embedded item counts) and one batched profile lookup.
+        Returns (orders, total, next_cursor).
+        """
+        async with admin_client() as client:
+            query = client.table("orders").select(
+                AdminOrdersRepository.ORDER_LIST_SELECT, count=count_method(count)
+            )
+            
+            if status:
+                query = query.eq("status", status)
+            
+            query = query.order("created_at", desc=True).order("id", desc=True)
+            if cursor:
+                query = query.or_(keyset_filter(cursor)).limit(page_size + 1)
+            else:
+                offset = (page - 1) * page_size
+                query = query.range(offset, offset + page_size)
+            
+            orders_response = await query.execute()
+            orders, next_cursor = paginate_rows(orders_response.data or [], page_size)
+            
+            await AdminOrdersRepository.enrich_orders(client, orders)
         
-        orders = orders_response.data or []
+        return orders, orders_response.count, next_cursor
+
+    @staticmethod
+    async def get_order_by_id(order_id: str) -> dict[str, Any] | None:
+        """Get a single order with items (admin - no user check)."""
+        from app.database import admin_client
         
-        # Enrich with customer info and items count
-        for order in orders:
-            # Get customer name
+        async with admin_client() as client:
+            response = await (
+                client.table("orders")
+                .select("*")
+                .eq("id", order_id)
+                .single()
+                .execute()
+            )
+            
+            if not response.data:
+                return None
+            
+            order = response.data
+            
+            # Get customer info
             try:
-                profile_response = (
+                profile_response = await (
                     client.table("user_profiles")
-                    .select("full_name")
+                    .select("full_name, phone")
                     .eq("id", order["user_id"])
                     .single()
                     .execute()
                 )
-                order["customer_name"] = profile_response.data.get("full_name") if profile_response.data else "Unknown"
+                if profile_response.data:
+                    order["customer_name"] = profile_response.data.get("full_name")
+                    order["customer_phone"] = profile_response.data.get("phone")
+                
+                # Get email
+                auth_user = await client.auth.admin.get_user_by_id(order["user_id"])
+                order["customer_email"] = auth_user.user.email if auth_user.user else None
             except Exception:
                 order["customer_name"] = "Unknown"
+                order["customer_email"] = None
+                order["customer_phone"] = None
             
-            # Get items count
-            items_response = (
+            # Get items
+            items_response = await (
                 client.table("order_items")
-                .select("id", count="exact")
-                .eq("order_id", order["id"])
-                .execute()
-            )
-            order["items_count"] = items_response.count or 0
-        
-        return orders, total
-
-    @staticmethod
-    async def get_order_by_id(order_id: str) -> dict[str, Any] | None:
-        """Get a single order with items (admin - no user check)."""
-        from app.database import get_supabase_admin_client
-        
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("orders")
-            .select("*")
-            .eq("id", order_id)
-            .single()
-            .execute()
-        )
-        
-        if not response.data:
-            return None
-        
-        order = response.data
-        
-        # Get customer info
-        try:
-            profile_response = (
-                client.table("user_profiles")
-                .select("full_name, phone")
-                .eq("id", order["user_id"])
-                .single()
+                .select("*")
+                .eq("order_id", order_id)
                 .execute()
             )
-            if profile_response.data:
-                order["customer_name"] = profile_response.data.get("full_name")
-                order["customer_phone"] = profile_response.data.get("phone")
+            order["items"] = items_response.data or []
             
-            # Get email
-            auth_user = client.auth.admin.get_user_by_id(order["user_id"])
-            order["customer_email"] = auth_user.user.email if auth_user.user else None
-        except Exception:
-            order["customer_name"] = "Unknown"
-            order["customer_email"] = None
-            order["customer_phone"] = None
-        
-        # Get items
-        items_response = (
-            client.table("order_items")
-            .select("*")
-            .eq("order_id", order_id)
-            .execute()
-        )
-        order["items"] = items_response.data or []
-        
-        return order
+            return order
 
     @staticmethod
     async def update_order_status(order_id: str, status: str) -> dict[str, Any] | None:
         """Update order status."""
-        from app.database import get_supabase_admin_client
-        
-        client = get_supabase_admin_client()
+        from app.database import admin_client
         
-        response = (
-            client.table("orders")
-            .update({"status": status})
-            .eq("id", order_id)
-            .execute()
-        )
-        
-        return response.data[0] if response.data else None
+        async with admin_client() as client:
+            response = await (
+                client.table("orders")
+                .update({"status": status})
+                .eq("id", order_id)
+                .execute()
+            )
+            
+            return response.data[0] if response.data else None
 
@@ -3,15 +3,20 @@ Orders API routes.
 """
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request, Query
+from fastapi import APIRouter, Depends, Header, Request, Response, Query
 
 from app.config import get_settings
+from app.shared.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.shared.idempotency import REPLAYED_HEADER, idempotency_store, request_fingerprint
+from app.shared.pagination import CountMode
 from app.shared.security import get_current_user, require_admin
 from app.shared.rate_limit import limiter
 from app.services.orders.schemas import (
     OrderCreate,
     OrderResponse,
     OrderListResponse,
+    OrderQuoteRequest,
+    OrderQuoteResponse,
     AdminOrderListResponse,
     AdminOrderDetailResponse,
     OrderStatusUpdate,
@@ -30,15 +35,19 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 @limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
 async def list_orders(
     request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict[str, Any] = Depends(get_current_user)
 ) -> OrderListResponse:
     """
-    Get all orders for the current user.
+    Get the current user's orders, newest first.
+    
+    Pass the returned `next_cursor` as `cursor` to fetch the next page.
     
     Requires authentication.
     """
     user_id = current_user.get("id")
-    return await OrdersService.list_orders(user_id)
+    return await OrdersService.list_orders(user_id, limit=limit, cursor=cursor)
 
 
 @router.get(
@@ -69,16 +78,53 @@ async def get_order(
 @limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
 async def create_order(
     request: Request,
+    response: Response,
     data: OrderCreate,
+    idempotency_key: str | None = Header(None, min_length=1, max_length=255),
     current_user: dict[str, Any] = Depends(get_current_user)
 ) -> OrderResponse:
     """
     Create a new order.
     
+    Send a unique `Idempotency-Key` header to make retries safe: repeats of
+    the same key return the original order (with `Idempotent-Replayed:
+    true`) instead of placing another one, and reusing a key for a
+    different order is rejected with 422.
+    
     Requires authentication.
     """
     user_id = current_user.get("id")
-    return await OrdersService.create_order(user_id, data)
+    if idempotency_key is None:
+        return await OrdersService.create_order(user_id, data)
+    
+    order, replayed = await idempotency_store.run(
+        (request.url.path, user_id, idempotency_key),
+        request_fingerprint(data.model_dump_json()),
+        lambda: OrdersService.create_order(user_id, data),
+        OrderResponse,
+    )
+    if replayed:
+        response.headers[REPLAYED_HEADER] = "true"
+    return order
+
+
+@router.post(
+    "/quote",
+    response_model=OrderQuoteResponse,
+    summary="Quote cart totals",
+)
+@limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
+async def quote_order(
+    request: Request,
+    data: OrderQuoteRequest,
+) -> OrderQuoteResponse:
+    """
+    Price a cart with current product prices, tax and shipping.
+    
+    Uses the same computation as order creation, so the quoted total is
+    what checkout will charge unless prices or settings change meanwhile.
+    """
+    return await OrdersService.quote(data)
 
 
 # Admin routes
@@ -96,14 +142,20 @@ async def admin_list_orders(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status: str | None = Query(None),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("estimated"),
     current_user: dict[str, Any] = Depends(require_admin)
 ) -> AdminOrderListResponse:
     """
-    Get all orders with pagination and filters.
+    Get all orders with pagination and filters, newest first.
+    
+    Pass the returned `next_cursor` as `cursor` for the next page; cursor
+    pages cost the same at any depth. `count` picks an exact total, a
+    cheap estimate for large tables, or none.
     
     Requires admin role.
     """
-    return await AdminOrdersService.list_orders(page, page_size, status)
+    return await AdminOrdersService.list_orders(page, page_size, status, cursor=cursor, count=count)
 
 
 @admin_router.get(
@@ -3,6 +3,7 @@ Pydantic schemas for orders.
 """
 from datetime import datetime
 from typing import Any
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -17,9 +18,10 @@ class OrderItemBase(BaseModel):
     image: str | None = None
 
 
-class OrderItemCreate(OrderItemBase):
-    """Order item creation request."""
-    pass
+class OrderItemCreate(BaseModel):
+    """Order line in a create or quote request (priced server-side)."""
+    product_id: UUID
+    quantity: int = Field(1, ge=1)
 
 
 class OrderItemResponse(OrderItemBase):
@@ -39,10 +41,30 @@ class OrderBase(BaseModel):
 
 class OrderCreate(BaseModel):
     """Order creation request."""
-    items: list[OrderItemCreate]
+    items: list[OrderItemCreate] = Field(..., min_length=1)
     shipping_address: dict[str, Any] | None = None
 
 
+class OrderQuoteRequest(BaseModel):
+    """Cart quote request."""
+    items: list[OrderItemCreate] = Field(..., min_length=1)
+
+
+class OrderQuoteItem(OrderItemBase):
+    """Priced line in a quote."""
+    line_total: float
+
+
+class OrderQuoteResponse(BaseModel):
+    """Server-computed cart totals."""
+    items: list[OrderQuoteItem]
+    subtotal: float
+    shipping: float
+    tax: float
+    total: float
+    currency: str
+
+
 class OrderResponse(OrderBase):
     """Order response."""
     id: str
@@ -53,9 +75,9 @@ class OrderResponse(OrderBase):
 
 
 class OrderListResponse(BaseModel):
-    """List of orders response."""
+    """Cursor-paginated list of orders response (follow next_cursor for more)."""
     orders: list[OrderResponse]
-    total: int
+    next_cursor: str | None = None
 
 
 # Admin schemas
@@ -86,10 +108,11 @@ class AdminOrderDetailResponse(AdminOrderResponse):
 class AdminOrderListResponse(BaseModel):
     """Paginated list of orders for admin."""
     orders: list[AdminOrderResponse]
-    total: int
+    total: int | None = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
 
 
 class OrderStatusUpdate(BaseModel):
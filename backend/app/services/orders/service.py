@@ -3,31 +3,49 @@ Orders service - business logic layer.
 """
 from typing import Any
 
-from app.shared.exceptions import NotFoundError
+from postgrest.exceptions import APIError
+
+from app.shared.constants import DEFAULT_PAGE_SIZE
+from app.shared.events import event_bus
+from app.shared.exceptions import ConflictError, NotFoundError
+from app.shared.pagination import CountMode, total_pages
+from app.services.orders.pricing import quote_order
 from app.services.orders.schemas import (
     OrderCreate,
     OrderResponse,
     OrderListResponse,
     OrderItemResponse,
+    OrderQuoteItem,
+    OrderQuoteRequest,
+    OrderQuoteResponse,
 )
-from app.services.orders.repository import OrdersRepository
+from app.services.orders.repository import INSUFFICIENT_STOCK, OrdersRepository
+from app.services.products.catalog import get_product_catalog
 
 
 class OrdersService:
     """Orders business logic."""
 
     @staticmethod
-    async def list_orders(user_id: str) -> OrderListResponse:
+    async def list_orders(
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> OrderListResponse:
         """
-        Get all orders for a user.
+        Get a page of orders for a user.
         
         Args:
             user_id: User ID
+            limit: Maximum orders per page
+            cursor: Opaque cursor from the previous page's next_cursor
             
         Returns:
-            List of orders with items
+            Page of orders with items and the cursor for the next page
         """
-        orders_data = await OrdersRepository.get_orders_by_user(user_id)
+        orders_data, next_cursor = await OrdersRepository.get_orders_by_user(
+            user_id, limit=limit, cursor=cursor
+        )
         
         orders = [
             OrderResponse(
@@ -57,7 +75,7 @@ class OrdersService:
             for order in orders_data
         ]
         
-        return OrderListResponse(orders=orders, total=len(orders))
+        return OrderListResponse(orders=orders, next_cursor=next_cursor)
 
     @staticmethod
     async def get_order(order_id: str, user_id: str) -> OrderResponse:
@@ -104,24 +122,83 @@ class OrdersService:
             updated_at=order.get("updated_at"),
         )
 
+    @staticmethod
+    async def quote(data: OrderQuoteRequest) -> OrderQuoteResponse:
+        """
+        Price a cart without placing an order.
+        
+        Args:
+            data: Product IDs and quantities
+            
+        Returns:
+            Priced items and totals, computed as create_order would
+            
+        Raises:
+            ValidationError: If a product is unknown or unavailable
+        """
+        quote = await quote_order(item.model_dump(mode="json") for item in data.items)
+        
+        return OrderQuoteResponse(
+            items=[
+                OrderQuoteItem(
+                    product_id=item["product_id"],
+                    name=item["name"],
+                    type=item.get("type"),
+                    price=float(item["price"]),
+                    quantity=item["quantity"],
+                    image=item.get("image"),
+                    line_total=float(item["line_total"]),
+                )
+                for item in quote["items"]
+            ],
+            subtotal=float(quote["subtotal"]),
+            shipping=float(quote["shipping"]),
+            tax=float(quote["tax"]),
+            total=float(quote["total"]),
+            currency=quote["currency"],
+        )
+
     @staticmethod
     async def create_order(user_id: str, data: OrderCreate) -> OrderResponse:
         """
         Create a new order.
         
+        Prices come from the products table and tax and shipping from the
+        store settings; client-side prices are never trusted. The order,
+        its items and the stock decrements are written atomically.
+        
         Args:
             user_id: User ID
             data: Order creation data
             
         Returns:
             Created order
+            
+        Raises:
+            ValidationError: If a product is unknown or unavailable
+            ConflictError: If there isn't enough stock for a line
         """
-        order_data = {
-            "items": [item.model_dump() for item in data.items],
-            "shipping_address": data.shipping_address,
-        }
+        order_data = await quote_order(item.model_dump(mode="json") for item in data.items)
+        order_data["shipping_address"] = data.shipping_address
+        
+        try:
+            order = await OrdersRepository.create_order(user_id, order_data)
+        except APIError as e:
+            if e.message == INSUFFICIENT_STOCK:
+                raise ConflictError(f"Insufficient stock: {e.details}")
+            raise
         
-        order = await OrdersRepository.create_order(user_id, order_data)
+        # Keep this worker's catalog in step with the new stock levels, and
+        # tell the other workers to reload those products
+        catalog = get_product_catalog()
+        products = order.pop("products", [])
+        for product in products:
+            catalog.upsert(product)
+        if products:
+            event_bus.publish_nowait({
+                "type": "stock_updated",
+                "product_ids": [product["id"] for product in products],
+            }, "catalog")
         
         return OrderResponse(
             id=order["id"],
@@ -157,16 +234,19 @@ class AdminOrdersService:
         page: int = 1,
         page_size: int = 20,
         status: str | None = None,
+        cursor: str | None = None,
+        count: CountMode = "estimated",
     ) -> "AdminOrderListResponse":
         """Get all orders with pagination."""
-        import math
         from app.services.orders.schemas import AdminOrderResponse, AdminOrderListResponse
         from app.services.orders.repository import AdminOrdersRepository
         
-        orders_data, total = await AdminOrdersRepository.get_all_orders(
+        orders_data, total, next_cursor = await AdminOrdersRepository.get_all_orders(
             page=page,
             page_size=page_size,
             status=status,
+            cursor=cursor,
+            count=count,
         )
         
         orders = []
@@ -189,14 +269,13 @@ class AdminOrdersService:
                 updated_at=order.get("updated_at"),
             ))
         
-        total_pages = math.ceil(total / page_size) if total > 0 else 1
-        
         return AdminOrderListResponse(
             orders=orders,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            total_pages=total_pages(total, page_size),
+            next_cursor=next_cursor,
         )
 
     @staticmethod
@@ -0,0 +1,379 @@
+"""
+In-process product catalog snapshot.
+
+The catalog is small and changes rarely, so public reads are served from a
+copy of the products table held in memory. The snapshot is loaded at
+startup, patched by ProductService and OrdersService whenever they write,
+patched again on every other worker when the change arrives over the event
+bus (see sync_catalog), and reloaded after CATALOG_CACHE_TTL seconds as a
+backstop.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.shared.cache import TTLCache
+from app.shared.pagination import decode_cursor, paginate_rows
+from app.services.products.filter_index import FACETS, FilterIndex, MatchMode
+from app.services.products.repository import ProductRepository
+from app.services.products.search_index import FIELD_WEIGHTS, SearchIndex
+from app.services.products.suggest_index import SuggestIndex
+
+
+# Columns the facet, search and suggest indexes (and their caches) read
+INDEXED_FIELDS = tuple(dict.fromkeys(["is_active", *FACETS.values(), *FIELD_WEIGHTS]))
+
+
+def _sort_key(product: dict[str, Any]) -> tuple[str, str]:
+    return (product.get("created_at") or "", str(product.get("id", "")))
+
+
+def _indexed_values(product: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(product.get(field) for field in INDEXED_FIELDS)
+
+
+def _row_digest(product: dict[str, Any]) -> int:
+    """Stable 64-bit hash of a product's identity and last change."""
+    key = f"{product.get('id')}\0{product.get('updated_at')}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+class ProductCatalog:
+    """Snapshot of the products table, newest first."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._products: dict[str, dict[str, Any]] = {}
+        self._ordered: list[dict[str, Any]] = []
+        self._index: FilterIndex | None = None
+        self._index_version = -1
+        self.search_index = SearchIndex()
+        self.suggest_index = SuggestIndex()
+        # Facet counts per (snapshot version, filter selection)
+        self.facet_cache = TTLCache(maxsize=512, ttl=ttl)
+        # Search scores per (snapshot version, query)
+        self.search_cache = TTLCache(maxsize=256, ttl=ttl)
+        # Suggestions per (snapshot version, prefix, limit)
+        self.suggest_cache = TTLCache(maxsize=2048, ttl=ttl)
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        # Writes seen while a load is in flight (None = not loading)
+        self._pending: dict[str, dict[str, Any] | None] | None = None
+        # Bumped when the order or indexed fields change; keys the caches above
+        self.version = 0
+        # XOR of every product's _row_digest (see fingerprint)
+        self._digest = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether a snapshot is loaded and within its TTL."""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def load(self) -> None:
+        """Replace the snapshot with the current products table."""
+        self._pending = {}
+        try:
+            rows = await ProductRepository.get_all_rows()
+            products = {row["id"]: row for row in rows}
+            # Tokenizing a large catalog takes a while; keep the event loop free
+            search_index = await asyncio.to_thread(SearchIndex.build, rows)
+            suggest_index = await asyncio.to_thread(SuggestIndex.build, rows)
+            # Re-apply writes that raced with the fetch
+            for product_id, product in self._pending.items():
+                if product is None:
+                    products.pop(product_id, None)
+                    search_index.remove(product_id)
+                    suggest_index.remove(product_id)
+                else:
+                    products[product_id] = product
+                    search_index.add(product)
+                    suggest_index.add(product)
+        finally:
+            self._pending = None
+
+        self._products = products
+        self._digest = 0
+        for product in products.values():
+            self._digest ^= _row_digest(product)
+        self.search_index = search_index
+        self.suggest_index = suggest_index
+        self._reorder()
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+
+    async def ready(self) -> bool:
+        """
+        Make sure a fresh snapshot is loaded.
+
+        Concurrent callers share one reload. Returns False if the snapshot
+        can't be loaded, in which case callers should query the database.
+        """
+        if self.is_fresh:
+            return True
+
+        async with self._lock:
+            if self.is_fresh:
+                return True
+            try:
+                await self.load()
+            except Exception:
+                self.misses += 1
+                return False
+        return True
+
+    def _reorder(self) -> None:
+        self._ordered = sorted(self._products.values(), key=_sort_key, reverse=True)
+        self.version += 1
+
+    def upsert(self, product: dict[str, Any]) -> None:
+        """Add or replace a product after a write."""
+        if not product or "id" not in product:
+            return
+        if self._pending is not None:
+            self._pending[product["id"]] = product
+        previous = self._products.get(product["id"])
+        if previous is not None:
+            self._digest ^= _row_digest(previous)
+        self._digest ^= _row_digest(product)
+        self._products[product["id"]] = product
+
+        if previous is not None and _sort_key(previous) == _sort_key(product):
+            # Same place in the order (e.g. a stock or price change after a
+            # checkout): swap the row in place instead of re-sorting
+            position = self._position_after(_sort_key(product)) - 1
+            if position >= 0 and self._ordered[position]["id"] == product["id"]:
+                self._ordered[position] = product
+                if _indexed_values(previous) != _indexed_values(product):
+                    self.search_index.add(product)
+                    self.suggest_index.add(product)
+                    self.version += 1
+                return
+
+        self.search_index.add(product)
+        self.suggest_index.add(product)
+        self._reorder()
+
+    def remove(self, product_id: str) -> None:
+        """Drop a deleted product."""
+        if self._pending is not None:
+            self._pending[product_id] = None
+        previous = self._products.pop(product_id, None)
+        if previous is not None:
+            self._digest ^= _row_digest(previous)
+            self.search_index.remove(product_id)
+            self.suggest_index.remove(product_id)
+            self._reorder()
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Content hash of the snapshot, for HTTP validators.
+
+        Derived from every product's (id, updated_at) and kept up to date
+        incrementally, so workers holding the same data agree on it (unlike
+        `version`, which is local to the process).
+        """
+        return f"{len(self._products)}-{self._digest:016x}"
+
+    def invalidate(self) -> None:
+        """Force a reload on next access."""
+        self._loaded_at = None
+
+    def get(self, product_id: str) -> dict[str, Any] | None:
+        """Look up a product by ID."""
+        product = self._products.get(product_id)
+        if product is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return product
+
+    @property
+    def index(self) -> FilterIndex:
+        """Facet index over the current snapshot (rebuilt after changes)."""
+        if self._index is None or self._index_version != self.version:
+            self._index = FilterIndex(self._ordered)
+            self._index_version = self.version
+        return self._index
+
+    def search(self, query: str) -> dict[str, float]:
+        """Relevance scores for a search query (cached until the catalog changes)."""
+        key = (self.version, query.strip().lower())
+        scores = self.search_cache.get(key)
+        if scores is None:
+            scores = self.search_index.search(query)
+            self.search_cache.set(key, scores)
+        return scores
+
+    def suggest(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Typeahead suggestions for a prefix (cached until the catalog changes)."""
+        key = (self.version, " ".join(query.lower().split()), limit)
+        suggestions = self.suggest_cache.get(key)
+        if suggestions is None:
+            suggestions = [entry.to_dict() for entry in self.suggest_index.suggest(query, limit)]
+            self.suggest_cache.set(key, suggestions)
+        return suggestions
+
+    def facet_counts(
+        self,
+        product_type: Optional[list[str]] = None,
+        skin_concern: Optional[list[str]] = None,
+        skin_type: Optional[list[str]] = None,
+        key_ingredient: Optional[list[str]] = None,
+        usage_time: Optional[list[str]] = None,
+        search: Optional[str] = None,
+        match: MatchMode = "any",
+        active_only: bool = True,
+    ) -> tuple[int, dict[str, dict[str, int]]]:
+        """Facet counts for a filter selection (cached until the catalog changes)."""
+        filters = {
+            "product_type": product_type,
+            "skin_concern": skin_concern,
+            "skin_type": skin_type,
+            "key_ingredient": key_ingredient,
+            "usage_time": usage_time,
+        }
+        key = (
+            self.version,
+            tuple((facet, tuple(sorted(set(values)))) for facet, values in filters.items() if values),
+            search.lower() if search else None,
+            match,
+            active_only,
+        )
+        cached = self.facet_cache.get(key)
+        if cached is None:
+            index = self.index
+            within = index.bitmap_of(self.search(search)) if search else None
+            cached = index.facet_counts(filters, match=match, active_only=active_only, within=within)
+            self.facet_cache.set(key, cached)
+        return cached
+
+    def list(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        product_type: Optional[list[str]] = None,
+        skin_concern: Optional[list[str]] = None,
+        skin_type: Optional[list[str]] = None,
+        key_ingredient: Optional[list[str]] = None,
+        usage_time: Optional[list[str]] = None,
+        search: Optional[str] = None,
+        match: MatchMode = "any",
+        active_only: bool = True,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict[str, Any]], int, Optional[str]]:
+        """
+        Filter and paginate the snapshot like ProductRepository.get_all.
+
+        Returns (products, total, next_cursor). With a search query, results
+        are ranked by relevance (see SearchIndex) rather than newest first,
+        and are paged by number only.
+        """
+        index = self.index
+        bitmap = index.match(
+            {
+                "product_type": product_type,
+                "skin_concern": skin_concern,
+                "skin_type": skin_type,
+                "key_ingredient": key_ingredient,
+                "usage_time": usage_time,
+            },
+            match=match,
+            active_only=active_only,
+        )
+        self.hits += 1
+        offset = (page - 1) * page_size
+
+        if search:
+            # Ranked by relevance instead of recency
+            matches = index.rank(bitmap, self.search(search)) if bitmap else []
+            return matches[offset:offset + page_size], len(matches), None
+
+        total = bitmap.bit_count()
+        if cursor:
+            # Clear the bits of products up to the cursor row
+            bitmap &= ~((1 << self._position_after(decode_cursor(cursor))) - 1)
+            offset = 0
+        rows, next_cursor = paginate_rows(index.page(bitmap, offset, page_size + 1), page_size)
+        return rows, total, next_cursor
+
+    def _position_after(self, key: tuple[str, str]) -> int:
+        """Index in the newest-first order of the first product after a sort key."""
+        ordered = self._ordered
+        low, high = 0, len(ordered)
+        while low < high:
+            middle = (low + high) // 2
+            if _sort_key(ordered[middle]) >= key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of cache usage metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "products": len(self._products),
+            "version": self.version,
+            "fresh": self.is_fresh,
+            "loads": self.loads,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "search_terms": self.search_index.vocabulary_size,
+            "suggestions": len(self.suggest_index),
+            "facet_cache": self.facet_cache.stats(),
+            "search_cache": self.search_cache.stats(),
+            "suggest_cache": self.suggest_cache.stats(),
+        }
+
+
+_catalog: ProductCatalog | None = None
+
+
+def get_product_catalog() -> ProductCatalog:
+    """Get the shared product catalog (singleton)."""
+    global _catalog
+    if _catalog is None:
+        _catalog = ProductCatalog(ttl=get_settings().catalog_cache_ttl)
+    return _catalog
+
+
+async def sync_catalog(message: dict[str, Any], topic: str) -> None:
+    """
+    Apply a product change made on another worker to this worker's snapshot.
+
+    Events carry API responses (or just ids, if they were too large to
+    relay), not table rows, so changed products are re-read from the
+    database. If that fails the snapshot is dropped and reloaded on the
+    next read.
+    """
+    catalog = get_product_catalog()
+    if message.get("type") == "product_deleted":
+        catalog.remove(message["product_id"])
+        return
+
+    product_ids = message.get("product_ids") or [
+        message.get("product_id") or (message.get("product") or {}).get("id")
+    ]
+    product_ids = [product_id for product_id in product_ids if product_id]
+    if not product_ids:
+        return
+
+    try:
+        rows = await ProductRepository.get_by_ids(product_ids)
+    except Exception:
+        catalog.invalidate()
+        raise
+    for row in rows:
+        catalog.upsert(row)
+    for product_id in set(product_ids) - {row["id"] for row in rows}:
+        catalog.remove(product_id)
@@ -0,0 +1,170 @@
+"""
+Bitmap index over product facets.
+
+Each facet value maps to a bitmap (a Python int) whose bit i is set when the
+i-th product of the catalog (newest first) has that value. Filters become a
+handful of AND/OR operations on those ints, so multi-select queries across
+every facet cost microseconds regardless of how they are combined, and page
+order falls out of the bit order.
+"""
+from typing import Any, Iterable, Iterator, Literal
+
+
+# Query facet -> products column
+FACETS = {
+    "product_type": "product_type",
+    "skin_concern": "skin_concerns",
+    "skin_type": "skin_types",
+    "key_ingredient": "key_ingredients",
+    "usage_time": "usage_time",
+}
+
+# Facets whose column holds a list of values
+MULTI_VALUED = {"skin_concern", "skin_type", "key_ingredient"}
+
+MatchMode = Literal["any", "all"]
+
+
+def _bitmap(positions: list[int], size: int) -> int:
+    """Build a bitmap with the given bit positions set."""
+    bits = bytearray((size + 7) // 8)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Yield set bit positions, lowest first."""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+class FilterIndex:
+    """Immutable facet index over an ordered list of products."""
+
+    def __init__(self, products: list[dict[str, Any]]):
+        self.products = products
+        self.positions = {product["id"]: i for i, product in enumerate(products)}
+        self.all = (1 << len(products)) - 1
+
+        positions: dict[str, dict[str, list[int]]] = {facet: {} for facet in FACETS}
+        active: list[int] = []
+        for i, product in enumerate(products):
+            if product.get("is_active"):
+                active.append(i)
+            for facet, column in FACETS.items():
+                values = product.get(column)
+                if facet not in MULTI_VALUED:
+                    values = [values] if values else []
+                for value in values or []:
+                    positions[facet].setdefault(value, []).append(i)
+
+        size = len(products)
+        self.active = _bitmap(active, size)
+        self.postings: dict[str, dict[str, int]] = {
+            facet: {value: _bitmap(ids, size) for value, ids in values.items()}
+            for facet, values in positions.items()
+        }
+
+    def facet_bitmap(self, facet: str, values: list[str], match: MatchMode = "any") -> int:
+        """
+        Products matching the selected values of one facet.
+
+        Values are OR'ed, or AND'ed when match is "all" on a multi-valued
+        facet (e.g. products that target both acne and redness).
+        """
+        postings = self.postings[facet]
+        if match == "all" and facet in MULTI_VALUED:
+            result = self.all
+            for value in values:
+                result &= postings.get(value, 0)
+            return result
+
+        result = 0
+        for value in values:
+            result |= postings.get(value, 0)
+        return result
+
+    def match(
+        self,
+        filters: dict[str, list[str] | None],
+        match: MatchMode = "any",
+        active_only: bool = True,
+    ) -> int:
+        """Products matching every selected facet (facets are AND'ed)."""
+        result = self.active if active_only else self.all
+        for facet, values in filters.items():
+            if values:
+                result &= self.facet_bitmap(facet, values, match)
+                if not result:
+                    break
+        return result
+
+    def facet_counts(
+        self,
+        filters: dict[str, list[str] | None],
+        match: MatchMode = "any",
+        active_only: bool = True,
+        within: int | None = None,
+    ) -> tuple[int, dict[str, dict[str, int]]]:
+        """
+        Result size and per-value counts for every facet.
+
+        Each facet is counted against the other facets' selections (not its
+        own), so picking "Acne" still shows how many products each other
+        concern would add. With match="all" a multi-valued facet's own
+        selection narrows its counts too, since values there are AND'ed.
+        `within` restricts counting to a subset (e.g. search results).
+        """
+        base = self.active if active_only else self.all
+        if within is not None:
+            base &= within
+
+        selected = {
+            facet: self.facet_bitmap(facet, values, match)
+            for facet, values in filters.items()
+            if values
+        }
+        result = base
+        for bitmap in selected.values():
+            result &= bitmap
+
+        counts: dict[str, dict[str, int]] = {}
+        for facet in FACETS:
+            scope = base
+            for other, bitmap in selected.items():
+                if other != facet or (match == "all" and facet in MULTI_VALUED):
+                    scope &= bitmap
+            counts[facet] = {
+                value: (scope & postings).bit_count()
+                for value, postings in self.postings[facet].items()
+            }
+        return result.bit_count(), counts
+
+    def bitmap_of(self, product_ids: Iterable[str]) -> int:
+        """Bitmap of the given products (unknown IDs are ignored)."""
+        positions = self.positions
+        return _bitmap([positions[i] for i in product_ids if i in positions], len(self.products))
+
+    def rank(self, bitmap: int, scores: dict[str, float]) -> list[dict[str, Any]]:
+        """Scored products within a bitmap, best first (ties in catalog order)."""
+        flags = bitmap.to_bytes((len(self.products) + 7) // 8, "little")
+        hits = []
+        for product_id, score in scores.items():
+            i = self.positions.get(product_id)
+            if i is not None and flags[i >> 3] >> (i & 7) & 1:
+                hits.append((-score, i))
+        hits.sort()
+        return [self.products[i] for _, i in hits]
+
+    def page(self, bitmap: int, offset: int, limit: int) -> list[dict[str, Any]]:
+        """Products for one page of a result bitmap, in catalog order."""
+        rows = []
+        for n, i in enumerate(iter_bits(bitmap)):
+            if n >= offset + limit:
+                break
+            if n >= offset:
+                rows.append(self.products[i])
+        return rows
@@ -4,7 +4,8 @@ Repository layer for products database operations.
 import math
 from typing import Any, Optional
 
-from app.database import get_supabase_admin_client
+from app.database import admin_client
+from app.shared.pagination import CountMode, count_method, keyset_filter, paginate_rows
 
 
 class ProductRepository:
@@ -14,93 +15,141 @@ class ProductRepository:
     async def get_all(
         page: int = 1,
         page_size: int = 20,
-        product_type: Optional[str] = None,
-        skin_concern: Optional[str] = None,
-        skin_type: Optional[str] = None,
-        usage_time: Optional[str] = None,
+        product_type: Optional[list[str]] = None,
+        skin_concern: Optional[list[str]] = None,
+        skin_type: Optional[list[str]] = None,
+        key_ingredient: Optional[list[str]] = None,
+        usage_time: Optional[list[str]] = None,
         search: Optional[str] = None,
+        match: str = "any",
         active_only: bool = True,
-    ) -> tuple[list[dict[str, Any]], int]:
-        """Get all products with filters."""
-        client = get_supabase_admin_client()
-        
-        # Build query
-        query = client.table("products").select("*", count="exact")
-        
-        # Apply filters
-        if active_only:
-            query = query.eq("is_active", True)
-        
-        if product_type:
-            query = query.eq("product_type", product_type)
-        
-        if usage_time:
-            query = query.eq("usage_time", usage_time)
-        
-        if skin_concern:
-            query = query.contains("skin_concerns", [skin_concern])
-        
-        if skin_type:
-            query = query.contains("skin_types", [skin_type])
-        
-        if search:
-            query = query.ilike("name", f"%{search}%")
-        
-        # Pagination
-        offset = (page - 1) * page_size
-        query = query.order("created_at", desc=True).range(offset, offset + page_size - 1)
-        
-        response = query.execute()
-        
-        return response.data or [], response.count or 0
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[dict[str, Any]], Optional[int], Optional[str]]:
+        """
+        Get all products with filters, newest first.
+        
+        Values within a facet are OR'ed (AND'ed for list columns when match
+        is "all"); facets are AND'ed together. Pages resume after `cursor`
+        when given (keyset); `page` is only used without one.
+        Returns (products, total, next_cursor).
+        """
+        async with admin_client() as client:
+            # Build query
+            query = client.table("products").select("*", count=count_method(count))
+            
+            # Apply filters
+            if active_only:
+                query = query.eq("is_active", True)
+            
+            if product_type:
+                query = query.in_("product_type", product_type)
+            
+            if usage_time:
+                query = query.in_("usage_time", usage_time)
+            
+            for column, values in (
+                ("skin_concerns", skin_concern),
+                ("skin_types", skin_type),
+                ("key_ingredients", key_ingredient),
+            ):
+                if values:
+                    query = query.contains(column, values) if match == "all" else query.overlaps(column, values)
+            
+            if search:
+                query = query.ilike("name", f"%{search}%")
+            
+            # Pagination
+            query = query.order("created_at", desc=True).order("id", desc=True)
+            if cursor:
+                query = query.or_(keyset_filter(cursor)).limit(page_size + 1)
+            else:
+                offset = (page - 1) * page_size
+                query = query.range(offset, offset + page_size)
+            
+            response = await query.execute()
+            products, next_cursor = paginate_rows(response.data or [], page_size)
+            
+            return products, response.count, next_cursor
+
+    @staticmethod
+    async def get_all_rows(batch_size: int = 1000) -> list[dict[str, Any]]:
+        """Get every product (active or not), newest first, in batches."""
+        rows: list[dict[str, Any]] = []
+        async with admin_client() as client:
+            while True:
+                response = await (
+                    client.table("products")
+                    .select("*")
+                    .order("created_at", desc=True)
+                    .order("id", desc=True)
+                    .range(len(rows), len(rows) + batch_size - 1)
+                    .execute()
+                )
+                batch = response.data or []
+                rows.extend(batch)
+                if len(batch) < batch_size:
+                    return rows
 
     @staticmethod
     async def get_by_id(product_id: str) -> dict[str, Any] | None:
         """Get a single product by ID."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("products")
-            .select("*")
-            .eq("id", product_id)
-            .execute()
-        )
-        
-        return response.data[0] if response.data else None
+        async with admin_client() as client:
+            response = await (
+                client.table("products")
+                .select("*")
+                .eq("id", product_id)
+                .execute()
+            )
+            
+            return response.data[0] if response.data else None
+
+    @staticmethod
+    async def get_by_ids(product_ids: list[str]) -> list[dict[str, Any]]:
+        """Get the products with the given IDs (missing ones are omitted) in one query."""
+        if not product_ids:
+            return []
+
+        async with admin_client() as client:
+            response = await (
+                client.table("products")
+                .select("*")
+                .in_("id", product_ids)
+                .execute()
+            )
+
+            return response.data or []
 
     @staticmethod
     async def create(data: dict[str, Any]) -> dict[str, Any]:
         """Create a new product."""
-        client = get_supabase_admin_client()
-        
-        response = client.table("products").insert(data).execute()
-        
-        return response.data[0] if response.data else {}
+        async with admin_client() as client:
+            response = await client.table("products").insert(data).execute()
+            
+            return response.data[0] if response.data else {}
 
     @staticmethod
     async def update(product_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
         """Update a product."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("products")
-            .update(data)
-            .eq("id", product_id)
-            .execute()
-        )
-        
-        return response.data[0] if response.data else None
+        async with admin_client() as client:
+            response = await (
+                client.table("products")
+                .update(data)
+                .eq("id", product_id)
+                .execute()
+            )
+            
+            return response.data[0] if response.data else None
 
     @staticmethod
     async def delete(product_id: str) -> bool:
         """Delete a product."""
-        client = get_supabase_admin_client()
-        
-        response = (
-            client.table("products")
-            .delete()
-            .eq("id", product_id)
-            .execute()
-        )
-        
-        return len(response.data) > 0 if response.data else False
+        async with admin_client() as client:
+            response = await (
+                client.table("products")
+                .delete()
+                .eq("id", product_id)
+                .execute()
+            )
+            
+            return len(response.data) > 0 if response.data else False
@@ -1,11 +1,13 @@
 """
 Products API routes.
 """
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, Request, Query, UploadFile, File
+from fastapi import APIRouter, Depends, Request, Response, Query, UploadFile, File
 
 from app.config import get_settings
+from app.shared.http_cache import conditional_get, make_etag
+from app.shared.pagination import CountMode
 from app.shared.security import require_admin
 from app.shared.rate_limit import limiter
 from app.shared.cloudinary import upload_image
@@ -15,18 +17,39 @@ from app.services.products.schemas import (
     ProductResponse,
     ProductListResponse,
     ProductFilters,
+    ProductFacetsResponse,
+    ProductSuggestResponse,
     PRODUCT_TYPES,
     SKIN_CONCERNS,
     SKIN_TYPES,
     KEY_INGREDIENTS,
     USAGE_TIMES,
 )
+from app.services.products.catalog import get_product_catalog
 from app.services.products.service import ProductService
 
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
+async def _catalog_not_modified(request: Request, response: Response) -> Response | None:
+    """
+    Validate a catalog-served read against the current snapshot.
+    
+    The ETag covers the path, query and catalog fingerprint, so it changes
+    whenever any product does. Returns a 304 to send back, or None.
+    """
+    catalog = get_product_catalog()
+    if not await catalog.ready():
+        return None
+    etag = make_etag(
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        catalog.fingerprint,
+    )
+    return conditional_get(request, response, etag)
+
+
 # Public routes
 @router.get(
     "",
@@ -36,24 +59,46 @@ router = APIRouter(prefix="/products", tags=["Products"])
 @limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
 async def list_products(
     request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    product_type: Optional[str] = None,
-    skin_concern: Optional[str] = None,
-    skin_type: Optional[str] = None,
-    usage_time: Optional[str] = None,
+    product_type: Optional[list[str]] = Query(None),
+    skin_concern: Optional[list[str]] = Query(None),
+    skin_type: Optional[list[str]] = Query(None),
+    key_ingredient: Optional[list[str]] = Query(None),
+    usage_time: Optional[list[str]] = Query(None),
     search: Optional[str] = None,
+    match: Literal["any", "all"] = Query("any"),
+    cursor: Optional[str] = Query(None),
+    count: CountMode = Query("exact"),
 ) -> ProductListResponse:
-    """Get paginated list of products with optional filters."""
+    """
+    Get paginated list of products with optional filters.
+    
+    Each facet accepts several values (repeat the parameter). Values within
+    a facet match any of them, or all of them for skin_concern, skin_type and
+    key_ingredient when match=all. Different facets must all match.
+    
+    Pass the returned `next_cursor` as `cursor` for the next page (not
+    available with `search`, whose results are ranked).
+    """
+    not_modified = await _catalog_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
+    
     return await ProductService.list_products(
         page=page,
         page_size=page_size,
         product_type=product_type,
         skin_concern=skin_concern,
         skin_type=skin_type,
+        key_ingredient=key_ingredient,
         usage_time=usage_time,
         search=search,
+        match=match,
         active_only=True,
+        cursor=cursor,
+        count=count,
     )
 
 
@@ -62,9 +107,77 @@ async def list_products(
     response_model=ProductFilters,
     summary="Get filter options",
 )
-async def get_filter_options(request: Request) -> ProductFilters:
+async def get_filter_options(request: Request, response: Response) -> ProductFilters:
     """Get available filter options for products."""
-    return ProductFilters()
+    filters = ProductFilters()
+    not_modified = conditional_get(request, response, make_etag(filters.model_dump_json()))
+    if not_modified is not None:
+        return not_modified
+    return filters
+
+
+@router.get(
+    "/facets",
+    response_model=ProductFacetsResponse,
+    summary="Get facet counts",
+)
+@limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
+async def get_facet_counts(
+    request: Request,
+    response: Response,
+    product_type: Optional[list[str]] = Query(None),
+    skin_concern: Optional[list[str]] = Query(None),
+    skin_type: Optional[list[str]] = Query(None),
+    key_ingredient: Optional[list[str]] = Query(None),
+    usage_time: Optional[list[str]] = Query(None),
+    search: Optional[str] = None,
+    match: Literal["any", "all"] = Query("any"),
+) -> ProductFacetsResponse:
+    """
+    Get the number of products for every filter option.
+    
+    Takes the same filters as the product list. Each facet's counts apply
+    the other facets' selections, so a sidebar can show "Acne (12)" for
+    every option with a single request.
+    """
+    not_modified = await _catalog_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
+    
+    return await ProductService.get_facets(
+        product_type=product_type,
+        skin_concern=skin_concern,
+        skin_type=skin_type,
+        key_ingredient=key_ingredient,
+        usage_time=usage_time,
+        search=search,
+        match=match,
+    )
+
+
+@router.get(
+    "/suggest",
+    response_model=ProductSuggestResponse,
+    summary="Search suggestions",
+)
+@limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
+async def suggest_products(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(5, ge=1, le=10),
+) -> ProductSuggestResponse:
+    """
+    Get typeahead suggestions for a search box.
+    
+    Matches the start of any word in product names, ingredients and product
+    types. Suggestions covering more products come first.
+    """
+    not_modified = await _catalog_not_modified(request, response)
+    if not_modified is not None:
+        return not_modified
+    
+    return await ProductService.suggest(q, limit)
 
 
 @router.get(
@@ -75,9 +188,23 @@ async def get_filter_options(request: Request) -> ProductFilters:
 @limiter.limit(lambda: f"{get_settings().rate_limit_default}/minute")
 async def get_product(
     request: Request,
+    response: Response,
     product_id: str,
 ) -> ProductResponse:
-    """Get a single product by ID."""
+    """
+    Get a single product by ID.
+    
+    Validated by the product's updated_at, so edits to other products don't
+    invalidate cached copies.
+    """
+    catalog = get_product_catalog()
+    product = catalog.get(product_id) if await catalog.ready() else None
+    if product is not None:
+        etag = make_etag(request.url.path, product.get("updated_at"))
+        not_modified = conditional_get(request, response, etag, product.get("updated_at"))
+        if not_modified is not None:
+            return not_modified
+    
     return await ProductService.get_product(product_id)
 
 
@@ -96,6 +223,8 @@ async def admin_list_products(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
+    count: CountMode = Query("exact"),
     current_user: dict[str, Any] = Depends(require_admin),
 ) -> ProductListResponse:
     """Get all products including inactive (admin only)."""
@@ -104,6 +233,8 @@ async def admin_list_products(
         page_size=page_size,
         search=search,
         active_only=False,
+        cursor=cursor,
+        count=count,
     )
 
 
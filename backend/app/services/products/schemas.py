@@ -2,7 +2,7 @@
 Pydantic schemas for products.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -92,10 +92,11 @@ class ProductResponse(BaseModel):
 class ProductListResponse(BaseModel):
     """Product list response."""
     products: list[ProductResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ProductFilters(BaseModel):
@@ -105,3 +106,33 @@ class ProductFilters(BaseModel):
     skin_types: list[str] = SKIN_TYPES
     key_ingredients: list[str] = KEY_INGREDIENTS
     usage_times: list[str] = USAGE_TIMES
+
+
+class FacetOption(BaseModel):
+    """Facet value with the number of matching products."""
+    value: str
+    count: int
+
+
+class ProductFacetsResponse(BaseModel):
+    """Facet counts for the current filter selection."""
+    total: int
+    product_types: list[FacetOption]
+    skin_concerns: list[FacetOption]
+    skin_types: list[FacetOption]
+    key_ingredients: list[FacetOption]
+    usage_times: list[FacetOption]
+
+
+class ProductSuggestion(BaseModel):
+    """Typeahead suggestion."""
+    text: str
+    kind: Literal["product", "product_type", "ingredient"]
+    product_id: Optional[str] = None
+    count: int
+
+
+class ProductSuggestResponse(BaseModel):
+    """Suggestions for a search prefix."""
+    query: str
+    suggestions: list[ProductSuggestion]
@@ -0,0 +1,244 @@
+"""
+Ranked full-text search over the product catalog.
+
+Products are tokenized (accent folding, lowercasing, a light suffix-stripping
+stemmer) across name, product_type, key_ingredients and description, and
+stored in an inverted index. Queries are ranked with BM25, using field
+weights so a match in the name counts for more than one in the description
+(BM25F-style). Every query word must match, either exactly (after stemming)
+or as a prefix of an indexed term, so partially typed words still find
+results.
+
+The index is updated in place as products are written; no rebuild is needed
+after a single change.
+"""
+import bisect
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Iterable
+
+
+# products column -> weight
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "product_type": 2.0,
+    "key_ingredients": 2.0,
+    "description": 1.0,
+}
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "the", "this", "to", "with", "your",
+})
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Prefix expansions score a little below exact (stemmed) matches
+PREFIX_WEIGHT = 0.7
+MAX_PREFIX_EXPANSIONS = 30
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ational", "ation", "ness", "ment", "ing", "ers", "er", "ed", "ly")
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Reduce a word to a crude stem.
+
+    Collapses the usual inflections in product copy so that e.g.
+    "moisturizer", "moisturizing" and "moisturizes" share a stem.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+
+    if token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)] + ("at" if suffix in ("ational", "ation") else "")
+            break
+
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    if token.endswith("y") and len(token) > 3:
+        token = token[:-1] + "i"
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase, accent-free words (stopwords removed)."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value if v)
+    return str(value) if value else ""
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking, keyed by product ID."""
+
+    def __init__(self):
+        # term -> {product id: weighted term frequency}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._doc_length: dict[str, float] = {}
+        self._total_length = 0.0
+        self._sorted_terms: list[str] | None = None
+
+    @classmethod
+    def build(cls, products: Iterable[dict[str, Any]]) -> "SearchIndex":
+        """Index a batch of products."""
+        index = cls()
+        for product in products:
+            index.add(product)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def add(self, product: dict[str, Any]) -> None:
+        """Index a product, replacing any previous version of it."""
+        product_id = product["id"]
+        self.remove(product_id)
+
+        terms: dict[str, float] = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(product.get(field))):
+                term = stem(token)
+                terms[term] = terms.get(term, 0.0) + weight
+                length += weight
+
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._sorted_terms = None
+            postings[product_id] = frequency
+
+        self._doc_terms[product_id] = terms
+        self._doc_length[product_id] = length
+        self._total_length += length
+
+    def remove(self, product_id: str) -> None:
+        """Drop a product from the index."""
+        terms = self._doc_terms.pop(product_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            del postings[product_id]
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+
+        self._total_length -= self._doc_length.pop(product_id)
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """Indexed terms a query word can match, with their weights."""
+        expansions: dict[str, float] = {}
+
+        term = stem(token)
+        if term in self._postings:
+            expansions[term] = 1.0
+
+        if len(token) >= MIN_PREFIX_LENGTH:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            terms = self._sorted_terms
+            start = bisect.bisect_left(terms, token)
+            candidates = []
+            for i in range(start, len(terms)):
+                if not terms[i].startswith(token):
+                    break
+                candidates.append(terms[i])
+            # Keep the most common completions
+            candidates.sort(key=lambda t: len(self._postings[t]), reverse=True)
+            for candidate in candidates[:MAX_PREFIX_EXPANSIONS]:
+                expansions.setdefault(candidate, PREFIX_WEIGHT)
+
+        return expansions
+
+    def search(self, query: str) -> dict[str, float]:
+        """
+        Score products matching every word of the query.
+
+        Returns product ID -> BM25 score (higher is better).
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._doc_terms:
+            return {}
+
+        doc_count = len(self._doc_terms)
+        average_length = self._total_length / doc_count or 1.0
+        # BM25 length normalization: K1 * (1 - B + B * length / average)
+        norm_base = K1 * (1 - B)
+        norm_scale = K1 * B / average_length
+        doc_length = self._doc_length
+
+        # Most selective words first, so later words only check survivors
+        words = []
+        for token in dict.fromkeys(tokens):
+            expansions = [
+                (self._postings[term], weight) for term, weight in self._expand(token).items()
+            ]
+            if not expansions:
+                return {}
+            words.append((sum(len(postings) for postings, _ in expansions), expansions))
+        words.sort(key=lambda word: word[0])
+
+        scores: dict[str, float] | None = None
+        for _, expansions in words:
+            word_scores: dict[str, float] = {}
+            for postings, weight in expansions:
+                idf = weight * math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                if scores is None:
+                    candidates = postings.items()
+                elif len(postings) <= len(scores):
+                    candidates = ((pid, f) for pid, f in postings.items() if pid in scores)
+                else:
+                    candidates = ((pid, postings[pid]) for pid in scores if pid in postings)
+
+                term_scores = {
+                    pid: idf * f * (K1 + 1) / (f + norm_base + norm_scale * doc_length[pid])
+                    for pid, f in candidates
+                }
+                if not word_scores:
+                    word_scores = term_scores
+                else:
+                    # A word counts once, through its best-matching term
+                    for pid, score in term_scores.items():
+                        if score > word_scores.get(pid, 0.0):
+                            word_scores[pid] = score
+
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    pid: score + word_scores[pid]
+                    for pid, score in scores.items()
+                    if pid in word_scores
+                }
+            if not scores:
+                return {}
+
+        return scores
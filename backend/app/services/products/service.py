@@ -1,21 +1,52 @@
 """
 Products service - business logic layer.
 """
-import asyncio
-import math
-from typing import Optional
+from typing import Any, Optional
 
-from app.shared.exceptions import NotFoundError
-from app.shared.websocket import manager
+from app.shared.exceptions import NotFoundError, ServiceUnavailableError, ValidationError
+from app.shared.pagination import CountMode, total_pages
+from app.shared.events import event_bus
 from app.services.products.schemas import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductListResponse,
+    FacetOption,
+    ProductFacetsResponse,
+    ProductSuggestion,
+    ProductSuggestResponse,
+    PRODUCT_TYPES,
+    SKIN_CONCERNS,
+    SKIN_TYPES,
+    KEY_INGREDIENTS,
+    USAGE_TIMES,
 )
+from app.services.products.catalog import get_product_catalog
 from app.services.products.repository import ProductRepository
 
 
+def _to_response(product: dict[str, Any]) -> ProductResponse:
+    """Build a product response from a products row."""
+    return ProductResponse(
+        id=product["id"],
+        name=product["name"],
+        description=product.get("description"),
+        price=float(product.get("price", 0)),
+        compare_price=float(product["compare_price"]) if product.get("compare_price") else None,
+        images=product.get("images", []),
+        product_type=product.get("product_type"),
+        skin_concerns=product.get("skin_concerns", []),
+        skin_types=product.get("skin_types", []),
+        key_ingredients=product.get("key_ingredients", []),
+        usage_time=product.get("usage_time"),
+        stock=product.get("stock", 0),
+        in_stock=product.get("in_stock", True),
+        is_active=product.get("is_active", True),
+        created_at=product.get("created_at"),
+        updated_at=product.get("updated_at"),
+    )
+
+
 class ProductService:
     """Products business logic."""
 
@@ -23,97 +54,142 @@ class ProductService:
     async def list_products(
         page: int = 1,
         page_size: int = 20,
-        product_type: Optional[str] = None,
-        skin_concern: Optional[str] = None,
-        skin_type: Optional[str] = None,
-        usage_time: Optional[str] = None,
+        product_type: Optional[list[str]] = None,
+        skin_concern: Optional[list[str]] = None,
+        skin_type: Optional[list[str]] = None,
+        key_ingredient: Optional[list[str]] = None,
+        usage_time: Optional[list[str]] = None,
         search: Optional[str] = None,
+        match: str = "any",
         active_only: bool = True,
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
     ) -> ProductListResponse:
-        """Get paginated list of products with filters."""
-        products_data, total = await ProductRepository.get_all(
+        """
+        Get paginated list of products with filters.
+        
+        Pages resume after `cursor` when given. Search results are ranked,
+        so they are paged by number instead.
+        """
+        if cursor and search:
+            raise ValidationError("Search results are paged by number, not cursor")
+        
+        filters = dict(
             page=page,
             page_size=page_size,
             product_type=product_type,
             skin_concern=skin_concern,
             skin_type=skin_type,
+            key_ingredient=key_ingredient,
             usage_time=usage_time,
             search=search,
+            match=match,
             active_only=active_only,
+            cursor=cursor,
         )
         
-        products = [
-            ProductResponse(
-                id=p["id"],
-                name=p["name"],
-                description=p.get("description"),
-                price=float(p.get("price", 0)),
-                compare_price=float(p["compare_price"]) if p.get("compare_price") else None,
-                images=p.get("images", []),
-                product_type=p.get("product_type"),
-                skin_concerns=p.get("skin_concerns", []),
-                skin_types=p.get("skin_types", []),
-                key_ingredients=p.get("key_ingredients", []),
-                usage_time=p.get("usage_time"),
-                stock=p.get("stock", 0),
-                in_stock=p.get("in_stock", True),
-                is_active=p.get("is_active", True),
-                created_at=p.get("created_at"),
-                updated_at=p.get("updated_at"),
-            )
-            for p in products_data
-        ]
-        
-        total_pages = math.ceil(total / page_size) if total > 0 else 1
+        # Served from the in-memory catalog (exact totals are free there);
+        # the database is the fallback
+        catalog = get_product_catalog()
+        if await catalog.ready():
+            products_data, total, next_cursor = catalog.list(**filters)
+        else:
+            products_data, total, next_cursor = await ProductRepository.get_all(**filters, count=count)
+        
+        products = [_to_response(p) for p in products_data]
         
         return ProductListResponse(
             products=products,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            total_pages=total_pages(total, page_size),
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    async def get_facets(
+        product_type: Optional[list[str]] = None,
+        skin_concern: Optional[list[str]] = None,
+        skin_type: Optional[list[str]] = None,
+        key_ingredient: Optional[list[str]] = None,
+        usage_time: Optional[list[str]] = None,
+        search: Optional[str] = None,
+        match: str = "any",
+    ) -> ProductFacetsResponse:
+        """Get per-option product counts for the current filter selection."""
+        catalog = get_product_catalog()
+        if not await catalog.ready():
+            raise ServiceUnavailableError("Product catalog is unavailable")
+        
+        total, counts = catalog.facet_counts(
+            product_type=product_type,
+            skin_concern=skin_concern,
+            skin_type=skin_type,
+            key_ingredient=key_ingredient,
+            usage_time=usage_time,
+            search=search,
+            match=match,
+        )
+        
+        def options(facet: str, known: list[str]) -> list[FacetOption]:
+            # Known options first (in display order), then any others in use
+            facet_counts = counts.get(facet, {})
+            extra = sorted(value for value in facet_counts if value not in known)
+            return [FacetOption(value=v, count=facet_counts.get(v, 0)) for v in [*known, *extra]]
+        
+        return ProductFacetsResponse(
+            total=total,
+            product_types=options("product_type", PRODUCT_TYPES),
+            skin_concerns=options("skin_concern", SKIN_CONCERNS),
+            skin_types=options("skin_type", SKIN_TYPES),
+            key_ingredients=options("key_ingredient", KEY_INGREDIENTS),
+            usage_times=options("usage_time", USAGE_TIMES),
+        )
+
+    @staticmethod
+    async def suggest(query: str, limit: int = 5) -> ProductSuggestResponse:
+        """Get typeahead suggestions for a partially typed search."""
+        catalog = get_product_catalog()
+        if not await catalog.ready():
+            raise ServiceUnavailableError("Product catalog is unavailable")
+        
+        return ProductSuggestResponse(
+            query=query,
+            suggestions=[ProductSuggestion(**s) for s in catalog.suggest(query, limit)],
         )
 
     @staticmethod
     async def get_product(product_id: str) -> ProductResponse:
         """Get a single product by ID."""
-        product = await ProductRepository.get_by_id(product_id)
+        catalog = get_product_catalog()
+        product = catalog.get(product_id) if await catalog.ready() else None
+        
+        if not product:
+            # Not in the snapshot (e.g. created by another worker) - check the database
+            product = await ProductRepository.get_by_id(product_id)
+            if product:
+                catalog.upsert(product)
         
         if not product:
             raise NotFoundError("Product")
         
-        return ProductResponse(
-            id=product["id"],
-            name=product["name"],
-            description=product.get("description"),
-            price=float(product.get("price", 0)),
-            compare_price=float(product["compare_price"]) if product.get("compare_price") else None,
-            images=product.get("images", []),
-            product_type=product.get("product_type"),
-            skin_concerns=product.get("skin_concerns", []),
-            skin_types=product.get("skin_types", []),
-            key_ingredients=product.get("key_ingredients", []),
-            usage_time=product.get("usage_time"),
-            stock=product.get("stock", 0),
-            in_stock=product.get("in_stock", True),
-            is_active=product.get("is_active", True),
-            created_at=product.get("created_at"),
-            updated_at=product.get("updated_at"),
-        )
+        return _to_response(product)
 
     @staticmethod
     async def create_product(data: ProductCreate) -> ProductResponse:
         """Create a new product."""
         product_data = data.model_dump()
         product = await ProductRepository.create(product_data)
+        get_product_catalog().upsert(product)
         
         result = await ProductService.get_product(product["id"])
         
-        # Broadcast to WebSocket clients
-        asyncio.create_task(manager.broadcast({
+        # Broadcast to WebSocket clients on every worker
+        event_bus.publish_nowait({
             "type": "product_created",
             "product": result.model_dump(mode="json"),
-        }, "products"))
+        }, "products")
         
         return result
 
@@ -128,15 +204,16 @@ class ProductService:
         # Update
         update_data = data.model_dump(exclude_none=True)
         if update_data:
-            await ProductRepository.update(product_id, update_data)
+            updated = await ProductRepository.update(product_id, update_data)
+            get_product_catalog().upsert(updated)
         
         result = await ProductService.get_product(product_id)
         
-        # Broadcast to WebSocket clients
-        asyncio.create_task(manager.broadcast({
+        # Broadcast to WebSocket clients on every worker
+        event_bus.publish_nowait({
             "type": "product_updated",
             "product": result.model_dump(mode="json"),
-        }, "products"))
+        }, "products")
         
         return result
 
@@ -148,12 +225,13 @@ class ProductService:
             raise NotFoundError("Product")
         
         result = await ProductRepository.delete(product_id)
+        get_product_catalog().remove(product_id)
         
-        # Broadcast to WebSocket clients
-        asyncio.create_task(manager.broadcast({
+        # Broadcast to WebSocket clients on every worker
+        event_bus.publish_nowait({
             "type": "product_deleted",
             "product_id": product_id,
-        }, "products"))
+        }, "products")
         
         return result
 
@@ -0,0 +1,263 @@
+"""
+Typeahead suggestions over product names, ingredients and product types.
+
+Every word of a suggestion's text is inserted into a character trie, so a
+prefix matches the start of any word ("vit" finds "Vitamin C" and "Glow
+Vitamin C Serum"). Each trie node keeps its suggestions sorted by rank and
+caches the best completions of its subtree; a product change re-sorts and
+clears only the nodes along its words. A single-word prefix is answered
+from one node lookup, and several words walk the most selective prefix's
+completions best first until enough of them match.
+
+Suggestions are ranked by how many active products they cover (an
+ingredient used by 40 products comes before one product's name), then
+shorter text first.
+"""
+import bisect
+import heapq
+from typing import Any, Iterable, Iterator, Literal
+
+from app.services.products.search_index import tokenize
+
+
+SuggestionKind = Literal["product", "product_type", "ingredient"]
+
+# Completions kept per trie node (upper bound for the `limit` of a query)
+MAX_SUGGESTIONS = 10
+
+
+class Suggestion:
+    """One suggestable phrase."""
+
+    __slots__ = ("key", "text", "kind", "product_id", "count", "words")
+
+    def __init__(self, key: str, text: str, kind: SuggestionKind, product_id: str | None = None):
+        self.key = key
+        self.text = text
+        self.kind = kind
+        self.product_id = product_id
+        self.count = 0
+        self.words = tuple(dict.fromkeys(tokenize(text)))
+
+    def rank(self) -> tuple[int, int, str]:
+        return (-self.count, len(self.text), self.text.lower())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "text": self.text,
+            "kind": self.kind,
+            "product_id": self.product_id,
+            "count": self.count,
+        }
+
+
+class _Node:
+    __slots__ = ("children", "ranked", "size", "top")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        # (rank, entry) for suggestions with a word ending here, best first
+        self.ranked: list[tuple[tuple[int, int, str, str], Suggestion]] = []
+        # Number of (suggestion, word) pairs in this subtree
+        self.size = 0
+        # Cached best completions of this subtree (None = recompute)
+        self.top: list[Suggestion] | None = None
+
+
+def _sort_key(entry: Suggestion) -> tuple[int, int, str, str]:
+    # The key makes ranks unique, so entries never get compared
+    return (*entry.rank(), entry.key)
+
+
+def _phrases(product: dict[str, Any]) -> dict[str, tuple[str, SuggestionKind]]:
+    """Suggestions an active product counts towards: key -> (text, kind)."""
+    if not product.get("is_active", True):
+        return {}
+
+    phrases: dict[str, tuple[str, SuggestionKind]] = {}
+    if product.get("name"):
+        phrases[f"product:{product['id']}"] = (product["name"], "product")
+    if product.get("product_type"):
+        phrases[f"product_type:{product['product_type']}"] = (product["product_type"], "product_type")
+    for ingredient in product.get("key_ingredients") or []:
+        phrases[f"ingredient:{ingredient}"] = (ingredient, "ingredient")
+    return phrases
+
+
+class SuggestIndex:
+    """Prefix trie of suggestions, kept in step with the product catalog."""
+
+    def __init__(self):
+        self._root = _Node()
+        self._entries: dict[str, Suggestion] = {}
+        # product id -> suggestion key -> text, for what the product counts towards
+        self._products: dict[str, dict[str, str]] = {}
+
+    @classmethod
+    def build(cls, products: Iterable[dict[str, Any]]) -> "SuggestIndex":
+        """Index a batch of products (counted first, then sorted once)."""
+        index = cls()
+        entries = index._entries
+        for product in products:
+            phrases = _phrases(product)
+            if not phrases:
+                continue
+            for key, (text, kind) in phrases.items():
+                entry = entries.get(key)
+                if entry is None:
+                    entry = entries[key] = Suggestion(key, text, kind, product["id"] if kind == "product" else None)
+                entry.count += 1
+            index._products[product["id"]] = {key: text for key, (text, _) in phrases.items()}
+
+        for entry in entries.values():
+            item = (_sort_key(entry), entry)
+            for word in entry.words:
+                path = index._path(word, create=True)
+                for node in path:
+                    node.size += 1
+                path[-1].ranked.append(item)
+        stack = [index._root]
+        while stack:
+            node = stack.pop()
+            node.ranked.sort()
+            stack.extend(node.children.values())
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, word: str, create: bool = False) -> list[_Node]:
+        """Nodes from the root to the end of `word` (shorter if it's missing)."""
+        node = self._root
+        path = [node]
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    break
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def _link(self, entry: Suggestion) -> None:
+        item = (_sort_key(entry), entry)
+        for word in entry.words:
+            path = self._path(word, create=True)
+            for node in path:
+                node.top = None
+                node.size += 1
+            ranked = path[-1].ranked
+            ranked.insert(bisect.bisect_left(ranked, item), item)
+
+    def _unlink(self, entry: Suggestion) -> None:
+        item = (_sort_key(entry), entry)
+        for word in entry.words:
+            path = self._path(word)
+            for node in path:
+                node.top = None
+                node.size -= 1
+            ranked = path[-1].ranked
+            del ranked[bisect.bisect_left(ranked, item)]
+
+    def _count(self, key: str, text: str, kind: SuggestionKind, delta: int, product_id: str | None = None) -> None:
+        """Adjust how many products a suggestion covers, creating or dropping it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = Suggestion(key, text, kind, product_id)
+        else:
+            self._unlink(entry)
+
+        entry.count += delta
+        if entry.count > 0:
+            self._link(entry)
+        else:
+            del self._entries[key]
+
+    def add(self, product: dict[str, Any]) -> None:
+        """Index a product, replacing any previous version of it."""
+        product_id = product["id"]
+        phrases = _phrases(product)
+
+        # Only touch suggestions that changed, so e.g. stock updates are free
+        previous = self._products.get(product_id, {})
+        for key, text in previous.items():
+            if phrases.get(key, (None,))[0] != text:
+                self._count(key, text, "product", -1)
+        for key, (text, kind) in phrases.items():
+            if previous.get(key) != text:
+                self._count(key, text, kind, 1, product_id if kind == "product" else None)
+
+        if phrases:
+            self._products[product_id] = {key: text for key, (text, _) in phrases.items()}
+        else:
+            self._products.pop(product_id, None)
+
+    def remove(self, product_id: str) -> None:
+        """Drop a product's contribution to the suggestions."""
+        for key, text in self._products.pop(product_id, {}).items():
+            self._count(key, text, "product", -1)
+
+    def _top(self, node: _Node) -> list[Suggestion]:
+        if node.top is None:
+            candidates = {entry.key: entry for _, entry in node.ranked[:MAX_SUGGESTIONS]}
+            for child in node.children.values():
+                if child.size:
+                    for entry in self._top(child):
+                        candidates[entry.key] = entry
+            node.top = heapq.nsmallest(MAX_SUGGESTIONS, candidates.values(), key=_sort_key)
+        return node.top
+
+    def _ranked(self, node: _Node) -> Iterator[Suggestion]:
+        """Every suggestion in a subtree, best first."""
+        nodes = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.ranked:
+                nodes.append(node.ranked)
+            stack.extend(child for child in node.children.values() if child.size)
+        for _, entry in heapq.merge(*nodes):
+            yield entry
+
+    def _node(self, prefix: str) -> _Node | None:
+        path = self._path(prefix)
+        if len(path) != len(prefix) + 1 or not path[-1].size:
+            return None
+        return path[-1]
+
+    def suggest(self, query: str, limit: int = MAX_SUGGESTIONS) -> list[Suggestion]:
+        """
+        Best suggestions for what has been typed so far.
+
+        Every word of the query must be the start of a word in the
+        suggestion, in any order.
+        """
+        limit = min(limit, MAX_SUGGESTIONS)
+        prefixes = list(dict.fromkeys(tokenize(query)))
+        if not prefixes or limit <= 0:
+            return []
+
+        nodes = []
+        for prefix in prefixes:
+            node = self._node(prefix)
+            if node is None:
+                return []
+            nodes.append((node.size, prefix, node))
+
+        if len(nodes) == 1:
+            return self._top(nodes[0][2])[:limit]
+
+        # Walk the most selective prefix's subtree best first, checking the
+        # other prefixes, until enough suggestions match
+        nodes.sort(key=lambda item: item[0])
+        others = [prefix for _, prefix, _ in nodes[1:]]
+        results: dict[str, Suggestion] = {}
+        for entry in self._ranked(nodes[0][2]):
+            if entry.key not in results and all(
+                any(word.startswith(prefix) for word in entry.words) for prefix in others
+            ):
+                results[entry.key] = entry
+                if len(results) == limit:
+                    break
+        return list(results.values())
@@ -6,7 +6,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, Request
 
 from app.config import get_settings
-from app.shared.security import get_current_user
+from app.shared.security import get_current_user, get_current_user_strict
 from app.shared.rate_limit import limiter
 from app.services.settings.schemas import (
     NotificationSettingsUpdate,
@@ -68,7 +68,7 @@ async def update_user_settings(
 async def change_password(
     request: Request,
     data: PasswordChange,
-    current_user: dict[str, Any] = Depends(get_current_user)
+    current_user: dict[str, Any] = Depends(get_current_user_strict)
 ) -> PasswordChangeResponse:
     """
     Change the current user's password.
@@ -0,0 +1,106 @@
+"""
+In-process caching utilities.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry time-to-live.
+
+    Not shared between worker processes; callers are responsible for
+    invalidating entries when the underlying data changes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value, or default on miss / expiry."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached value, calling loader on a miss.
+
+        Concurrent misses for the same key share a single loader call.
+        Failed loads are not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._loading[key] = future
+            future.add_done_callback(lambda done: self._finish_load(key, done))
+        return await asyncio.shield(future)
+
+    def _finish_load(self, key: Hashable, future: asyncio.Future) -> None:
+        # Skip the store if the key was invalidated while loading
+        if self._loading.get(key) is not future:
+            return
+        del self._loading[key]
+        if not future.cancelled() and future.exception() is None:
+            self.set(key, future.result())
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry (and any load in progress for it)."""
+        self._data.pop(key, None)
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+        self._loading.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of cache usage metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
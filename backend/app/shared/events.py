@@ -0,0 +1,205 @@
+"""
+Event bus carrying WebSocket broadcasts between workers.
+
+Each worker only holds its own sockets and its own product catalog, so a
+product change made on one worker has to reach the others before they can
+fan it out or serve it. Services publish to the bus; every worker subscribes
+``manager.broadcast`` and ``sync_catalog`` at startup.
+
+The backend is picked from EVENT_BUS_URL:
+
+- empty (default): in process. Fine for a single worker.
+- postgresql://...: Postgres LISTEN/NOTIFY on one dedicated connection per
+  worker. LISTEN needs a session, so this must be a direct or session-mode
+  pooler connection (port 5432), not the transaction pooler.
+
+Publishers deliver to their own worker straight away; the Postgres bus tags
+each notification with the worker's id and ignores its own echo. Handlers
+subscribed with ``local=False`` only see events from other workers (e.g.
+catalog sync, which the publishing worker has already applied itself).
+"""
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable
+
+from app.config import get_settings
+
+
+Handler = Callable[[dict[str, Any], str], Awaitable[None]]
+
+CHANNEL = "zenglow_events"
+# NOTIFY payloads are limited to 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+
+class LocalEventBus:
+    """Delivers events to subscribers in this process only."""
+
+    def __init__(self):
+        # (handler, also called for this worker's own events)
+        self._handlers: list[tuple[Handler, bool]] = []
+        self._tasks: set[asyncio.Task] = set()
+        self.published = 0
+        self.handler_errors = 0
+
+    def subscribe(self, handler: Handler, local: bool = True) -> None:
+        """Call `handler(message, topic)` for every event (only other workers' if not `local`)."""
+        self._handlers.append((handler, local))
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        """Wait for events still being delivered."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _deliver(self, message: dict[str, Any], topic: str, remote: bool = False) -> None:
+        for handler, local in self._handlers:
+            if not (local or remote):
+                continue
+            try:
+                await handler(message, topic)
+            except Exception as e:
+                self.handler_errors += 1
+                print(f"⚠️ Event handler failed: {e}")
+
+    async def publish(self, message: dict[str, Any], topic: str = "products") -> None:
+        """Deliver an event to every subscriber."""
+        self.published += 1
+        await self._deliver(message, topic)
+
+    def publish_nowait(self, message: dict[str, Any], topic: str = "products") -> None:
+        """Publish in the background so the caller's response isn't held up."""
+        # Hold a reference: the loop only keeps weak ones to running tasks
+        task = asyncio.create_task(self.publish(message, topic))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "local",
+            "published": self.published,
+            "handler_errors": self.handler_errors,
+        }
+
+
+def _slim(message: dict[str, Any]) -> dict[str, Any]:
+    """Drop the product body from a message too large to NOTIFY.
+
+    Clients refetch on every message, and other workers reload the rows
+    into their catalogs, so the type and ids are enough.
+    """
+    if "product_ids" in message:
+        return {"type": message.get("type"), "product_ids": message["product_ids"]}
+    product_id = message.get("product_id") or (message.get("product") or {}).get("id")
+    return {"type": message.get("type"), "product_id": product_id}
+
+
+class PostgresEventBus(LocalEventBus):
+    """Shares events between workers through Postgres LISTEN/NOTIFY."""
+
+    def __init__(self, url: str, reconnect_delay: float = 5.0):
+        super().__init__()
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid.uuid4().hex
+        self._connection = None
+        # asyncpg runs one operation per connection at a time
+        self._notify_lock = asyncio.Lock()
+        self._runner: asyncio.Task | None = None
+        self.received = 0
+        self.publish_errors = 0
+        self.reconnects = 0
+
+    async def start(self) -> None:
+        """Start listening (reconnects in the background until closed)."""
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        # Imported here so single-worker deployments don't need a direct connection
+        import asyncpg
+
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self.url)
+                self._connection.add_termination_listener(lambda _: lost.set())
+                await self._connection.add_listener(CHANNEL, self._on_notify)
+                await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Event bus connection failed: {e}")
+            finally:
+                connection, self._connection = self._connection, None
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        if event.get("origin") == self.origin:
+            return
+        self.received += 1
+        # Hold a reference: the loop only keeps weak ones to running tasks
+        task = asyncio.create_task(self._deliver(event["message"], event["topic"], remote=True))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def publish(self, message: dict[str, Any], topic: str = "products") -> None:
+        """Deliver locally, then notify the other workers."""
+        await super().publish(message, topic)
+
+        payload = json.dumps(
+            {"origin": self.origin, "topic": topic, "message": message}, separators=(",", ":")
+        )
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps(
+                {"origin": self.origin, "topic": topic, "message": _slim(message)}, separators=(",", ":")
+            )
+
+        try:
+            async with self._notify_lock:
+                connection = self._connection
+                if connection is None:
+                    raise ConnectionError("not connected")
+                await connection.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+        except Exception as e:
+            # Local clients already have it; other workers catch up on their next refetch
+            self.publish_errors += 1
+            print(f"⚠️ Event bus publish failed: {e}")
+
+    async def close(self) -> None:
+        # Flush pending publishes while the connection is still up
+        await super().close()
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "backend": "postgres",
+            "connected": self._connection is not None,
+            "received": self.received,
+            "publish_errors": self.publish_errors,
+            "reconnects": self.reconnects,
+        }
+
+
+def create_event_bus(url: str) -> LocalEventBus | PostgresEventBus:
+    """Pick the event bus for an EVENT_BUS_URL."""
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresEventBus(url)
+    return LocalEventBus()
+
+
+# Global event bus
+event_bus = create_event_bus(get_settings().event_bus_url)
@@ -53,3 +53,13 @@ class ConflictError(HTTPException):
             status_code=status.HTTP_409_CONFLICT,
             detail=detail,
         )
+
+
+class ServiceUnavailableError(HTTPException):
+    """Raised when a dependency needed to serve the request is unavailable."""
+    
+    def __init__(self, detail: str = "Service temporarily unavailable"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+        )
@@ -0,0 +1,127 @@
+"""
+HTTP caching for public GET endpoints.
+
+Routes compute a validator (an ETag, and a Last-Modified time where there is
+one) from data they already hold in memory and call ``conditional_get``
+before building the response. A client or CDN revalidating with
+``If-None-Match`` / ``If-Modified-Since`` then gets a bodiless 304 without the
+route querying the database or serializing the payload. Responses carry
+``Cache-Control`` so shared caches can serve them for HTTP_CACHE_S_MAXAGE
+seconds and revalidate in the background after that.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+from app.config import get_settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values a response is derived from."""
+    digest = hashlib.blake2b("\0".join(str(part) for part in parts).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _parse_timestamp(value: str | datetime | None) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return parsed.replace(microsecond=0) if parsed else None
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since
+
+
+def cache_control() -> str:
+    """Cache-Control for public, CDN-cacheable responses."""
+    settings = get_settings()
+    return (
+        f"public, max-age={settings.http_cache_max_age}, "
+        f"s-maxage={settings.http_cache_s_maxage}, "
+        f"stale-while-revalidate={settings.http_cache_stale_while_revalidate}"
+    )
+
+
+class ConditionalGetStats:
+    """Counts of revalidated (304) vs full responses."""
+
+    def __init__(self):
+        self.not_modified = 0
+        self.full = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of conditional GET metrics."""
+        total = self.not_modified + self.full
+        return {
+            "not_modified": self.not_modified,
+            "full": self.full,
+            "not_modified_ratio": round(self.not_modified / total, 4) if total else 0.0,
+        }
+
+
+http_cache_stats = ConditionalGetStats()
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: str | datetime | None = None,
+) -> Response | None:
+    """
+    Apply validators to a response and answer revalidations.
+
+    Sets ETag, Last-Modified and Cache-Control on `response` (the route's
+    injected Response). Returns a 304 response if the client's copy is still
+    current, which the route should return as is; otherwise None, and the
+    route builds the full response.
+
+    If-None-Match takes precedence; If-Modified-Since is only considered
+    when the request has no If-None-Match (RFC 9110).
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control()}
+    modified_at = _parse_timestamp(last_modified)
+    if modified_at is not None:
+        headers["Last-Modified"] = format_datetime(modified_at, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and modified_at is not None:
+        fresh = _not_modified_since(if_modified_since, modified_at)
+    else:
+        fresh = False
+
+    if fresh:
+        http_cache_stats.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    http_cache_stats.full += 1
+    return None
@@ -0,0 +1,248 @@
+"""
+Idempotency keys for non-idempotent POSTs.
+
+A client that times out and retries a POST sends the same ``Idempotency-Key``
+header both times. The route runs the operation through
+``idempotency_store.run`` keyed on (path, user, key): the first request
+executes it, requests arriving while it is in flight await the same result,
+and later ones get the stored result replayed, so the write happens once.
+The operation is shielded from client disconnects, so a request abandoned
+mid-write still completes and its result is there for the retry.
+
+Results are kept for IDEMPOTENCY_KEY_TTL seconds. Failures are not stored;
+retrying after one runs the operation again. Keys live in the store picked
+from RATE_LIMIT_STORAGE_URI: in process memory (at most
+IDEMPOTENCY_STORE_SIZE keys per worker, least recently used evicted first),
+or in Redis so a retry that lands on another worker is still deduplicated.
+"""
+import asyncio
+import hashlib
+import json
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+
+from app.config import get_settings
+from app.shared.cache import TTLCache
+from app.shared.exceptions import ValidationError
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(body: str | bytes) -> str:
+    """Digest of a request body, to detect a key reused for a different request."""
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    """Per-process bounded store of in-flight and completed results by idempotency key."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400.0):
+        self._results = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.executed = 0
+        self.replayed = 0
+        self.mismatched = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Any]],
+        model: type[BaseModel] | None = None,
+    ) -> tuple[Any, bool]:
+        """
+        Run operation once per key.
+
+        Returns (result, replayed), where replayed is True if this call got
+        another request's result instead of running the operation. `model`
+        is the operation's result type, used by stores that keep results
+        outside the process (results here are kept as is).
+
+        Raises:
+            ValidationError: If the key was used for a request with a
+                different fingerprint
+        """
+        executed = False
+
+        async def execute() -> tuple[str, Any]:
+            nonlocal executed
+            executed = True
+            self.executed += 1
+            return fingerprint, await operation()
+
+        stored_fingerprint, result = await self._results.get_or_load(key, execute)
+
+        if stored_fingerprint != fingerprint:
+            self.mismatched += 1
+            raise ValidationError(f"{IDEMPOTENCY_HEADER} was already used for a different request")
+
+        if not executed:
+            self.replayed += 1
+        return result, not executed
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._results.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of idempotency store metrics."""
+        return {
+            **self._results.stats(),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "mismatched": self.mismatched,
+        }
+
+
+class RedisIdempotencyStore:
+    """
+    Idempotency store shared by all workers through Redis.
+
+    The first request claims the key with ``SET NX`` and a pending marker
+    that expires after `pending_ttl` seconds, so a worker that dies
+    mid-operation doesn't hold the key forever. Duplicates poll until the
+    result is stored, the marker is gone (the operation failed, so they
+    claim it themselves), or it expires. While Redis is unreachable keys fall
+    back to a per-process store.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = 86_400.0,
+        pending_ttl: float = 60.0,
+        poll_interval: float = 0.05,
+        prefix: str = "zenglow:idempotency",
+        fallback: IdempotencyStore | None = None,
+    ):
+        # Imported here so memory-only deployments don't need the client
+        from redis.asyncio import Redis
+        from redis.exceptions import RedisError
+
+        self._redis = Redis.from_url(url, decode_responses=True)
+        self._errors = (RedisError, OSError)
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self.fallback = fallback or IdempotencyStore(ttl=ttl)
+        # Operations in flight (shielded, so nothing else may reference them)
+        self._tasks: set[asyncio.Task] = set()
+        self.executed = 0
+        self.replayed = 0
+        self.mismatched = 0
+        self.store_errors = 0
+
+    def _key(self, key: Hashable) -> str:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    async def run(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Any]],
+        model: type[BaseModel] | None = None,
+    ) -> tuple[Any, bool]:
+        """
+        Run operation once per key across workers.
+
+        Returns (result, replayed); replayed results are rebuilt as `model`
+        when given.
+
+        Raises:
+            ValidationError: If the key was used for a request with a
+                different fingerprint
+        """
+        redis_key = self._key(key)
+        pending = json.dumps({"fingerprint": fingerprint})
+        while True:
+            try:
+                claimed = await self._redis.set(
+                    redis_key, pending, nx=True, px=int(self.pending_ttl * 1000)
+                )
+                stored = None if claimed else await self._redis.get(redis_key)
+            except self._errors as e:
+                self.store_errors += 1
+                print(f"⚠️ Idempotency store unavailable, using this worker's keys: {e}")
+                return await self.fallback.run(key, fingerprint, operation, model)
+
+            if claimed:
+                task = asyncio.ensure_future(self._execute(redis_key, fingerprint, operation))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return await asyncio.shield(task), False
+            if stored is None:
+                # Released or expired between SET and GET - try to claim it
+                continue
+
+            entry = json.loads(stored)
+            if entry["fingerprint"] != fingerprint:
+                self.mismatched += 1
+                raise ValidationError(f"{IDEMPOTENCY_HEADER} was already used for a different request")
+            if "result" in entry:
+                self.replayed += 1
+                result = entry["result"]
+                return (model.model_validate(result) if model else result), True
+            await asyncio.sleep(self.poll_interval)
+
+    async def _execute(
+        self, redis_key: str, fingerprint: str, operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        self.executed += 1
+        try:
+            result = await operation()
+        except BaseException:
+            # Release the key so a retry runs the operation again
+            with suppress(Exception):
+                await self._redis.delete(redis_key)
+            raise
+
+        stored = result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+        try:
+            await self._redis.set(
+                redis_key,
+                json.dumps({"fingerprint": fingerprint, "result": stored}),
+                px=int(self.ttl * 1000),
+            )
+        except self._errors as e:
+            # Retries wait out the pending marker and then run again
+            self.store_errors += 1
+            print(f"⚠️ Idempotency result not stored: {e}")
+        return result
+
+    def clear(self) -> None:
+        """Forget keys held in this process (Redis keys expire on their own)."""
+        self.fallback.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of idempotency store metrics."""
+        return {
+            "backend": "redis",
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "mismatched": self.mismatched,
+            "store_errors": self.store_errors,
+            "fallback": self.fallback.stats(),
+        }
+
+
+def create_idempotency_store(
+    storage_uri: str, maxsize: int, ttl: float
+) -> IdempotencyStore | RedisIdempotencyStore:
+    """Pick the idempotency store for a RATE_LIMIT_STORAGE_URI."""
+    if storage_uri.startswith(("redis://", "rediss://", "unix://")):
+        return RedisIdempotencyStore(storage_uri, ttl=ttl, fallback=IdempotencyStore(maxsize, ttl))
+    return IdempotencyStore(maxsize, ttl)
+
+
+idempotency_store = create_idempotency_store(
+    get_settings().rate_limit_storage_uri,
+    get_settings().idempotency_store_size,
+    get_settings().idempotency_key_ttl,
+)
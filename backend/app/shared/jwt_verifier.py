@@ -0,0 +1,140 @@
+"""
+Local verification of Supabase access tokens.
+
+Tokens signed with the project's HS256 secret are verified against
+SUPABASE_JWT_SECRET; asymmetric tokens (RS256/ES256) are verified against the
+project's JWKS, fetched once and cached. When a token can't be checked locally
+(no secret configured, or a signing key we can't find even after refreshing
+the JWKS) callers fall back to asking the auth server.
+"""
+import time
+from typing import Any
+
+import httpx
+from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from app.config import get_settings
+
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed, expired or has a bad signature."""
+
+
+class LocalVerificationUnavailable(Exception):
+    """Token can't be verified locally; use the remote check instead."""
+
+
+class JWTVerifier:
+    """Verify Supabase JWTs locally with a cached signing key set."""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        secret: str = "",
+        audience: str = "authenticated",
+        jwks_ttl: float = 600.0,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.jwks_url = jwks_url
+        self.secret = secret
+        self.audience = audience
+        self.jwks_ttl = jwks_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._keys_expire_at = 0.0
+        self._last_fetch = 0.0
+
+    async def _fetch_jwks(self) -> None:
+        """Fetch and cache the project's public signing keys."""
+        self._last_fetch = time.monotonic()
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+
+        self._keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+        self._keys_expire_at = self._last_fetch + self.jwks_ttl
+
+    async def _get_signing_key(self, kid: str | None) -> dict[str, Any]:
+        """Look up a JWKS key by id, refreshing the cache on expiry or rotation."""
+        now = time.monotonic()
+        stale = now >= self._keys_expire_at
+        unknown = kid not in self._keys
+        can_refresh = now - self._last_fetch >= self.min_refresh_interval
+
+        if stale or (unknown and can_refresh):
+            try:
+                await self._fetch_jwks()
+            except Exception as e:
+                if not self._keys:
+                    raise LocalVerificationUnavailable("JWKS unavailable") from e
+
+        if kid not in self._keys:
+            raise LocalVerificationUnavailable("Unknown signing key")
+        return self._keys[kid]
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """
+        Verify a token's signature, expiry and audience.
+
+        Returns:
+            The token claims.
+
+        Raises:
+            InvalidTokenError: If the token is malformed, expired or forged.
+            LocalVerificationUnavailable: If no local key can check it.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise InvalidTokenError("Malformed token") from e
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.secret:
+                raise LocalVerificationUnavailable("JWT secret not configured")
+            key: Any = self.secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = await self._get_signing_key(header.get("kid"))
+        else:
+            raise InvalidTokenError("Unsupported token algorithm")
+
+        try:
+            claims = jwt.decode(token, key, algorithms=[algorithm], audience=self.audience)
+        except (ExpiredSignatureError, JWTClaimsError, JWTError) as e:
+            raise InvalidTokenError(str(e)) from e
+
+        if not claims.get("sub"):
+            raise InvalidTokenError("Token has no subject")
+        return claims
+
+
+def user_from_claims(claims: dict[str, Any]) -> dict[str, Any]:
+    """Build the current-user dict from verified token claims."""
+    return {
+        "id": claims["sub"],
+        "email": claims.get("email"),
+        "user_metadata": claims.get("user_metadata") or {},
+        "created_at": None,
+        "app_metadata": claims.get("app_metadata") or {},
+    }
+
+
+_verifier: JWTVerifier | None = None
+
+
+def get_jwt_verifier() -> JWTVerifier:
+    """Get the shared JWT verifier (singleton)."""
+    global _verifier
+    if _verifier is None:
+        settings = get_settings()
+        _verifier = JWTVerifier(
+            jwks_url=f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            secret=settings.supabase_jwt_secret,
+            audience=settings.supabase_jwt_audience,
+            jwks_ttl=settings.jwks_cache_ttl,
+        )
+    return _verifier
@@ -6,21 +6,18 @@ from typing import Callable, Any
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 
-from app.database import get_supabase_admin_client
+from app.shared.store_config import get_store_settings
 
 
 async def is_maintenance_mode() -> bool:
-    """Check if maintenance mode is enabled."""
+    """Check if maintenance mode is enabled (from the cached store settings)."""
     try:
-        client = get_supabase_admin_client()
-        response = client.table("store_settings").select("maintenance_mode").limit(1).execute()
-        
-        if response.data and len(response.data) > 0:
-            return response.data[0].get("maintenance_mode", False)
-        return False
+        settings = await get_store_settings()
     except Exception:
-        # If unable to check, allow access
+        # If unable to check, allow access (and retry on the next request)
         return False
+    
+    return bool(settings.get("maintenance_mode", False)) if settings else False
 
 
 async def check_maintenance_mode(request: Request, call_next: Callable) -> Any:
@@ -63,31 +60,19 @@ async def check_maintenance_mode(request: Request, call_next: Callable) -> Any:
         auth_header = request.headers.get("authorization", "")
         if auth_header.startswith("Bearer "):
             token = auth_header.replace("Bearer ", "")
+            is_admin = False
             try:
-                from app.shared.security import get_current_user
-                from app.database import get_supabase_admin_client
-                from fastapi.security import HTTPAuthorizationCredentials
-                
-                # Validate token
-                creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-                user = await get_current_user(creds)
-                
-                # Check if user is admin
-                client = get_supabase_admin_client()
-                profile_response = (
-                    client.table("user_profiles")
-                    .select("role")
-                    .eq("id", user.get("id"))
-                    .execute()
-                )
+                from app.shared.security import get_user_role, verify_token
                 
-                if profile_response.data and len(profile_response.data) > 0:
-                    role = profile_response.data[0].get("role", "customer")
-                    if role == "admin":
-                        # Admin user, allow access
-                        return await call_next(request)
+                # Validate token, then check if user is admin
+                user = await verify_token(token)
+                is_admin = await get_user_role(user["id"]) == "admin"
             except Exception:
                 pass  # Not authenticated or not admin
+            
+            if is_admin:
+                # Admin user, allow access
+                return await call_next(request)
         
         # Return maintenance response
         return JSONResponse(
@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the ``(created_at, id)`` of the
+last row on a page. Listings order by ``created_at DESC, id DESC`` and resume
+strictly after the cursor, so every page costs the same regardless of depth.
+
+Totals are optional: ``count="estimated"`` lets PostgREST fall back to the
+planner's row estimate on large tables instead of counting every row.
+"""
+import base64
+import binascii
+import json
+import math
+import re
+import uuid
+from typing import Any, Literal
+
+from app.shared.exceptions import ValidationError
+
+
+# Cursor parts are interpolated into PostgREST filters, so keep timestamps
+# to timestamp characters only (ids must parse as UUIDs).
+_TIMESTAMP_RE = re.compile(r"^[0-9T:.+\- Z]+$")
+
+# How listings compute their total: an exact COUNT(*), PostgREST's estimate
+# (exact for small tables, planner statistics past its row limit) or none.
+CountMode = Literal["exact", "estimated", "none"]
+
+
+def count_method(count: CountMode) -> str | None:
+    """PostgREST ``count`` option for a count mode (None skips the count)."""
+    return None if count == "none" else count
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """Encode a row's sort key as an opaque cursor."""
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode an opaque cursor into ``(created_at, id)``.
+
+    Raises:
+        ValidationError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
+
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValidationError("Invalid pagination cursor")
+    if not _TIMESTAMP_RE.match(created_at):
+        raise ValidationError("Invalid pagination cursor")
+    try:
+        # Anything else would reach Postgres as invalid uuid input (a 500)
+        row_id = str(uuid.UUID(row_id))
+    except ValueError:
+        raise ValidationError("Invalid pagination cursor")
+
+    return created_at, row_id
+
+
+def keyset_filter(cursor: str) -> str:
+    """
+    Build a PostgREST ``or`` filter selecting rows after the cursor.
+
+    Matches ``(created_at, id) < (cursor.created_at, cursor.id)`` for a
+    ``created_at DESC, id DESC`` ordering.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return (
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+    )
+
+
+def paginate_rows(rows: list[dict[str, Any]], limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    Trim a ``limit + 1`` fetch to one page and compute the next cursor.
+
+    Returns:
+        (page rows, next cursor or None when this is the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(str(last["created_at"]), str(last["id"]))
+
+
+def total_pages(total: int | None, page_size: int) -> int | None:
+    """Number of pages for a total (None when the total wasn't counted)."""
+    if total is None:
+        return None
+    return math.ceil(total / page_size) if total > 0 else 1
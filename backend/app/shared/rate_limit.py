@@ -1,28 +1,47 @@
 """
 Rate limiting configuration using SlowAPI.
+
+Counters live in RATE_LIMIT_STORAGE_URI. The default, ``memory://``, keeps
+them per process, which is only right for a single worker; point it at Redis
+(``redis://host:6379/0``) so every worker shares one set of counters and
+limits hold however many workers run. Any storage the ``limits`` package
+supports works. The default sliding-window-counter strategy is updated
+atomically in Redis and keeps two counters per key and window.
+
+If the shared storage is unreachable, limits fall back to per-process
+memory until it recovers instead of failing requests.
 """
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.config import get_settings
 
 
-def get_limiter() -> Limiter:
-    """Create and return the rate limiter instance."""
-    return Limiter(key_func=get_remote_address)
-
-
-# Global limiter instance
-limiter = get_limiter()
-
-
-def rate_limit_key_func(request):
+def rate_limit_key_func(request: Request) -> str:
     """
     Custom key function that considers both IP and user ID.
     Falls back to IP address for unauthenticated requests.
     """
-    # Try to get user from request state (set by auth middleware)
+    # Set by get_current_user, which runs before the limit is checked
     user = getattr(request.state, "user", None)
     if user and isinstance(user, dict) and "id" in user:
         return f"user:{user['id']}"
     return get_remote_address(request)
+
+
+def get_limiter() -> Limiter:
+    """Create and return the rate limiter instance."""
+    settings = get_settings()
+    shared = not settings.rate_limit_storage_uri.startswith("memory://")
+    return Limiter(
+        key_func=rate_limit_key_func,
+        storage_uri=settings.rate_limit_storage_uri,
+        strategy=settings.rate_limit_strategy,
+        key_prefix="zenglow",
+        in_memory_fallback_enabled=shared,
+    )
+
+
+# Global limiter instance
+limiter = get_limiter()
@@ -1,124 +1,265 @@
 """
 Track failed login attempts and implement account lockout.
+
+Each email keeps at most MAX_ATTEMPTS failure timestamps (a ring buffer), so
+recording a failure or checking the remaining attempts is constant time.
+The account locks once MAX_ATTEMPTS failures fall inside ATTEMPT_WINDOW.
+
+Attempts are kept in a pluggable store, picked from RATE_LIMIT_STORAGE_URI:
+in process memory (capped at LOGIN_TRACKER_MAX_KEYS emails, least recently
+used evicted first, and swept every LOGIN_TRACKER_SWEEP_INTERVAL seconds),
+or in Redis so lockouts are shared by every worker (keys expire on their
+own there).
 """
-from datetime import datetime, timedelta
-from typing import Optional
 import asyncio
+import time
+from collections import OrderedDict, deque
+from datetime import timedelta
+from typing import Any, Optional
+
+from app.config import get_settings
+
+
+class _Attempts:
+    """Recent failures and lockout for one email."""
+
+    __slots__ = ("failures", "locked_until")
+
+    def __init__(self, max_attempts: int):
+        self.failures: deque[float] = deque(maxlen=max_attempts)
+        self.locked_until: float | None = None
+
+
+class MemoryAttemptStore:
+    """Per-process attempt store with a bounded number of emails."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._entries: OrderedDict[str, _Attempts] = OrderedDict()
+        self.evictions = 0
+
+    async def record(
+        self, key: str, now: float, max_attempts: int, window: float, lockout: float
+    ) -> tuple[int, float | None]:
+        """Record a failure; returns (failures in window, locked until)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Attempts(max_attempts)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._entries.move_to_end(key)
+
+        entry.failures.append(now)
+        recent = sum(1 for failure in entry.failures if now - failure < window)
+        if recent >= max_attempts:
+            entry.locked_until = now + lockout
+        return recent, entry.locked_until
+
+    async def recent(self, key: str, now: float, window: float) -> int:
+        """Failures for key inside the window."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        return sum(1 for failure in entry.failures if now - failure < window)
+
+    async def locked_until(self, key: str) -> float | None:
+        entry = self._entries.get(key)
+        return entry.locked_until if entry else None
+
+    async def reset(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def sweep(self, now: float, window: float) -> int:
+        """Drop emails with no recent failures and no active lockout."""
+        stale = [
+            key for key, entry in self._entries.items()
+            if (entry.locked_until is None or entry.locked_until <= now)
+            and (not entry.failures or now - entry.failures[-1] >= window)
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_keys": self.max_keys,
+            "evictions": self.evictions,
+        }
+
+
+# KEYS: failures list, lockout key. ARGV: now, max_attempts, window, lockout (seconds)
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local max_attempts = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local lockout = tonumber(ARGV[4])
+
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('LTRIM', KEYS[1], 0, max_attempts - 1)
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+
+local recent = 0
+for _, failure in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    if now - tonumber(failure) < window then
+        recent = recent + 1
+    end
+end
+
+if recent >= max_attempts then
+    redis.call('SET', KEYS[2], tostring(now + lockout), 'PX', math.ceil(lockout * 1000))
+end
+return {recent, redis.call('GET', KEYS[2]) or ''}
+"""
+
+
+class RedisAttemptStore:
+    """Attempt store shared by all workers through Redis."""
+
+    def __init__(self, url: str, prefix: str = "zenglow:login"):
+        # Imported here so memory-only deployments don't need the client
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url, decode_responses=True)
+        self._record = self._redis.register_script(_RECORD_SCRIPT)
+        self.prefix = prefix
+
+    def _keys(self, key: str) -> tuple[str, str]:
+        return f"{self.prefix}:failures:{key}", f"{self.prefix}:locked:{key}"
+
+    async def record(
+        self, key: str, now: float, max_attempts: int, window: float, lockout: float
+    ) -> tuple[int, float | None]:
+        recent, locked_until = await self._record(
+            keys=self._keys(key), args=[now, max_attempts, window, lockout]
+        )
+        return int(recent), float(locked_until) if locked_until else None
+
+    async def recent(self, key: str, now: float, window: float) -> int:
+        failures = await self._redis.lrange(self._keys(key)[0], 0, -1)
+        return sum(1 for failure in failures if now - float(failure) < window)
+
+    async def locked_until(self, key: str) -> float | None:
+        locked_until = await self._redis.get(self._keys(key)[1])
+        return float(locked_until) if locked_until else None
+
+    async def reset(self, key: str) -> None:
+        await self._redis.delete(*self._keys(key))
+
+    async def sweep(self, now: float, window: float) -> int:
+        # Redis expires the keys itself
+        return 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def create_attempt_store(storage_uri: str, max_keys: int) -> MemoryAttemptStore | RedisAttemptStore:
+    """Pick the attempt store for a RATE_LIMIT_STORAGE_URI."""
+    if storage_uri.startswith(("redis://", "rediss://", "unix://")):
+        return RedisAttemptStore(storage_uri)
+    return MemoryAttemptStore(max_keys)
 
 
 class LoginAttemptTracker:
     """Track failed login attempts per email address."""
-    
-    # In-memory storage (for production, use Redis or database)
-    _attempts: dict[str, list[datetime]] = {}
-    _lockouts: dict[str, datetime] = {}
-    
+
     # Configuration
     MAX_ATTEMPTS = 5  # Maximum failed attempts
     LOCKOUT_DURATION = timedelta(minutes=15)  # Lockout duration
     ATTEMPT_WINDOW = timedelta(minutes=10)  # Time window to track attempts
-    
-    @classmethod
-    async def record_failed_attempt(cls, email: str) -> None:
-        """Record a failed login attempt."""
-        now = datetime.utcnow()
-        
-        # Initialize if not exists
-        if email not in cls._attempts:
-            cls._attempts[email] = []
-        
-        # Add current attempt
-        cls._attempts[email].append(now)
-        
-        # Clean old attempts outside the window
-        cls._attempts[email] = [
-            attempt for attempt in cls._attempts[email]
-            if now - attempt < cls.ATTEMPT_WINDOW
-        ]
-        
-        # Check if should lock account
-        if len(cls._attempts[email]) >= cls.MAX_ATTEMPTS:
-            cls._lockouts[email] = now + cls.LOCKOUT_DURATION
-    
-    @classmethod
-    async def is_locked_out(cls, email: str) -> tuple[bool, Optional[int]]:
+
+    def __init__(self, store: MemoryAttemptStore | RedisAttemptStore | None = None):
+        self.store = store or MemoryAttemptStore()
+        self.store_errors = 0
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return email.strip().lower()
+
+    async def record_failed_attempt(self, email: str) -> int:
+        """Record a failed login attempt; returns the attempts remaining before lockout."""
+        try:
+            recent, _ = await self.store.record(
+                self._key(email),
+                time.time(),
+                self.MAX_ATTEMPTS,
+                self.ATTEMPT_WINDOW.total_seconds(),
+                self.LOCKOUT_DURATION.total_seconds(),
+            )
+        except Exception:
+            # Fail open: an unreachable store must not block logins
+            self.store_errors += 1
+            return self.MAX_ATTEMPTS
+        return max(0, self.MAX_ATTEMPTS - recent)
+
+    async def is_locked_out(self, email: str) -> tuple[bool, Optional[int]]:
         """
         Check if account is locked out.
-        
+
         Returns:
             tuple[bool, Optional[int]]: (is_locked, seconds_remaining)
         """
-        if email not in cls._lockouts:
+        try:
+            locked_until = await self.store.locked_until(self._key(email))
+        except Exception:
+            self.store_errors += 1
             return False, None
-        
-        now = datetime.utcnow()
-        lockout_until = cls._lockouts[email]
-        
-        if now >= lockout_until:
-            # Lockout expired, clean up
-            del cls._lockouts[email]
-            if email in cls._attempts:
-                del cls._attempts[email]
+
+        now = time.time()
+        if locked_until is None or now >= locked_until:
             return False, None
-        
-        seconds_remaining = int((lockout_until - now).total_seconds())
-        return True, seconds_remaining
-    
-    @classmethod
-    async def reset_attempts(cls, email: str) -> None:
+        return True, int(locked_until - now)
+
+    async def reset_attempts(self, email: str) -> None:
         """Reset attempts after successful login."""
-        if email in cls._attempts:
-            del cls._attempts[email]
-        if email in cls._lockouts:
-            del cls._lockouts[email]
-    
-    @classmethod
-    async def get_remaining_attempts(cls, email: str) -> int:
+        try:
+            await self.store.reset(self._key(email))
+        except Exception:
+            self.store_errors += 1
+
+    async def get_remaining_attempts(self, email: str) -> int:
         """Get number of remaining attempts before lockout."""
-        if email not in cls._attempts:
-            return cls.MAX_ATTEMPTS
-        
-        now = datetime.utcnow()
-        
-        # Clean old attempts
-        cls._attempts[email] = [
-            attempt for attempt in cls._attempts[email]
-            if now - attempt < cls.ATTEMPT_WINDOW
-        ]
-        
-        current_attempts = len(cls._attempts[email])
-        return max(0, cls.MAX_ATTEMPTS - current_attempts)
-    
-    @classmethod
-    async def cleanup_old_data(cls) -> None:
-        """Periodic cleanup of old data."""
-        now = datetime.utcnow()
-        
-        # Clean expired lockouts
-        expired_lockouts = [
-            email for email, lockout_time in cls._lockouts.items()
-            if now >= lockout_time
-        ]
-        for email in expired_lockouts:
-            del cls._lockouts[email]
-        
-        # Clean old attempts
-        for email in list(cls._attempts.keys()):
-            cls._attempts[email] = [
-                attempt for attempt in cls._attempts[email]
-                if now - attempt < cls.ATTEMPT_WINDOW
-            ]
-            if not cls._attempts[email]:
-                del cls._attempts[email]
+        try:
+            recent = await self.store.recent(
+                self._key(email), time.time(), self.ATTEMPT_WINDOW.total_seconds()
+            )
+        except Exception:
+            self.store_errors += 1
+            return self.MAX_ATTEMPTS
+        return max(0, self.MAX_ATTEMPTS - recent)
+
+    async def cleanup_old_data(self) -> int:
+        """Drop stale entries; returns how many were removed."""
+        return await self.store.sweep(time.time(), self.ATTEMPT_WINDOW.total_seconds())
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of tracker metrics."""
+        return {**self.store.stats(), "store_errors": self.store_errors}
 
 
 # Global instance
-login_tracker = LoginAttemptTracker()
+login_tracker = LoginAttemptTracker(create_attempt_store(
+    get_settings().rate_limit_storage_uri,
+    get_settings().login_tracker_max_keys,
+))
 
 
-# Background cleanup task (optional - for production with long-running processes)
-async def start_cleanup_task():
-    """Start background task to clean up old data."""
+async def sweep_login_attempts_forever(interval: float) -> None:
+    """Sweep stale login attempts every `interval` seconds until cancelled."""
     while True:
-        await asyncio.sleep(300)  # Run every 5 minutes
-        await LoginAttemptTracker.cleanup_old_data()
+        await asyncio.sleep(interval)
+        try:
+            await login_tracker.cleanup_old_data()
+        except Exception as e:
+            print(f"⚠️ Login attempt sweep failed: {e}")
+
+
+def start_cleanup_task(interval: float) -> asyncio.Task | None:
+    """Start the background sweeper (None if disabled)."""
+    if interval <= 0:
+        return None
+    return asyncio.create_task(sweep_login_attempts_forever(interval))
@@ -7,24 +7,32 @@ from typing import Any
 from fastapi import Cookie, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.database import get_supabase_client
+from app.config import get_settings
+from app.database import admin_client, get_supabase_async_client
+from app.shared.cache import TTLCache
+from app.shared.jwt_verifier import (
+    InvalidTokenError,
+    LocalVerificationUnavailable,
+    get_jwt_verifier,
+    user_from_claims,
+)
 
 
 security = HTTPBearer(auto_error=False)
 
+# user id -> user_profiles.role. Invalidated by AdminRepository when a role or
+# status changes; other workers pick changes up on expiry.
+role_cache = TTLCache(
+    maxsize=get_settings().role_cache_size,
+    ttl=get_settings().role_cache_ttl,
+)
 
-async def get_current_user(
-    request: Request,
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    access_token: str | None = Cookie(default=None)
-) -> dict[str, Any]:
-    """
-    Validate JWT token and return current user.
-    Token can come from either Authorization header or cookie.
-    
-    Raises:
-        HTTPException: If token is invalid or expired.
-    """
+
+def _extract_token(
+    credentials: HTTPAuthorizationCredentials | None,
+    access_token: str | None,
+) -> str:
+    """Get the bearer token from the cookie or Authorization header."""
     # Try to get token from cookie first, then from Authorization header
     token = access_token
     if not token and credentials:
@@ -37,9 +45,21 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return token
+
+
+async def verify_token_remote(token: str) -> dict[str, Any]:
+    """
+    Validate a token with the Supabase auth server.
+    
+    Catches revoked sessions that a locally verified signature can't.
+    
+    Raises:
+        HTTPException: If token is invalid or expired.
+    """
     try:
-        client = get_supabase_client()
-        response = client.auth.get_user(token)
+        client = await get_supabase_async_client()
+        response = await client.auth.get_user(token)
         
         if not response.user:
             raise HTTPException(
@@ -64,6 +84,69 @@ async def get_current_user(
         ) from e
 
 
+async def verify_token(token: str) -> dict[str, Any]:
+    """
+    Validate a token locally, falling back to the auth server.
+    
+    The remote check is only used when the token can't be verified with a
+    cached key (no JWT secret configured, or an unknown signing key).
+    
+    Raises:
+        HTTPException: If token is invalid or expired.
+    """
+    try:
+        claims = await get_jwt_verifier().verify(token)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+    except LocalVerificationUnavailable:
+        return await verify_token_remote(token)
+    
+    return user_from_claims(claims)
+
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    access_token: str | None = Cookie(default=None)
+) -> dict[str, Any]:
+    """
+    Validate JWT token and return current user.
+    Token can come from either Authorization header or cookie.
+    
+    Raises:
+        HTTPException: If token is invalid or expired.
+    """
+    token = _extract_token(credentials, access_token)
+    user = await verify_token(token)
+    # Lets the rate limiter key authenticated requests per user
+    request.state.user = user
+    return user
+
+
+async def get_current_user_strict(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    access_token: str | None = Cookie(default=None)
+) -> dict[str, Any]:
+    """
+    Validate the token with the auth server and return current user.
+    
+    For revocation-sensitive routes (e.g. password changes) where a signed
+    but already signed-out token must be rejected.
+    
+    Raises:
+        HTTPException: If token is invalid, expired or revoked.
+    """
+    token = _extract_token(credentials, access_token)
+    user = await verify_token_remote(token)
+    request.state.user = user
+    return user
+
+
 async def get_current_user_optional(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
@@ -79,6 +162,35 @@ async def get_current_user_optional(
         return None
 
 
+async def _fetch_user_role(user_id: str) -> str:
+    """Read a user's role from user_profiles."""
+    async with admin_client() as client:
+        response = await (
+            client.table("user_profiles")
+            .select("role")
+            .eq("id", user_id)
+            .execute()
+        )
+    
+    if response.data and len(response.data) > 0:
+        return response.data[0].get("role", "customer")
+    return "customer"
+
+
+async def get_user_role(user_id: str) -> str:
+    """
+    Get a user's role, cached per user.
+    
+    Parallel requests from the same user share one lookup.
+    """
+    return await role_cache.get_or_load(user_id, lambda: _fetch_user_role(user_id))
+
+
+def invalidate_user_role(user_id: str) -> None:
+    """Forget a cached role after the user's profile changes."""
+    role_cache.invalidate(user_id)
+
+
 async def require_admin(
     current_user: dict[str, Any] = Depends(get_current_user)
 ) -> dict[str, Any]:
@@ -88,20 +200,7 @@ async def require_admin(
     Raises:
         HTTPException: If user is not an admin.
     """
-    from app.database import get_supabase_admin_client
-    
-    # Fetch role from user_profiles table
-    client = get_supabase_admin_client()
-    response = (
-        client.table("user_profiles")
-        .select("role")
-        .eq("id", current_user.get("id"))
-        .execute()
-    )
-    
-    role = "customer"
-    if response.data and len(response.data) > 0:
-        role = response.data[0].get("role", "customer")
+    role = await get_user_role(current_user.get("id"))
     
     if role != "admin":
         raise HTTPException(
@@ -0,0 +1,47 @@
+"""
+Process-wide cache of the store settings row.
+
+Store settings are read on almost every request (the maintenance check, the
+public store config, the admin dashboard) but change only when an admin
+saves them. Every consumer reads the row through ``get_store_settings``:
+concurrent misses share one query, StoreSettingsService pushes the new row
+in after an update, and other workers pick changes up after
+STORE_SETTINGS_CACHE_TTL seconds.
+"""
+from typing import Any
+
+from app.config import get_settings
+from app.database import admin_client
+from app.shared.cache import TTLCache
+
+
+STORE_SETTINGS_KEY = "store_settings"
+
+store_settings_cache = TTLCache(maxsize=1, ttl=get_settings().store_settings_cache_ttl)
+
+
+async def _fetch_store_settings() -> dict[str, Any] | None:
+    async with admin_client() as client:
+        response = await client.table("store_settings").select("*").limit(1).execute()
+    return response.data[0] if response.data else None
+
+
+async def get_store_settings() -> dict[str, Any] | None:
+    """
+    Get the store_settings row (None if the store has none yet).
+
+    Raises whatever the database query raised if the row isn't cached and
+    can't be loaded; failures are not cached.
+    """
+    return await store_settings_cache.get_or_load(STORE_SETTINGS_KEY, _fetch_store_settings)
+
+
+def set_store_settings(settings: dict[str, Any] | None) -> None:
+    """Replace the cached row after a settings change."""
+    store_settings_cache.invalidate(STORE_SETTINGS_KEY)
+    store_settings_cache.set(STORE_SETTINGS_KEY, settings)
+
+
+def invalidate_store_settings() -> None:
+    """Force the next read to query the database."""
+    store_settings_cache.invalidate(STORE_SETTINGS_KEY)
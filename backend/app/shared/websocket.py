@@ -1,45 +1,151 @@
 """
 WebSocket connection manager for real-time updates.
+
+``broadcast`` serializes a message once and puts the text on every
+connection's outbound queue without awaiting any socket; each connection has
+its own writer task draining its queue. A slow client only delays itself:
+when its queue is full the oldest pending message is dropped (clients treat
+every message as "refetch products", so the newest ones carry everything
+that matters), and a client still stuck on one send WEBSOCKET_SEND_TIMEOUT
+seconds later is disconnected by the next broadcast.
+
+Messages carry a per-topic ``seq``, numbered by this worker, so a client can
+tell when messages were dropped (and a reset means it reconnected to another
+worker). Broadcasts from other workers arrive through app.shared.events.
 """
-from typing import Dict, Set
+import asyncio
+import json
+from contextlib import suppress
+from typing import Any, Dict
+
 from fastapi import WebSocket
 
+from app.config import get_settings
+
+
+class _Connection:
+    """A client socket with its outbound queue and writer task."""
+
+    __slots__ = ("websocket", "queue", "writer", "sending_since")
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task | None = None
+        # When the send in progress started (None while idle)
+        self.sending_since: float | None = None
+
 
 class ConnectionManager:
     """Manages WebSocket connections for broadcasting updates."""
 
-    def __init__(self):
-        # Topic -> set of connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+    def __init__(self, queue_size: int = 32, send_timeout: float = 5.0):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        # Topic -> socket -> connection
+        self.active_connections: Dict[str, Dict[WebSocket, _Connection]] = {}
+        # Last sequence number per topic; a gap tells a client it missed messages
+        self.sequence: Dict[str, int] = {}
+        # Background closes of dropped sockets (the loop only holds weak references)
+        self._closing: set[asyncio.Task] = set()
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
 
     async def connect(self, websocket: WebSocket, topic: str = "products"):
         """Accept and track a new WebSocket connection."""
         await websocket.accept()
-        if topic not in self.active_connections:
-            self.active_connections[topic] = set()
-        self.active_connections[topic].add(websocket)
+        connection = _Connection(websocket, self.queue_size)
+        connection.writer = asyncio.create_task(self._write(connection, topic))
+        self.active_connections.setdefault(topic, {})[websocket] = connection
 
     def disconnect(self, websocket: WebSocket, topic: str = "products"):
-        """Remove a WebSocket connection."""
-        if topic in self.active_connections:
-            self.active_connections[topic].discard(websocket)
+        """Remove a WebSocket connection and stop its writer."""
+        connection = self.active_connections.get(topic, {}).pop(websocket, None)
+        if connection and connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
 
-    async def broadcast(self, message: dict, topic: str = "products"):
-        """Broadcast a message to all connections on a topic."""
-        if topic not in self.active_connections:
+    def _drop(self, connection: _Connection, topic: str) -> None:
+        """Disconnect a client that failed or stalled, closing its socket in the background."""
+        self.dropped += 1
+        self.disconnect(connection.websocket, topic)
+        task = asyncio.create_task(self._close(connection.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket) -> None:
+        with suppress(Exception):
+            await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+
+    async def _write(self, connection: _Connection, topic: str) -> None:
+        """Send queued messages to one client until it fails or is dropped."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                text = await connection.queue.get()
+                connection.sending_since = loop.time()
+                await connection.websocket.send_text(text)
+                connection.sending_since = None
+                self.sent += 1
+        except Exception:
+            # The socket is gone
+            self._drop(connection, topic)
+
+    async def broadcast(self, message: dict[str, Any], topic: str = "products"):
+        """Queue a message, stamped with the topic's next sequence number, for every connection."""
+        connections = self.active_connections.get(topic)
+        if not connections:
             return
-        
-        disconnected = set()
-        for connection in self.active_connections[topic]:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.add(connection)
-        
-        # Clean up disconnected
-        for conn in disconnected:
-            self.active_connections[topic].discard(conn)
+        seq = self.sequence[topic] = self.sequence.get(topic, 0) + 1
+
+        text = json.dumps({**message, "seq": seq}, separators=(",", ":"))
+        stalled_before = asyncio.get_running_loop().time() - self.send_timeout
+        stalled = []
+        for connection in connections.values():
+            if connection.sending_since is not None and connection.sending_since < stalled_before:
+                stalled.append(connection)
+                continue
+            queue = connection.queue
+            if queue.full():
+                # Coalesce: the client is behind, keep only the newest messages
+                queue.get_nowait()
+                self.coalesced += 1
+            queue.put_nowait(text)
+
+        for connection in stalled:
+            self._drop(connection, topic)
+
+    async def close(self) -> None:
+        """Stop every writer (on shutdown)."""
+        writers = [
+            connection.writer
+            for connections in self.active_connections.values()
+            for connection in connections.values()
+            if connection.writer
+        ]
+        self.active_connections.clear()
+        for writer in writers:
+            writer.cancel()
+        await asyncio.gather(*writers, *self._closing, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of connection and delivery metrics."""
+        return {
+            "connections": {topic: len(connections) for topic, connections in self.active_connections.items()},
+            "queued": sum(
+                connection.queue.qsize()
+                for connections in self.active_connections.values()
+                for connection in connections.values()
+            ),
+            "sequence": dict(self.sequence),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
 
 
 # Global connection manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(
+    queue_size=get_settings().websocket_queue_size,
+    send_timeout=get_settings().websocket_send_timeout,
+)
@@ -0,0 +1,91 @@
+"""
+Benchmark: blocking vs awaitable PostgREST calls under concurrent load.
+
+Simulates 50 concurrent clients hitting a repository method while the
+PostgREST round trip is replaced by an in-process transport with a fixed
+latency. The "sync" run issues the query through the synchronous Supabase
+client (the old repository path), the "async" run goes through
+``ProductRepository.get_all`` on the awaitable client.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_async_repositories
+"""
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+os.environ.setdefault("user", "bench")
+os.environ.setdefault("password", "bench")
+os.environ.setdefault("host", "localhost")
+
+from supabase import ClientOptions, create_client
+
+import app.database as database
+from app.services.products.repository import ProductRepository
+
+
+CONCURRENCY = 50
+REQUESTS = 500
+LATENCY = 0.02  # Simulated PostgREST round trip (seconds)
+PAYLOAD = json.dumps([{"id": "p1", "name": "Serum", "price": 10}]).encode()
+HEADERS = {"content-type": "application/json", "content-range": "0-0/1"}
+
+
+def _sync_handler(request: httpx.Request) -> httpx.Response:
+    time.sleep(LATENCY)
+    return httpx.Response(200, content=PAYLOAD, headers=HEADERS)
+
+
+async def _async_handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(LATENCY)
+    return httpx.Response(200, content=PAYLOAD, headers=HEADERS)
+
+
+async def _run(label: str, call) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def worker():
+        async with semaphore:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:>6}: {REQUESTS} requests in {elapsed:6.2f}s -> {REQUESTS / elapsed:8.1f} req/s")
+
+
+async def main() -> None:
+    settings_url = os.environ["SUPABASE_URL"]
+    key = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
+
+    sync_client = create_client(
+        settings_url,
+        key,
+        options=ClientOptions(httpx_client=httpx.Client(transport=httpx.MockTransport(_sync_handler))),
+    )
+    database._admin_client_pool = database.SupabaseClientPool(
+        settings_url,
+        key,
+        transport=httpx.MockTransport(_async_handler),
+    )
+
+    async def blocking_call():
+        sync_client.table("products").select("*", count="exact").eq("is_active", True).execute()
+
+    async def awaitable_call():
+        await ProductRepository.get_all()
+
+    print(f"concurrency={CONCURRENCY} latency={LATENCY * 1000:.0f}ms")
+    await _run("sync", blocking_call)
+    await _run("async", awaitable_call)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
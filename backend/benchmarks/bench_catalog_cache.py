@@ -0,0 +1,155 @@
+"""
+Benchmark: product reads from PostgREST vs the in-memory catalog.
+
+Runs the same mix of ``ProductService.list_products`` (with and without
+filters) and ``ProductService.get_product`` calls against two setups: the
+database path, where every read goes through ``ProductRepository`` to an
+in-process transport with a fixed latency, and the catalog path, where reads
+are served from the warm ``ProductCatalog`` snapshot. Reports p50/p99
+latency per request.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_catalog_cache
+"""
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+
+import httpx
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+os.environ.setdefault("user", "bench")
+os.environ.setdefault("password", "bench")
+os.environ.setdefault("host", "localhost")
+
+import app.database as database
+import app.services.products.catalog as catalog_module
+from app.services.products.catalog import ProductCatalog
+from app.services.products.service import ProductService
+
+
+PRODUCTS_COUNT = 200
+REQUESTS = 2000
+CONCURRENCY = 20
+LATENCY = 0.01  # Simulated PostgREST round trip (seconds)
+
+TYPES = ["cleanser", "serum", "toner", "moisturizer", "mask"]
+CONCERNS = ["acne", "aging", "dryness", "redness", "dullness"]
+SKIN_TYPES = ["dry", "oily", "combination", "sensitive", "normal"]
+
+PRODUCTS = [
+    {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "name": f"{random.choice(['Gentle', 'Daily', 'Night', 'Hydrating'])} {TYPES[i % 5].title()} {i}",
+        "description": "Lorem ipsum dolor sit amet.",
+        "price": 10 + i % 40,
+        "images": [],
+        "product_type": TYPES[i % 5],
+        "skin_concerns": random.sample(CONCERNS, 2),
+        "skin_types": random.sample(SKIN_TYPES, 2),
+        "key_ingredients": [],
+        "usage_time": random.choice(["AM", "PM", "AM/PM"]),
+        "stock": 100,
+        "in_stock": True,
+        "is_active": True,
+        "created_at": f"2024-01-01T00:00:{i % 60:02d}.{i:06d}+00:00",
+    }
+    for i in range(PRODUCTS_COUNT)
+]
+
+
+async def _handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(LATENCY)
+    rows = PRODUCTS
+    if "id=eq." in str(request.url):
+        product_id = request.url.params["id"].removeprefix("eq.")
+        rows = [p for p in PRODUCTS if p["id"] == product_id]
+    offset = int(request.url.params.get("offset", 0))
+    limit = int(request.url.params.get("limit", len(rows)))
+    page = rows[offset:offset + limit]
+    return httpx.Response(
+        200,
+        content=json.dumps(page).encode(),
+        headers={
+            "content-type": "application/json",
+            "content-range": f"{offset}-{offset + len(page) - 1}/{len(rows)}",
+        },
+    )
+
+
+class _DisabledCatalog(ProductCatalog):
+    """Catalog that is never ready, forcing the database path."""
+
+    async def ready(self) -> bool:
+        return False
+
+
+def _calls():
+    """A repeatable mix of listing and detail reads."""
+    rng = random.Random(42)
+    for _ in range(REQUESTS):
+        roll = rng.random()
+        if roll < 0.4:
+            yield ProductService.list_products, {"page": rng.randint(1, 5)}
+        elif roll < 0.7:
+            yield ProductService.list_products, {
+                "product_type": rng.choice(TYPES),
+                "skin_concern": rng.choice(CONCERNS),
+            }
+        else:
+            yield ProductService.get_product, {"product_id": rng.choice(PRODUCTS)["id"]}
+
+
+async def _run(label: str) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies: list[float] = []
+
+    async def timed(call, kwargs):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(**kwargs)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(call, kwargs) for call, kwargs in _calls()))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:>8}: p50 {p50:7.3f}ms  p99 {p99:7.3f}ms  "
+        f"{REQUESTS / elapsed:9.1f} req/s"
+    )
+
+
+async def main() -> None:
+    database._admin_client_pool = database.SupabaseClientPool(
+        os.environ["SUPABASE_URL"],
+        os.environ["SUPABASE_SERVICE_ROLE_KEY"],
+        transport=httpx.MockTransport(_handler),
+    )
+
+    print(
+        f"products={PRODUCTS_COUNT} requests={REQUESTS} "
+        f"concurrency={CONCURRENCY} latency={LATENCY * 1000:.0f}ms"
+    )
+
+    catalog_module._catalog = _DisabledCatalog()
+    await _run("database")
+
+    catalog = ProductCatalog(ttl=3600)
+    await catalog.load()
+    catalog_module._catalog = catalog
+    await _run("catalog")
+    print(f"catalog stats: {catalog.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
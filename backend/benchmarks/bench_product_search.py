@@ -0,0 +1,112 @@
+"""
+Benchmark: ranked index search vs substring scan on a 50k-product catalog.
+
+Generates a synthetic catalog from the repo's product vocabularies, builds a
+``SearchIndex`` over it, then times a fixed set of queries (whole words,
+inflected words, prefixes and multi-word queries) against the index and
+against a case-insensitive substring scan of the name (what
+``ilike('name', '%term%')`` does). Also times incremental updates.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_product_search
+"""
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+os.environ.setdefault("user", "bench")
+os.environ.setdefault("password", "bench")
+os.environ.setdefault("host", "localhost")
+
+from app.services.products.schemas import KEY_INGREDIENTS, PRODUCT_TYPES
+from app.services.products.search_index import SearchIndex
+
+
+PRODUCTS_COUNT = 50_000
+UPDATES = 1_000
+
+ADJECTIVES = [
+    "Hydrating", "Gentle", "Clarifying", "Brightening", "Soothing", "Daily",
+    "Renewing", "Firming", "Nourishing", "Balancing", "Purifying", "Calming",
+]
+WORDS = (
+    "lightweight rich formula skin barrier texture absorbs quickly leaves "
+    "glow radiant smooth soft plump fine lines pores redness hydration "
+    "moisturizing exfoliating overnight morning routine sensitive oily dry "
+    "combination fragrance free dermatologist tested vegan cruelty"
+).split()
+VOCABULARY_SIZE = 5_000
+
+QUERIES = [
+    "serum", "moisturizing", "vitamin c", "hyaluronic acid serum", "clean",
+    "retin", "brightening toner", "sensitive skin", "peptide cream", "exfol",
+]
+
+
+def _catalog(rng: random.Random) -> list[dict]:
+    # Descriptions mix common skincare words with a long tail of rarer
+    # ones (Zipf-like), as real product copy does
+    vocabulary = WORDS + [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(5, 10)))
+        for _ in range(VOCABULARY_SIZE)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [
+        {
+            "id": str(i),
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(KEY_INGREDIENTS)} {rng.choice(PRODUCT_TYPES)}",
+            "description": " ".join(rng.choices(vocabulary, weights=weights, k=25)),
+            "product_type": rng.choice(PRODUCT_TYPES),
+            "key_ingredients": rng.sample(KEY_INGREDIENTS, 2),
+        }
+        for i in range(PRODUCTS_COUNT)
+    ]
+
+
+def _time(fn, repeat: int = 5) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    rng = random.Random(11)
+    products = _catalog(rng)
+
+    start = time.perf_counter()
+    index = SearchIndex.build(products)
+    build_s = time.perf_counter() - start
+    print(
+        f"{PRODUCTS_COUNT} products: built in {build_s:.2f}s, "
+        f"{index.vocabulary_size} terms"
+    )
+
+    print(f"{'query':>22} | {'hits':>6} | {'index p50':>10} | {'scan p50':>9}")
+    for query in QUERIES:
+        hits = len(index.search(query))
+        index_ms = statistics.median(_time(lambda: index.search(query)))
+        needle = query.lower()
+        scan_ms = statistics.median(_time(
+            lambda: [p for p in products if needle in p["name"].lower()]
+        ))
+        print(f"{query:>22} | {hits:>6} | {index_ms:8.2f}ms | {scan_ms:7.2f}ms")
+
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        product = dict(rng.choice(products))
+        product["name"] = f"{rng.choice(ADJECTIVES)} {product['name']}"
+        index.add(product)
+    update_us = (time.perf_counter() - start) / UPDATES * 1e6
+    print(f"incremental update: {update_us:.1f}us/product")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: typeahead suggestions from the prefix trie on a 50k-product catalog.
+
+Generates product names from the repo's vocabularies plus a long tail of
+brand-like words, builds a ``SuggestIndex`` and times every keystroke of a
+few typed queries, cold (right after a write cleared the cached
+completions) and warm, against a name-prefix scan of the catalog (what
+``ilike('name', 'term%')`` does). Also times incremental updates.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_product_suggest
+"""
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+os.environ.setdefault("user", "bench")
+os.environ.setdefault("password", "bench")
+os.environ.setdefault("host", "localhost")
+
+from app.services.products.schemas import KEY_INGREDIENTS, PRODUCT_TYPES
+from app.services.products.suggest_index import SuggestIndex
+
+
+PRODUCTS_COUNT = 50_000
+BRANDS_COUNT = 2_000
+UPDATES = 1_000
+LIMIT = 8
+
+ADJECTIVES = [
+    "Hydrating", "Gentle", "Clarifying", "Brightening", "Soothing", "Daily",
+    "Renewing", "Firming", "Nourishing", "Balancing", "Purifying", "Calming",
+]
+TYPED = ["serum", "vitamin c", "hyaluronic", "brightening toner", "zq"]
+
+
+def _catalog(rng: random.Random) -> list[dict]:
+    brands = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9))).title()
+        for _ in range(BRANDS_COUNT)
+    ]
+    return [
+        {
+            "id": str(i),
+            "name": f"{rng.choice(brands)} {rng.choice(ADJECTIVES)} {rng.choice(KEY_INGREDIENTS)} {rng.choice(PRODUCT_TYPES)}",
+            "product_type": rng.choice(PRODUCT_TYPES),
+            "key_ingredients": rng.sample(KEY_INGREDIENTS, 2),
+            "is_active": True,
+        }
+        for i in range(PRODUCTS_COUNT)
+    ]
+
+
+def _time_us(fn, repeat: int = 20) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    rng = random.Random(7)
+    products = _catalog(rng)
+
+    start = time.perf_counter()
+    index = SuggestIndex.build(products)
+    build_s = time.perf_counter() - start
+    print(f"{PRODUCTS_COUNT} products: built in {build_s:.2f}s, {len(index)} suggestions")
+
+    def write():
+        product = dict(rng.choice(products))
+        product["name"] = f"{rng.choice(ADJECTIVES)} {product['name']}"
+        product["key_ingredients"] = rng.sample(KEY_INGREDIENTS, 2)
+        index.add(product)
+
+    print(f"{'prefix':>18} | {'cold':>9} | {'warm':>8} | {'scan':>9}")
+    for typed in TYPED:
+        for end in range(1, len(typed) + 1):
+            prefix = typed[:end]
+            if prefix.endswith(" "):
+                continue
+
+            def cold():
+                # A write clears the cached completions along its paths
+                write()
+                index.suggest(prefix, LIMIT)
+
+            write_us = _time_us(write)
+            cold_us = max(_time_us(cold) - write_us, 0.0)
+            warm_us = _time_us(lambda: index.suggest(prefix, LIMIT))
+            needle = prefix.lower()
+            scan_us = _time_us(
+                lambda: [p for p in products if p["name"].lower().startswith(needle)][:LIMIT],
+                repeat=3,
+            )
+            print(f"{prefix:>18} | {cold_us:7.0f}us | {warm_us:6.1f}us | {scan_us / 1000:7.2f}ms")
+
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        write()
+    update_us = (time.perf_counter() - start) / UPDATES * 1e6
+    print(f"incremental update: {update_us:.1f}us/product")
+
+
+if __name__ == "__main__":
+    main()
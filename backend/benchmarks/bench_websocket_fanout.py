@@ -0,0 +1,129 @@
+"""
+Benchmark: broadcasting product updates to 5,000 WebSocket clients.
+
+Simulates sockets whose ``send_text`` yields to the event loop once,
+with 1% of them slow (a congested mobile client). Broadcasts a batch of
+product-update messages through the previous sequential broadcaster (await
+every send in turn, serializing per socket) and through ``ConnectionManager``
+(serialize once, per-connection queues and writers), and reports how long
+the broadcasting coroutine is busy and when the fast clients have every
+message.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_websocket_fanout
+"""
+import asyncio
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+os.environ.setdefault("user", "bench")
+os.environ.setdefault("password", "bench")
+os.environ.setdefault("host", "localhost")
+
+from app.shared.websocket import ConnectionManager
+
+
+SOCKETS = 5_000
+SLOW_FRACTION = 0.01
+SLOW_DELAY = 0.05  # seconds per send for slow clients
+MESSAGES = 5
+
+MESSAGE = {
+    "type": "product_updated",
+    "product": {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "name": "Hydrating Serum",
+        "description": "Lorem ipsum dolor sit amet. " * 8,
+        "price": 24.0,
+        "images": ["https://res.cloudinary.com/demo/image/upload/serum.jpg"],
+        "product_type": "serum",
+        "skin_concerns": ["dryness", "dullness"],
+        "skin_types": ["dry", "normal"],
+        "key_ingredients": ["Hyaluronic Acid", "Niacinamide"],
+        "stock": 42,
+        "in_stock": True,
+        "is_active": True,
+    },
+}
+
+
+class SimulatedSocket:
+    def __init__(self, slow: bool):
+        self.slow = slow
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(SLOW_DELAY if self.slow else 0)
+        self.received += 1
+
+    async def send_json(self, data: dict):
+        await self.send_text(json.dumps(data))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def _sockets(rng: random.Random) -> list[SimulatedSocket]:
+    return [SimulatedSocket(rng.random() < SLOW_FRACTION) for _ in range(SOCKETS)]
+
+
+async def sequential_broadcast(sockets: list[SimulatedSocket], message: dict) -> None:
+    """The previous broadcaster: one awaited send_json per socket."""
+    for socket in sockets:
+        try:
+            await socket.send_json(message)
+        except Exception:
+            pass
+
+
+async def _until_delivered(sockets: list[SimulatedSocket], count: int) -> None:
+    while any(socket.received < count for socket in sockets):
+        await asyncio.sleep(0.001)
+
+
+async def bench_sequential(sockets: list[SimulatedSocket]) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        await sequential_broadcast(sockets, MESSAGE)
+    busy = time.perf_counter() - start
+    # Every client has everything once the loop returns
+    return busy, busy
+
+
+async def bench_queued(sockets: list[SimulatedSocket]) -> tuple[float, float]:
+    manager = ConnectionManager(queue_size=32, send_timeout=5.0)
+    for socket in sockets:
+        await manager.connect(socket)
+
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        await manager.broadcast(MESSAGE)
+    busy = time.perf_counter() - start
+
+    await _until_delivered([socket for socket in sockets if not socket.slow], MESSAGES)
+    fast_delivered = time.perf_counter() - start
+    await manager.close()
+    return busy, fast_delivered
+
+
+async def main() -> None:
+    slow = sum(socket.slow for socket in _sockets(random.Random(7)))
+    print(f"{SOCKETS} sockets ({slow} slow at {SLOW_DELAY * 1000:.0f}ms/send), {MESSAGES} messages")
+    print(f"{'broadcaster':>12} | {'broadcast busy':>14} | {'fast clients done':>17}")
+
+    for name, bench in (("sequential", bench_sequential), ("queued", bench_queued)):
+        busy, delivered = await bench(_sockets(random.Random(7)))
+        print(f"{name:>12} | {busy * 1000:12.1f}ms | {delivered * 1000:15.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
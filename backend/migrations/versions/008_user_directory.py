@@ -0,0 +1,96 @@
+"""Mirror auth emails on user_profiles and add per-user order counts
+
+Revision ID: 008_user_directory
+Revises: 007_products
+Create Date: 2025-01-06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_user_directory'
+down_revision: Union[str, None] = '007_products'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add user_profiles.email (kept in sync with auth.users) and user_order_counts view."""
+    
+    # Mirrored email column
+    op.execute("ALTER TABLE public.user_profiles ADD COLUMN IF NOT EXISTS email TEXT;")
+    
+    # Backfill from auth.users
+    op.execute("""
+        UPDATE public.user_profiles AS p
+        SET email = u.email
+        FROM auth.users AS u
+        WHERE u.id = p.id
+          AND p.email IS DISTINCT FROM u.email;
+    """)
+    
+    # Include email when the profile is created on signup
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.handle_new_user()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO public.user_profiles (id, full_name, email)
+            VALUES (NEW.id, NEW.raw_user_meta_data->>'full_name', NEW.email);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+    """)
+    
+    # Keep email in sync when it changes in auth.users
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.handle_user_email_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE public.user_profiles SET email = NEW.email WHERE id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+    """)
+    
+    op.execute("""
+        DROP TRIGGER IF EXISTS on_auth_user_email_changed ON auth.users;
+        CREATE TRIGGER on_auth_user_email_changed
+            AFTER UPDATE OF email ON auth.users
+            FOR EACH ROW
+            WHEN (OLD.email IS DISTINCT FROM NEW.email)
+            EXECUTE FUNCTION public.handle_user_email_change();
+    """)
+    
+    # Grouped order counts (server-side only)
+    op.execute("""
+        CREATE OR REPLACE VIEW public.user_order_counts AS
+            SELECT user_id, COUNT(*)::INTEGER AS orders_count
+            FROM public.orders
+            GROUP BY user_id;
+        
+        REVOKE ALL ON public.user_order_counts FROM anon, authenticated;
+    """)
+    
+    op.execute("CREATE INDEX IF NOT EXISTS idx_user_profiles_created_at ON public.user_profiles(created_at DESC);")
+
+
+def downgrade() -> None:
+    """Drop the mirrored email column and order counts view."""
+    op.execute("DROP VIEW IF EXISTS public.user_order_counts;")
+    op.execute("DROP TRIGGER IF EXISTS on_auth_user_email_changed ON auth.users;")
+    op.execute("DROP FUNCTION IF EXISTS public.handle_user_email_change();")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.handle_new_user()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO public.user_profiles (id, full_name)
+            VALUES (NEW.id, NEW.raw_user_meta_data->>'full_name');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+    """)
+    op.execute("DROP INDEX IF EXISTS public.idx_user_profiles_created_at;")
+    op.execute("ALTER TABLE public.user_profiles DROP COLUMN IF EXISTS email;")
@@ -0,0 +1,53 @@
+"""Add dashboard_stats() aggregate for the admin dashboard
+
+Revision ID: 009_dashboard_stats
+Revises: 008_user_directory
+Create Date: 2025-01-07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_dashboard_stats'
+down_revision: Union[str, None] = '008_user_directory'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create dashboard_stats() returning every headline stat in one call."""
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.dashboard_stats()
+        RETURNS JSONB AS $$
+            SELECT jsonb_build_object(
+                'total_revenue', (
+                    SELECT COALESCE(SUM(total), 0)
+                    FROM public.orders
+                    WHERE status = 'completed'
+                ),
+                'active_orders', (
+                    SELECT COUNT(*) FROM public.orders WHERE status = 'pending'
+                ),
+                'total_customers', (
+                    SELECT COUNT(*) FROM public.user_profiles WHERE role = 'customer'
+                ),
+                'total_products', (
+                    SELECT COUNT(*) FROM public.products WHERE is_active = TRUE
+                )
+            );
+        $$ LANGUAGE sql STABLE;
+        
+        REVOKE ALL ON FUNCTION public.dashboard_stats() FROM PUBLIC, anon, authenticated;
+    """)
+    
+    op.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON public.orders(created_at DESC);")
+
+
+def downgrade() -> None:
+    """Drop dashboard_stats()."""
+    op.execute("DROP INDEX IF EXISTS public.idx_orders_created_at;")
+    op.execute("DROP FUNCTION IF EXISTS public.dashboard_stats();")
@@ -0,0 +1,239 @@
+"""Add daily_metrics store maintained by triggers for the admin dashboard
+
+Revision ID: 010_daily_metrics
+Revises: 009_dashboard_stats
+Create Date: 2025-01-08
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010_daily_metrics'
+down_revision: Union[str, None] = '009_dashboard_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create daily_metrics, the triggers that keep it current and the
+    dashboard_metrics() / reconcile_daily_metrics() functions.
+
+    Each row is the contribution of rows created on `day` (UTC) to a metric:
+    revenue (completed orders), orders_<status>, customers and
+    products_active. Summing a metric over all days gives its current total.
+    """
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS public.daily_metrics (
+            day DATE NOT NULL,
+            metric TEXT NOT NULL,
+            value NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, metric)
+        );
+
+        -- Service role only (RLS on, no policies)
+        ALTER TABLE public.daily_metrics ENABLE ROW LEVEL SECURITY;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.bump_daily_metric(p_day DATE, p_metric TEXT, p_delta NUMERIC)
+        RETURNS VOID AS $$
+            INSERT INTO public.daily_metrics (day, metric, value)
+            VALUES (p_day, p_metric, p_delta)
+            ON CONFLICT (day, metric) DO UPDATE
+            SET value = public.daily_metrics.value + EXCLUDED.value;
+        $$ LANGUAGE sql;
+    """)
+
+    # Orders: per-status counts and completed revenue
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.track_order_metrics()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM public.bump_daily_metric((OLD.created_at AT TIME ZONE 'UTC')::date, 'orders_' || OLD.status, -1);
+                IF OLD.status = 'completed' THEN
+                    PERFORM public.bump_daily_metric((OLD.created_at AT TIME ZONE 'UTC')::date, 'revenue', -OLD.total);
+                END IF;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM public.bump_daily_metric((NEW.created_at AT TIME ZONE 'UTC')::date, 'orders_' || NEW.status, 1);
+                IF NEW.status = 'completed' THEN
+                    PERFORM public.bump_daily_metric((NEW.created_at AT TIME ZONE 'UTC')::date, 'revenue', NEW.total);
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+        DROP TRIGGER IF EXISTS track_order_metrics ON public.orders;
+        CREATE TRIGGER track_order_metrics
+            AFTER INSERT OR DELETE OR UPDATE OF status, total ON public.orders
+            FOR EACH ROW EXECUTE FUNCTION public.track_order_metrics();
+    """)
+
+    # Customers
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.track_customer_metrics()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.role = 'customer' THEN
+                PERFORM public.bump_daily_metric((OLD.created_at AT TIME ZONE 'UTC')::date, 'customers', -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.role = 'customer' THEN
+                PERFORM public.bump_daily_metric((NEW.created_at AT TIME ZONE 'UTC')::date, 'customers', 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+        DROP TRIGGER IF EXISTS track_customer_metrics ON public.user_profiles;
+        CREATE TRIGGER track_customer_metrics
+            AFTER INSERT OR DELETE OR UPDATE OF role ON public.user_profiles
+            FOR EACH ROW EXECUTE FUNCTION public.track_customer_metrics();
+    """)
+
+    # Active products
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.track_product_metrics()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+                PERFORM public.bump_daily_metric((OLD.created_at AT TIME ZONE 'UTC')::date, 'products_active', -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+                PERFORM public.bump_daily_metric((NEW.created_at AT TIME ZONE 'UTC')::date, 'products_active', 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+        DROP TRIGGER IF EXISTS track_product_metrics ON public.products;
+        CREATE TRIGGER track_product_metrics
+            AFTER INSERT OR DELETE OR UPDATE OF is_active ON public.products
+            FOR EACH ROW EXECUTE FUNCTION public.track_product_metrics();
+    """)
+
+    # Rebuild from the source tables; returns the number of rows corrected
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.reconcile_daily_metrics()
+        RETURNS INTEGER AS $$
+        DECLARE
+            corrected INTEGER;
+            removed INTEGER;
+        BEGIN
+            -- Block trigger bumps while the snapshot is rebuilt
+            LOCK TABLE public.daily_metrics IN EXCLUSIVE MODE;
+
+            CREATE TEMP TABLE fresh_metrics ON COMMIT DROP AS
+                SELECT (created_at AT TIME ZONE 'UTC')::date AS day, 'revenue' AS metric, SUM(total) AS value
+                FROM public.orders WHERE status = 'completed' GROUP BY 1
+                UNION ALL
+                SELECT (created_at AT TIME ZONE 'UTC')::date, 'orders_' || status, COUNT(*)
+                FROM public.orders GROUP BY 1, status
+                UNION ALL
+                SELECT (created_at AT TIME ZONE 'UTC')::date, 'customers', COUNT(*)
+                FROM public.user_profiles WHERE role = 'customer' GROUP BY 1
+                UNION ALL
+                SELECT (created_at AT TIME ZONE 'UTC')::date, 'products_active', COUNT(*)
+                FROM public.products WHERE is_active GROUP BY 1;
+
+            INSERT INTO public.daily_metrics (day, metric, value)
+            SELECT day, metric, value FROM fresh_metrics
+            ON CONFLICT (day, metric) DO UPDATE
+            SET value = EXCLUDED.value
+            WHERE public.daily_metrics.value IS DISTINCT FROM EXCLUDED.value;
+            GET DIAGNOSTICS corrected = ROW_COUNT;
+
+            DELETE FROM public.daily_metrics m
+            WHERE NOT EXISTS (
+                SELECT 1 FROM fresh_metrics f WHERE f.day = m.day AND f.metric = m.metric
+            );
+            GET DIAGNOSTICS removed = ROW_COUNT;
+
+            RETURN corrected + removed;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Totals plus the current and previous period, one object per bucket
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.dashboard_metrics(p_period_days INTEGER DEFAULT 30)
+        RETURNS JSONB AS $$
+            WITH today AS (
+                SELECT (NOW() AT TIME ZONE 'UTC')::date AS day
+            ),
+            bucketed AS (
+                SELECT
+                    m.metric,
+                    SUM(m.value) AS total,
+                    SUM(m.value) FILTER (WHERE m.day > t.day - p_period_days) AS current,
+                    SUM(m.value) FILTER (
+                        WHERE m.day > t.day - 2 * p_period_days AND m.day <= t.day - p_period_days
+                    ) AS previous
+                FROM public.daily_metrics m, today t
+                GROUP BY m.metric
+            )
+            SELECT jsonb_build_object(
+                'totals', COALESCE(jsonb_object_agg(metric, total), '{}'::jsonb),
+                'current', COALESCE(jsonb_object_agg(metric, COALESCE(current, 0)), '{}'::jsonb),
+                'previous', COALESCE(jsonb_object_agg(metric, COALESCE(previous, 0)), '{}'::jsonb)
+            )
+            FROM bucketed;
+        $$ LANGUAGE sql STABLE;
+    """)
+
+    op.execute("""
+        REVOKE ALL ON FUNCTION public.bump_daily_metric(DATE, TEXT, NUMERIC) FROM PUBLIC, anon, authenticated;
+        REVOKE ALL ON FUNCTION public.reconcile_daily_metrics() FROM PUBLIC, anon, authenticated;
+        REVOKE ALL ON FUNCTION public.dashboard_metrics(INTEGER) FROM PUBLIC, anon, authenticated;
+    """)
+
+    # Backfill from existing data
+    op.execute("SELECT public.reconcile_daily_metrics();")
+
+    # Superseded by dashboard_metrics()
+    op.execute("DROP FUNCTION IF EXISTS public.dashboard_stats();")
+
+
+def downgrade() -> None:
+    """Drop the metrics store and restore dashboard_stats()."""
+    op.execute("DROP TRIGGER IF EXISTS track_order_metrics ON public.orders;")
+    op.execute("DROP TRIGGER IF EXISTS track_customer_metrics ON public.user_profiles;")
+    op.execute("DROP TRIGGER IF EXISTS track_product_metrics ON public.products;")
+    op.execute("DROP FUNCTION IF EXISTS public.track_order_metrics();")
+    op.execute("DROP FUNCTION IF EXISTS public.track_customer_metrics();")
+    op.execute("DROP FUNCTION IF EXISTS public.track_product_metrics();")
+    op.execute("DROP FUNCTION IF EXISTS public.dashboard_metrics(INTEGER);")
+    op.execute("DROP FUNCTION IF EXISTS public.reconcile_daily_metrics();")
+    op.execute("DROP FUNCTION IF EXISTS public.bump_daily_metric(DATE, TEXT, NUMERIC);")
+    op.execute("DROP TABLE IF EXISTS public.daily_metrics;")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.dashboard_stats()
+        RETURNS JSONB AS $$
+            SELECT jsonb_build_object(
+                'total_revenue', (
+                    SELECT COALESCE(SUM(total), 0)
+                    FROM public.orders
+                    WHERE status = 'completed'
+                ),
+                'active_orders', (
+                    SELECT COUNT(*) FROM public.orders WHERE status = 'pending'
+                ),
+                'total_customers', (
+                    SELECT COUNT(*) FROM public.user_profiles WHERE role = 'customer'
+                ),
+                'total_products', (
+                    SELECT COUNT(*) FROM public.products WHERE is_active = TRUE
+                )
+            );
+        $$ LANGUAGE sql STABLE;
+
+        REVOKE ALL ON FUNCTION public.dashboard_stats() FROM PUBLIC, anon, authenticated;
+    """)
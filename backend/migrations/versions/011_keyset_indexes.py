@@ -0,0 +1,60 @@
+"""Index listings on (created_at, id) for keyset pagination
+
+Revision ID: 011_keyset_indexes
+Revises: 010_daily_metrics
+Create Date: 2025-01-09
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011_keyset_indexes'
+down_revision: Union[str, None] = '010_daily_metrics'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Replace the created_at indexes with (created_at, id) ones.
+
+    Listings order by created_at DESC, id DESC and resume after a cursor, so
+    each page is a single index range scan. The composite indexes also cover
+    everything the created_at-only ones did.
+    """
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_orders_created_at_id
+            ON public.orders(created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_orders_status_created_at_id
+            ON public.orders(status, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_orders_user_id_created_at_id
+            ON public.orders(user_id, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_user_profiles_created_at_id
+            ON public.user_profiles(created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_products_created_at_id
+            ON public.products(created_at DESC, id DESC);
+    """)
+
+    op.execute("""
+        DROP INDEX IF EXISTS public.idx_orders_created_at;
+        DROP INDEX IF EXISTS public.idx_user_profiles_created_at;
+        DROP INDEX IF EXISTS public.idx_products_created_at;
+    """)
+
+
+def downgrade() -> None:
+    """Restore the created_at indexes."""
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_orders_created_at ON public.orders(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_user_profiles_created_at ON public.user_profiles(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_products_created_at ON public.products(created_at DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS public.idx_products_created_at_id;")
+    op.execute("DROP INDEX IF EXISTS public.idx_user_profiles_created_at_id;")
+    op.execute("DROP INDEX IF EXISTS public.idx_orders_user_id_created_at_id;")
+    op.execute("DROP INDEX IF EXISTS public.idx_orders_status_created_at_id;")
+    op.execute("DROP INDEX IF EXISTS public.idx_orders_created_at_id;")
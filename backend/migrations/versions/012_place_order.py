@@ -0,0 +1,128 @@
+"""Add place_order() to create an order, its items and stock decrements atomically
+
+Revision ID: 012_place_order
+Revises: 011_keyset_indexes
+Create Date: 2025-01-10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012_place_order'
+down_revision: Union[str, None] = '011_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create place_order().
+
+    Takes an order priced by the API (p_items is a JSON array of
+    {product_id, name, type, price, quantity, image}) and, in one
+    transaction, locks the products in id order, checks every line has
+    enough stock (NULL counts as none), decrements it, and inserts the order and its items.
+    Concurrent checkouts of the same product queue on the row lock, so stock
+    never goes negative; if any line is short nothing is written and the
+    function raises 'insufficient_stock' with the product IDs as DETAIL.
+
+    Returns the order with its items, plus the updated product rows so the
+    caller can refresh its catalog.
+    """
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.place_order(
+            p_user_id UUID,
+            p_items JSONB,
+            p_subtotal NUMERIC,
+            p_shipping NUMERIC,
+            p_tax NUMERIC,
+            p_total NUMERIC,
+            p_shipping_address JSONB DEFAULT NULL
+        )
+        RETURNS JSONB AS $$
+        DECLARE
+            v_order public.orders;
+            v_product_ids UUID[];
+            v_quantities INTEGER[];
+            v_short TEXT;
+            v_items JSONB;
+            v_products JSONB;
+        BEGIN
+            -- One (product, quantity) per product, sorted by id
+            SELECT array_agg(product_id ORDER BY product_id), array_agg(quantity ORDER BY product_id)
+            INTO v_product_ids, v_quantities
+            FROM (
+                SELECT (item->>'product_id')::uuid AS product_id, SUM((item->>'quantity')::integer)::integer AS quantity
+                FROM jsonb_array_elements(p_items) AS item
+                GROUP BY 1
+            ) AS lines;
+
+            -- Lock in a fixed order so checkouts sharing products can't deadlock
+            PERFORM 1
+            FROM public.products
+            WHERE id = ANY(v_product_ids)
+            ORDER BY id
+            FOR UPDATE;
+
+            SELECT string_agg(l.product_id::text, ', ' ORDER BY l.product_id)
+            INTO v_short
+            FROM unnest(v_product_ids, v_quantities) AS l(product_id, quantity)
+            LEFT JOIN public.products p ON p.id = l.product_id
+            WHERE p.id IS NULL OR NOT p.is_active OR COALESCE(p.stock, 0) < l.quantity;
+
+            IF v_short IS NOT NULL THEN
+                RAISE EXCEPTION USING
+                    ERRCODE = 'P0001',
+                    MESSAGE = 'insufficient_stock',
+                    DETAIL = v_short;
+            END IF;
+
+            WITH updated AS (
+                UPDATE public.products p
+                SET stock = COALESCE(p.stock, 0) - l.quantity,
+                    in_stock = COALESCE(p.stock, 0) - l.quantity > 0
+                FROM unnest(v_product_ids, v_quantities) AS l(product_id, quantity)
+                WHERE p.id = l.product_id
+                RETURNING p.*
+            )
+            SELECT jsonb_agg(to_jsonb(updated)) INTO v_products FROM updated;
+
+            INSERT INTO public.orders (user_id, status, subtotal, shipping, tax, total, shipping_address)
+            VALUES (p_user_id, 'pending', p_subtotal, p_shipping, p_tax, p_total, p_shipping_address)
+            RETURNING * INTO v_order;
+
+            WITH inserted AS (
+                INSERT INTO public.order_items (order_id, product_id, name, type, price, quantity, image)
+                SELECT
+                    v_order.id,
+                    item->>'product_id',
+                    item->>'name',
+                    item->>'type',
+                    (item->>'price')::numeric,
+                    (item->>'quantity')::integer,
+                    item->>'image'
+                FROM jsonb_array_elements(p_items) WITH ORDINALITY AS lines(item, position)
+                ORDER BY position
+                RETURNING *
+            )
+            SELECT COALESCE(jsonb_agg(to_jsonb(inserted)), '[]'::jsonb) INTO v_items FROM inserted;
+
+            RETURN to_jsonb(v_order) || jsonb_build_object(
+                'items', v_items,
+                'products', COALESCE(v_products, '[]'::jsonb)
+            );
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+        REVOKE ALL ON FUNCTION public.place_order(UUID, JSONB, NUMERIC, NUMERIC, NUMERIC, NUMERIC, JSONB)
+            FROM PUBLIC, anon, authenticated;
+    """)
+
+
+def downgrade() -> None:
+    """Drop place_order()."""
+    op.execute("DROP FUNCTION IF EXISTS public.place_order(UUID, JSONB, NUMERIC, NUMERIC, NUMERIC, NUMERIC, JSONB);")
@@ -7,14 +7,17 @@ PORT=${PORT:-10000}
 echo "🚀 Starting ZenGlow API on port $PORT..."
 
 # Start gunicorn with uvicorn workers
-# --workers 1: Free tier has limited resources
+# --workers: WEB_CONCURRENCY, default 1 (free tier has limited resources);
+#   more than one needs a shared RATE_LIMIT_STORAGE_URI (rate limits, login
+#   lockouts and idempotency keys) and an EVENT_BUS_URL (so product updates
+#   reach every worker's sockets and catalog)
 # --worker-class: Use uvicorn worker for async support
 # --bind: Bind to all interfaces on Render's PORT
 # --timeout: Increase timeout for slow connections
 # --access-logfile: Log access to stdout
 # --error-logfile: Log errors to stderr
 exec gunicorn app.main:app \
-  --workers 1 \
+  --workers ${WEB_CONCURRENCY:-1} \
   --worker-class uvicorn.workers.UvicornWorker \
   --bind 0.0.0.0:$PORT \
   --timeout 120 \
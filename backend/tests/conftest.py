@@ -4,6 +4,7 @@ Test configuration and fixtures.
 import os
 import pytest
 from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock
 
 # Set test environment variables before importing app
 os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
@@ -19,6 +20,21 @@ os.environ.setdefault("DEBUG", "true")
 from app.main import app
 
 
+def query_returning(data, count=None):
+    """
+    Build a chainable PostgREST query mock whose execute() returns data.
+
+    Filter, ordering and paging calls return the query itself, so a test can
+    assert on them (e.g. `query.in_.call_args`) after the code under test
+    has built its chain.
+    """
+    query = MagicMock()
+    for method in ("select", "eq", "neq", "in_", "or_", "ilike", "order", "limit", "range"):
+        getattr(query, method).return_value = query
+    query.execute = AsyncMock(return_value=MagicMock(data=data, count=count))
+    return query
+
+
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
@@ -0,0 +1,98 @@
+"""
+Tests for admin repositories and services.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.admin.repository import AdminRepository
+from app.services.admin.service import DashboardService
+from tests.conftest import query_returning
+
+
+class TestUserDirectory:
+    """Test batched order counts for the admin users screen."""
+
+    @pytest.mark.asyncio
+    async def test_orders_counts_from_one_grouped_query(self):
+        """A page of users gets its order counts from one view query."""
+        counts = query_returning([
+            {"user_id": "u1", "orders_count": 3},
+            {"user_id": "u3", "orders_count": 1},
+        ])
+        client = MagicMock()
+        client.table.return_value = counts
+
+        users = [{"id": "u1"}, {"id": "u2"}, {"id": "u3"}]
+        await AdminRepository.attach_orders_counts(client, users)
+
+        client.table.assert_called_once_with("user_order_counts")
+        assert counts.execute.await_count == 1
+        assert [u["orders_count"] for u in users] == [3, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_no_users_skips_query(self):
+        """An empty page makes no count query."""
+        client = MagicMock()
+        assert await AdminRepository.attach_orders_counts(client, []) == []
+        client.table.assert_not_called()
+
+
+class TestDashboard:
+    """Test the admin dashboard aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_fetches_pieces_concurrently(self):
+        """Stats, recent orders and settings are requested in parallel."""
+        in_flight = 0
+        peak = 0
+
+        def slow(value):
+            async def call(*args, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                return value
+            return call
+
+        metrics = {
+            "totals": {"revenue": 1234.5, "orders_pending": 3, "customers": 1200, "products_active": 42},
+            "current": {"revenue": 300, "orders_pending": 2, "customers": 40, "products_active": -1},
+            "previous": {"revenue": 200, "orders_pending": 1, "customers": 25, "products_active": 0},
+        }
+        recent = [{
+            "id": "abcdef12-0000", "customer_name": "Ada", "created_at": "2024-03-01T10:00:00Z",
+            "total": 50.0, "status": "pending", "items_count": 2,
+        }]
+        settings = MagicMock(currency_symbol="$")
+
+        with patch("app.services.admin.repository.DashboardRepository.get_metrics", side_effect=slow(metrics)), \
+             patch("app.services.admin.repository.DashboardRepository.get_recent_orders", side_effect=slow(recent)), \
+             patch("app.services.admin.service.StoreSettingsService.get_settings", side_effect=slow(settings)):
+            dashboard = await DashboardService.get_dashboard()
+
+        assert peak == 3
+        assert [s.value for s in dashboard.stats] == ["$1,234.50", "3", "1,200", "42"]
+        assert [s.change for s in dashboard.stats] == ["+50.0%", "+2", "+40", "-1"]
+        assert [s.change_positive for s in dashboard.stats] == [True, True, True, False]
+        # Status-based counts are credited to the row's creation day, and say so
+        assert dashboard.stats[1].change_label == "Still pending among orders placed in the last 30 days"
+        order = dashboard.recent_orders[0]
+        assert (order.id, order.customer, order.date, order.items) == ("#ORD-ABCDEF12", "Ada", "Mar 01, 2024", 2)
+
+    @pytest.mark.asyncio
+    async def test_revenue_change_without_baseline(self):
+        """No revenue in the previous period reports a flat change."""
+        metrics = {"totals": {}, "current": {"revenue": 100}, "previous": {}}
+
+        with patch("app.services.admin.repository.DashboardRepository.get_metrics", AsyncMock(return_value=metrics)), \
+             patch("app.services.admin.repository.DashboardRepository.get_recent_orders", AsyncMock(return_value=[])), \
+             patch("app.services.admin.service.StoreSettingsService.get_settings",
+                   AsyncMock(return_value=MagicMock(currency_symbol="$"))):
+            dashboard = await DashboardService.get_dashboard()
+
+        assert dashboard.stats[0].change == "+0.0%"
+        assert [s.value for s in dashboard.stats[1:]] == ["0", "0", "0"]
@@ -4,6 +4,13 @@ Tests for authentication endpoints.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from jose import jwt
+
+
+# Well-formed HS256 token; tests don't configure the JWT secret, so it is
+# checked with the (mocked) auth server.
+TEST_TOKEN = jwt.encode({"sub": "test-user-id", "aud": "authenticated"}, "unknown-secret")
+
 
 class TestHealthEndpoint:
     """Test health check endpoint."""
@@ -159,7 +166,7 @@ class TestMeEndpoint:
         assert response.status_code == 401  # Missing auth header
 
     @pytest.mark.asyncio
-    @patch("app.shared.security.get_supabase_client")
+    @patch("app.shared.security.get_supabase_async_client", new_callable=AsyncMock)
     @patch("app.services.auth.service.UserRepository.get_profile_by_id")
     async def test_me_with_valid_token(self, mock_get_profile, mock_supabase, client):
         """Test /me endpoint with valid token."""
@@ -173,14 +180,14 @@ class TestMeEndpoint:
         mock_response.user = mock_user
 
         mock_client = MagicMock()
-        mock_client.auth.get_user.return_value = mock_response
+        mock_client.auth.get_user = AsyncMock(return_value=mock_response)
         mock_supabase.return_value = mock_client
 
         mock_get_profile.return_value = {"role": "customer"}
 
         response = await client.get(
             "/auth/me",
-            headers={"Authorization": "Bearer test-valid-token"}
+            headers={"Authorization": f"Bearer {TEST_TOKEN}"}
         )
         
         assert response.status_code == 200
@@ -198,7 +205,7 @@ class TestLogoutEndpoint:
         assert response.status_code == 401
 
     @pytest.mark.asyncio
-    @patch("app.shared.security.get_supabase_client")
+    @patch("app.shared.security.get_supabase_async_client", new_callable=AsyncMock)
     @patch("app.services.auth.service.get_supabase_client")
     async def test_logout_success(self, mock_service_client, mock_security_client, client):
         """Test successful logout."""
@@ -212,14 +219,14 @@ class TestLogoutEndpoint:
         mock_response.user = mock_user
 
         mock_client = MagicMock()
-        mock_client.auth.get_user.return_value = mock_response
+        mock_client.auth.get_user = AsyncMock(return_value=mock_response)
         mock_client.auth.sign_out.return_value = None
         mock_security_client.return_value = mock_client
         mock_service_client.return_value = mock_client
 
         response = await client.post(
             "/auth/logout",
-            headers={"Authorization": "Bearer test-valid-token"}
+            headers={"Authorization": f"Bearer {TEST_TOKEN}"}
         )
         
         assert response.status_code == 200
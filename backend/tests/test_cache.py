@@ -0,0 +1,171 @@
+"""
+Tests for in-process caches.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.admin.repository import AdminRepository
+from app.services.admin.service import StoreSettingsService
+from app.services.admin.store_settings import StoreSettingsUpdate
+from app.shared import maintenance, security, store_config
+from app.shared.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test the bounded TTL cache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expired_entries_are_misses(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1, ttl=0)
+        assert cache.get("a", "default") == "default"
+        assert "a" not in cache
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+
+class TestStoreSettingsCache:
+    """Test the cached store settings row."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        store_config.store_settings_cache.clear()
+        yield
+        store_config.store_settings_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self):
+        """A burst of cold reads pays for the settings query once."""
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return {"id": "s1", "currency_symbol": "€", "maintenance_mode": False}
+
+        with patch("app.shared.store_config._fetch_store_settings", side_effect=fetch) as mock_fetch:
+            rows = await asyncio.gather(*(store_config.get_store_settings() for _ in range(20)))
+            settings = await StoreSettingsService.get_settings()
+            assert await maintenance.is_maintenance_mode() is False
+
+        assert all(row["id"] == "s1" for row in rows)
+        assert settings.currency_symbol == "€"
+        assert mock_fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_flag_skips_database(self):
+        """A cached row is served without leasing a client."""
+        store_config.set_store_settings({"id": "s1", "maintenance_mode": True})
+        with patch.object(store_config, "admin_client") as mock_client:
+            assert await maintenance.is_maintenance_mode() is True
+            mock_client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_load_allows_access(self):
+        """Maintenance checks fail open and retry on the next request."""
+        with patch("app.shared.store_config._fetch_store_settings",
+                   side_effect=[RuntimeError("down"), {"id": "s1", "maintenance_mode": True}]):
+            assert await maintenance.is_maintenance_mode() is False
+            assert await maintenance.is_maintenance_mode() is True
+
+    @pytest.mark.asyncio
+    async def test_update_replaces_cached_row(self):
+        """Settings updates take effect immediately in this process."""
+        store_config.set_store_settings({"id": "s1", "currency": "USD", "maintenance_mode": False})
+        updated = {"id": "s1", "currency": "EUR", "maintenance_mode": True}
+
+        with patch("app.services.admin.service.StoreSettingsRepository.update_settings",
+                   AsyncMock(return_value=updated)), \
+             patch("app.shared.store_config._fetch_store_settings") as mock_fetch:
+            settings = await StoreSettingsService.update_settings(
+                StoreSettingsUpdate(currency="EUR", maintenance_mode=True)
+            )
+            assert await maintenance.is_maintenance_mode() is True
+
+        assert settings.currency == "EUR"
+        mock_fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_update_invalidates(self):
+        """A write that errors out forces the next read back to the database."""
+        store_config.set_store_settings({"id": "s1", "maintenance_mode": False})
+
+        with patch("app.services.admin.service.StoreSettingsRepository.update_settings",
+                   AsyncMock(side_effect=RuntimeError("timeout"))):
+            with pytest.raises(RuntimeError):
+                await StoreSettingsService.update_settings(StoreSettingsUpdate(maintenance_mode=True))
+
+        assert "store_settings" not in store_config.store_settings_cache
+
+
+class TestRoleCache:
+    """Test the cached role lookup behind require_admin."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_roles(self):
+        security.role_cache.clear()
+        yield
+        security.role_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_parallel_lookups_share_one_query(self):
+        """Concurrent admin requests pay for the role lookup once."""
+        async def fetch(user_id):
+            await asyncio.sleep(0.01)
+            return "admin"
+
+        with patch("app.shared.security._fetch_user_role", side_effect=fetch) as mock_fetch:
+            roles = await asyncio.gather(*(security.get_user_role("u1") for _ in range(10)))
+            assert await security.get_user_role("u1") == "admin"
+
+        assert roles == ["admin"] * 10
+        assert mock_fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_not_cached(self):
+        """Errors propagate and the next request retries."""
+        with patch("app.shared.security._fetch_user_role", side_effect=[RuntimeError("down"), "customer"]):
+            with pytest.raises(RuntimeError):
+                await security.get_user_role("u1")
+            assert await security.get_user_role("u1") == "customer"
+
+    @pytest.mark.asyncio
+    async def test_role_change_invalidates_cache(self):
+        """Changing a user's role drops their cached role."""
+        security.role_cache.set("u1", "admin")
+        query = MagicMock()
+        query.update.return_value = query
+        query.eq.return_value = query
+        query.execute = AsyncMock(return_value=MagicMock(data=[{"id": "u1", "role": "customer"}]))
+        client = MagicMock()
+        client.table.return_value = query
+
+        @asynccontextmanager
+        async def lease():
+            yield client
+
+        with patch("app.services.admin.repository.admin_client", lease):
+            await AdminRepository.update_user_role("u1", "customer")
+
+        assert "u1" not in security.role_cache
@@ -0,0 +1,84 @@
+"""
+Tests for the service-role client pool.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.database import SupabaseClientPool
+
+
+def _pool(**kwargs) -> SupabaseClientPool:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    return SupabaseClientPool(
+        "https://test.supabase.co",
+        "test-service-role-key",
+        transport=transport,
+        **kwargs,
+    )
+
+
+class TestSupabaseClientPool:
+    """Test client leasing and pool metrics."""
+
+    @pytest.mark.asyncio
+    async def test_lease_tracks_in_use_and_idle(self):
+        """Leasing a client moves a slot from idle to in-use."""
+        pool = _pool(size=2, max_connections=2)
+
+        async with pool.acquire():
+            stats = pool.stats()
+            assert stats["in_use"] == 1
+            assert stats["idle"] == 3
+            assert stats["idle_clients"] == 1
+
+        stats = pool.stats()
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 4
+        assert stats["acquired"] == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_leases_spread_across_clients(self):
+        """Concurrent leases go to the least busy client."""
+        pool = _pool(size=2, max_connections=2)
+
+        async with pool.acquire() as first, pool.acquire() as second:
+            assert first is not second
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_waits_when_capacity_exhausted(self):
+        """Callers wait for a free slot once every slot is leased."""
+        pool = _pool(size=1, max_connections=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with pool.acquire():
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(pool.acquire().__aenter__())
+        await asyncio.sleep(0.01)
+        assert pool.stats()["waiting"] == 1
+        assert not waiter.done()
+
+        release.set()
+        await task
+        await waiter
+        assert pool.stats()["wait_time_max_ms"] > 0
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_resets_pool(self):
+        """Closing the pool drops its clients."""
+        pool = _pool()
+        pool.open()
+        assert pool.is_open
+
+        await pool.close()
+        assert not pool.is_open
+        assert pool.stats()["idle"] == 0
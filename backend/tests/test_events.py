@@ -0,0 +1,257 @@
+"""
+Tests for the cross-worker event bus.
+"""
+import asyncio
+import json
+import os
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.products.catalog import ProductCatalog, sync_catalog
+from app.shared.events import CHANNEL, MAX_PAYLOAD_BYTES, LocalEventBus, PostgresEventBus
+from app.shared.websocket import ConnectionManager
+
+
+class FakeSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        pass
+
+
+class Recorder:
+    def __init__(self):
+        self.events: list[tuple[dict, str]] = []
+
+    async def __call__(self, message: dict, topic: str):
+        self.events.append((message, topic))
+
+
+async def _until(condition, timeout: float = 5.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+class TestLocalEventBus:
+    """Test in-process delivery."""
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_subscribers(self):
+        bus = LocalEventBus()
+        recorder = Recorder()
+        bus.subscribe(recorder)
+
+        await bus.publish({"type": "product_deleted", "product_id": "p1"})
+
+        assert recorder.events == [({"type": "product_deleted", "product_id": "p1"}, "products")]
+
+    @pytest.mark.asyncio
+    async def test_failing_handler_does_not_block_others(self):
+        bus = LocalEventBus()
+
+        async def broken(message, topic):
+            raise RuntimeError("boom")
+
+        recorder = Recorder()
+        bus.subscribe(broken)
+        bus.subscribe(recorder)
+
+        await bus.publish({"type": "product_created"})
+
+        assert len(recorder.events) == 1
+        assert bus.stats()["handler_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_nowait_holds_task_until_delivered(self):
+        bus = LocalEventBus()
+        recorder = Recorder()
+        bus.subscribe(recorder)
+
+        bus.publish_nowait({"type": "product_created"})
+        assert len(bus._tasks) == 1
+
+        await bus.close()
+        assert not bus._tasks
+        assert recorder.events == [({"type": "product_created"}, "products")]
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_carry_sequence_numbers(self):
+        bus = LocalEventBus()
+        manager = ConnectionManager()
+        bus.subscribe(manager.broadcast)
+
+        await manager.connect(FakeSocket())
+
+        for i in range(3):
+            await bus.publish({"type": "product_updated", "n": i})
+        # Catalog-only events have no sockets to reach
+        await bus.publish({"type": "stock_updated", "product_ids": ["p1"]}, "catalog")
+
+        assert manager.stats()["sequence"] == {"products": 3}
+        await manager.close()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.notified: list[tuple[str, str]] = []
+
+    async def execute(self, query: str, channel: str, payload: str):
+        self.notified.append((channel, payload))
+
+
+class ExclusiveConnection(FakeConnection):
+    """Rejects overlapping operations, like asyncpg."""
+
+    def __init__(self):
+        super().__init__()
+        self.busy = False
+
+    async def execute(self, query: str, channel: str, payload: str):
+        if self.busy:
+            raise RuntimeError("cannot perform operation: another operation is in progress")
+        self.busy = True
+        try:
+            await asyncio.sleep(0.001)
+            await super().execute(query, channel, payload)
+        finally:
+            self.busy = False
+
+
+class TestPostgresEventBus:
+    """Test the LISTEN/NOTIFY bus without a server."""
+
+    @pytest.mark.asyncio
+    async def test_ignores_own_notifications(self):
+        bus = PostgresEventBus("postgresql://unused")
+        recorder = Recorder()
+        bus.subscribe(recorder)
+        bus._connection = FakeConnection()
+
+        await bus.publish({"type": "product_deleted", "product_id": "p1"})
+        channel, payload = bus._connection.notified[0]
+        bus._on_notify(None, 1, channel, payload)
+        other = json.dumps({"origin": "other", "topic": "products", "message": {"type": "product_created"}})
+        bus._on_notify(None, 1, CHANNEL, other)
+        await asyncio.sleep(0)
+
+        # Local delivery on publish, plus the other worker's event; no echo
+        assert [message["type"] for message, _ in recorder.events] == ["product_deleted", "product_created"]
+
+    @pytest.mark.asyncio
+    async def test_remote_only_subscribers_skip_own_events(self):
+        bus = PostgresEventBus("postgresql://unused")
+        local, remote_only = Recorder(), Recorder()
+        bus.subscribe(local)
+        bus.subscribe(remote_only, local=False)
+        bus._connection = FakeConnection()
+
+        await bus.publish({"type": "stock_updated", "product_ids": ["p1"]}, "catalog")
+        other = json.dumps({"origin": "other", "topic": "catalog",
+                            "message": {"type": "stock_updated", "product_ids": ["p2"]}})
+        bus._on_notify(None, 1, CHANNEL, other)
+        await asyncio.sleep(0)
+
+        assert len(local.events) == 2
+        assert remote_only.events == [({"type": "stock_updated", "product_ids": ["p2"]}, "catalog")]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_publishes_all_notify(self):
+        """Writes landing together share the connection one NOTIFY at a time."""
+        bus = PostgresEventBus("postgresql://unused")
+        bus._connection = ExclusiveConnection()
+
+        await asyncio.gather(*(bus.publish({"type": "product_updated", "n": i}) for i in range(10)))
+
+        assert len(bus._connection.notified) == 10
+        assert bus.stats()["publish_errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_large_messages_are_slimmed(self):
+        bus = PostgresEventBus("postgresql://unused")
+        bus._connection = FakeConnection()
+
+        await bus.publish({"type": "product_updated", "product": {"id": "p1", "description": "x" * 10_000}})
+
+        payload = bus._connection.notified[0][1]
+        assert len(payload.encode()) <= MAX_PAYLOAD_BYTES
+        assert json.loads(payload)["message"] == {"type": "product_updated", "product_id": "p1"}
+
+    @pytest.mark.asyncio
+    async def test_publish_without_connection_still_delivers_locally(self):
+        bus = PostgresEventBus("postgresql://unused")
+        recorder = Recorder()
+        bus.subscribe(recorder)
+
+        await bus.publish({"type": "product_created"})
+
+        assert len(recorder.events) == 1
+        assert bus.stats()["publish_errors"] == 1
+
+
+class TestSyncCatalog:
+    """Test applying other workers' changes to the local catalog."""
+
+    @pytest.fixture
+    def catalog(self):
+        catalog = ProductCatalog(ttl=60)
+        catalog.upsert({"id": "p1", "name": "Serum", "stock": 3, "updated_at": "2024-01-01"})
+        with patch("app.services.products.catalog.get_product_catalog", return_value=catalog):
+            yield catalog
+
+    @pytest.mark.asyncio
+    async def test_reloads_changed_products(self, catalog):
+        fingerprint = catalog.fingerprint
+        row = {"id": "p1", "name": "Serum", "stock": 0, "in_stock": False, "updated_at": "2024-01-02"}
+        with patch("app.services.products.catalog.ProductRepository.get_by_ids", AsyncMock(return_value=[row])) as get:
+            await sync_catalog({"type": "stock_updated", "product_ids": ["p1"]}, "catalog")
+
+        get.assert_awaited_once_with(["p1"])
+        assert catalog.get("p1")["stock"] == 0
+        # HTTP validators change with it
+        assert catalog.fingerprint != fingerprint
+
+    @pytest.mark.asyncio
+    async def test_removes_deleted_products(self, catalog):
+        await sync_catalog({"type": "product_deleted", "product_id": "p1"}, "products")
+        assert len(catalog) == 0
+
+        # A product that's gone by the time it's re-read is dropped too
+        catalog.upsert({"id": "p2", "name": "Toner", "updated_at": "2024-01-01"})
+        with patch("app.services.products.catalog.ProductRepository.get_by_ids", AsyncMock(return_value=[])):
+            await sync_catalog({"type": "product_updated", "product": {"id": "p2"}}, "products")
+        assert len(catalog) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_invalidates_snapshot(self, catalog):
+        catalog._loaded_at = 0.0
+        with patch("app.services.products.catalog.ProductRepository.get_by_ids",
+                   AsyncMock(side_effect=ConnectionError("down"))):
+            with pytest.raises(ConnectionError):
+                await sync_catalog({"type": "product_updated", "product_id": "p1"}, "products")
+        assert catalog._loaded_at is None
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+class TestPostgresRelay:
+    """Relay between two buses standing in for workers (set TEST_DATABASE_URL)."""
+
+    @pytest.mark.asyncio
+    async def test_other_worker_receives_event(self):
+        url = os.environ["TEST_DATABASE_URL"]
+        publisher, listener = PostgresEventBus(url), PostgresEventBus(url)
+        recorder = Recorder()
+        listener.subscribe(recorder)
+        await publisher.start()
+        await listener.start()
+        try:
+            await _until(lambda: publisher.stats()["connected"] and listener.stats()["connected"])
+            await publisher.publish({"type": "product_deleted", "product_id": "p1"})
+            await _until(lambda: recorder.events)
+        finally:
+            await publisher.close()
+            await listener.close()
+
+        assert recorder.events == [({"type": "product_deleted", "product_id": "p1"}, "products")]
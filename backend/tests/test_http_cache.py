@@ -0,0 +1,131 @@
+"""
+Tests for conditional GETs and Cache-Control on public endpoints.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.services.products.catalog import ProductCatalog
+from app.shared.http_cache import conditional_get, http_cache_stats, make_etag
+
+
+def _request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+PRODUCTS = [
+    {"id": "p1", "name": "Hydrating Serum", "price": 10, "is_active": True,
+     "created_at": "2024-01-01", "updated_at": "2024-02-01T10:00:00+00:00"},
+    {"id": "p2", "name": "Gentle Cleanser", "price": 12, "is_active": True,
+     "created_at": "2024-01-02", "updated_at": "2024-02-02T10:00:00+00:00"},
+]
+
+
+@pytest.fixture
+def catalog():
+    catalog = ProductCatalog(ttl=60)
+    with patch("app.services.products.catalog.ProductRepository.get_all_rows",
+               AsyncMock(return_value=[dict(p) for p in PRODUCTS])), \
+         patch("app.services.products.routes.get_product_catalog", return_value=catalog), \
+         patch("app.services.products.service.get_product_catalog", return_value=catalog):
+        yield catalog
+
+
+class TestConditionalGet:
+    """Test validator matching."""
+
+    def test_sets_validators_and_cache_control(self):
+        response = Response()
+        etag = make_etag("a", 1)
+        assert conditional_get(_request(), response, etag, "2024-02-01T10:00:00.5+00:00") is None
+        assert response.headers["etag"] == etag
+        assert response.headers["last-modified"] == "Thu, 01 Feb 2024 10:00:00 GMT"
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert "s-maxage=" in response.headers["cache-control"]
+
+    def test_if_none_match(self):
+        etag = make_etag("a", 1)
+        not_modified = conditional_get(_request(if_none_match=f'"x", {etag}'), Response(), etag)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.body == b""
+        # Weak comparison ignores the W/ prefix
+        assert conditional_get(_request(if_none_match=etag.removeprefix("W/")), Response(), etag) is not None
+        assert conditional_get(_request(if_none_match=make_etag("a", 2)), Response(), etag) is None
+
+    def test_if_modified_since(self):
+        etag = make_etag("a")
+        modified = "2024-02-01T10:00:00+00:00"
+        since = "Thu, 01 Feb 2024 10:00:00 GMT"
+        assert conditional_get(_request(if_modified_since=since), Response(), etag, modified) is not None
+        assert conditional_get(_request(if_modified_since="Wed, 31 Jan 2024 10:00:00 GMT"), Response(), etag, modified) is None
+        # If-None-Match wins over If-Modified-Since
+        assert conditional_get(_request(if_none_match='"x"', if_modified_since=since), Response(), etag, modified) is None
+
+    def test_counts_not_modified(self):
+        etag = make_etag("b")
+        before = http_cache_stats.stats()
+        conditional_get(_request(), Response(), etag)
+        conditional_get(_request(if_none_match=etag), Response(), etag)
+        after = http_cache_stats.stats()
+        assert after["not_modified"] - before["not_modified"] == 1
+        assert after["full"] - before["full"] == 1
+
+
+class TestCatalogEndpoints:
+    """Test 304s for catalog-served reads."""
+
+    @pytest.mark.asyncio
+    async def test_listing_revalidates_without_rebuilding(self, client, catalog):
+        first = await client.get("/products", params={"page_size": 5})
+        etag = first.headers["etag"]
+
+        with patch("app.services.products.routes.ProductService.list_products") as list_products:
+            second = await client.get("/products", params={"page_size": 5}, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        list_products.assert_not_called()
+
+        # Another query or a changed catalog gets a new validator
+        other = await client.get("/products", params={"page_size": 6}, headers={"If-None-Match": etag})
+        assert other.status_code == 200
+        catalog.upsert({**PRODUCTS[1], "price": 9, "updated_at": "2024-03-01T00:00:00+00:00"})
+        changed = await client.get("/products", params={"page_size": 5}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_product_validated_by_updated_at(self, client, catalog):
+        first = await client.get("/products/p1")
+        assert first.headers["last-modified"] == "Thu, 01 Feb 2024 10:00:00 GMT"
+
+        # Edits to other products leave this one's validator alone
+        catalog.upsert({**PRODUCTS[1], "updated_at": "2024-03-01T00:00:00+00:00"})
+        second = await client.get("/products/p1", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 304
+
+    def test_fingerprint_tracks_content(self):
+        """Workers holding the same products agree on the fingerprint."""
+        a, b = ProductCatalog(), ProductCatalog()
+        for product in PRODUCTS:
+            a.upsert(dict(product))
+        for product in reversed(PRODUCTS):
+            b.upsert(dict(product))
+        # A rename and back moves b's version on but leaves the content alone
+        b.upsert({**PRODUCTS[0], "name": "Renamed"})
+        b.upsert(dict(PRODUCTS[0]))
+        assert a.fingerprint == b.fingerprint
+        assert a.version != b.version
+
+        b.upsert({**PRODUCTS[0], "updated_at": "2024-05-01"})
+        assert a.fingerprint != b.fingerprint
+        b.remove("p2")
+        a.remove("p2")
+        a.upsert({**PRODUCTS[0], "updated_at": "2024-05-01"})
+        assert a.fingerprint == b.fingerprint
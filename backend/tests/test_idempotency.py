@@ -0,0 +1,154 @@
+"""
+Tests for idempotency keys on order creation.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+from unittest.mock import patch
+
+from app.main import app
+from app.services.orders.schemas import OrderResponse
+from app.shared.exceptions import ValidationError
+from app.shared.idempotency import IdempotencyStore, RedisIdempotencyStore, idempotency_store, request_fingerprint
+from app.shared.security import get_current_user
+
+
+ORDER = OrderResponse(id="o1", user_id="u1", subtotal=10, total=10)
+
+
+def _slow(result, calls):
+    async def operation(*args, **kwargs):
+        calls.append(args)
+        await asyncio.sleep(0.01)
+        return result
+    return operation
+
+
+class TestIdempotencyStore:
+    """Test deduplication of in-flight and completed operations."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_duplicates_run_once(self):
+        """20 requests with one key share the first one's result."""
+        store = IdempotencyStore()
+        calls = []
+        operation = _slow("order", calls)
+
+        results = await asyncio.gather(*(store.run("k", "body", operation) for _ in range(20)))
+
+        assert len(calls) == 1
+        assert [result for result, _ in results] == ["order"] * 20
+        assert sorted(replayed for _, replayed in results) == [False] + [True] * 19
+
+        # Completed results are replayed too
+        assert await store.run("k", "body", operation) == ("order", True)
+        assert len(calls) == 1
+        assert store.stats()["executed"] == 1
+        assert store.stats()["replayed"] == 20
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_request(self):
+        store = IdempotencyStore()
+        await store.run("k", request_fingerprint('{"a":1}'), _slow("order", []))
+        with pytest.raises(ValidationError):
+            await store.run("k", request_fingerprint('{"a":2}'), _slow("other", []))
+        assert store.stats()["mismatched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_retried(self):
+        """A failed operation isn't stored, so a retry runs it again."""
+        store = IdempotencyStore()
+
+        async def fail():
+            raise RuntimeError("timeout")
+
+        with pytest.raises(RuntimeError):
+            await store.run("k", "body", fail)
+        assert await store.run("k", "body", _slow("order", [])) == ("order", False)
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="TEST_REDIS_URL not set")
+class TestRedisIdempotencyStore:
+    """Share keys between workers through Redis (set TEST_REDIS_URL)."""
+
+    @pytest.fixture
+    def workers(self):
+        pytest.importorskip("redis")
+        prefix = f"test:idempotency:{uuid.uuid4()}"
+        return [RedisIdempotencyStore(os.environ["TEST_REDIS_URL"], prefix=prefix) for _ in range(2)]
+
+    @pytest.mark.asyncio
+    async def test_retries_on_other_workers_run_once(self, workers):
+        calls = []
+        operation = _slow(ORDER, calls)
+
+        results = await asyncio.gather(*(
+            workers[i % 2].run("k", "body", operation, OrderResponse) for i in range(10)
+        ))
+
+        assert len(calls) == 1
+        assert all(result == ORDER for result, _ in results)
+        assert sum(replayed for _, replayed in results) == 9
+        # Replayed from Redis on a worker that never ran it
+        assert await workers[1].run("k", "body", operation, OrderResponse) == (ORDER, True)
+
+    @pytest.mark.asyncio
+    async def test_failure_releases_key(self, workers):
+        async def fail():
+            raise RuntimeError("timeout")
+
+        with pytest.raises(RuntimeError):
+            await workers[0].run("k", "body", fail)
+        assert await workers[1].run("k", "body", _slow("order", [])) == ("order", False)
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_request(self, workers):
+        await workers[0].run("k", "a", _slow("order", []))
+        with pytest.raises(ValidationError):
+            await workers[1].run("k", "b", _slow("other", []))
+
+
+class TestCreateOrderIdempotency:
+    """Test the Idempotency-Key header on POST /orders."""
+
+    BODY = {"items": [{"product_id": "6f1c2d3e-0000-4000-8000-000000000001", "quantity": 1}]}
+
+    @pytest.fixture(autouse=True)
+    def _user(self):
+        app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+        idempotency_store.clear()
+        yield
+        app.dependency_overrides.pop(get_current_user, None)
+        idempotency_store.clear()
+
+    @pytest.mark.asyncio
+    async def test_parallel_retries_create_one_order(self, client):
+        calls = []
+        with patch("app.services.orders.routes.OrdersService.create_order", side_effect=_slow(ORDER, calls)):
+            responses = await asyncio.gather(*(
+                client.post("/orders", json=self.BODY, headers={"Idempotency-Key": "checkout-1"})
+                for _ in range(20)
+            ))
+
+        assert len(calls) == 1
+        assert {response.status_code for response in responses} == {200}
+        assert {response.json()["id"] for response in responses} == {"o1"}
+        assert sum(response.headers.get("idempotent-replayed") == "true" for response in responses) == 19
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped(self, client):
+        """Different keys, or no key, each place an order."""
+        calls = []
+        with patch("app.services.orders.routes.OrdersService.create_order", side_effect=_slow(ORDER, calls)):
+            await client.post("/orders", json=self.BODY, headers={"Idempotency-Key": "a"})
+            await client.post("/orders", json=self.BODY, headers={"Idempotency-Key": "b"})
+            await client.post("/orders", json=self.BODY)
+            await client.post("/orders", json=self.BODY)
+            reused = await client.post(
+                "/orders", json={"items": [{"product_id": "6f1c2d3e-0000-4000-8000-000000000002", "quantity": 1}]}, headers={"Idempotency-Key": "a"}
+            )
+
+        assert len(calls) == 4
+        assert reused.status_code == 422
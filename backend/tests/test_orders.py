@@ -0,0 +1,336 @@
+"""
+Tests for orders repositories and services.
+"""
+import asyncio
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from postgrest.exceptions import APIError
+
+from app.services.orders.pricing import price_lines, quote_order
+from app.services.orders.repository import AdminOrdersRepository, OrdersRepository
+from app.services.orders.schemas import OrderCreate
+from app.services.orders.service import OrdersService
+from app.shared import store_config
+from app.shared.exceptions import ConflictError, ValidationError
+from app.shared.pagination import decode_cursor, encode_cursor, keyset_filter
+from tests.conftest import query_returning
+
+
+def _uuid(n: int) -> str:
+    return f"6f1c2d3e-0000-4000-8000-{n:012d}"
+
+
+class TestAdminOrderEnrichment:
+    """Test batched enrichment of admin order listings."""
+
+    @pytest.mark.asyncio
+    async def test_enrich_uses_one_profile_lookup(self):
+        """Customer names for a whole page come from a single query."""
+        profiles = query_returning([
+            {"id": "u1", "full_name": "Ada"},
+            {"id": "u2", "full_name": "Grace"},
+        ])
+        client = MagicMock()
+        client.table.return_value = profiles
+
+        orders = [
+            {"id": "o1", "user_id": "u1", "order_items": [{"count": 2}]},
+            {"id": "o2", "user_id": "u2", "order_items": [{"count": 1}]},
+            {"id": "o3", "user_id": "u1", "order_items": [{"count": 5}]},
+        ]
+
+        await AdminOrdersRepository.enrich_orders(client, orders)
+
+        assert profiles.execute.await_count == 1
+        ids = profiles.in_.call_args.args[1]
+        assert sorted(ids) == ["u1", "u2"]
+        assert [o["customer_name"] for o in orders] == ["Ada", "Grace", "Ada"]
+        assert [o["items_count"] for o in orders] == [2, 1, 5]
+        assert all("order_items" not in o for o in orders)
+
+    @pytest.mark.asyncio
+    async def test_enrich_defaults_unknown_customer(self):
+        """Orders without a profile fall back to 'Unknown'."""
+        client = MagicMock()
+        client.table.return_value = query_returning([])
+
+        orders = [{"id": "o1", "user_id": "u9", "order_items": []}]
+        await AdminOrdersRepository.enrich_orders(client, orders)
+
+        assert orders[0]["customer_name"] == "Unknown"
+        assert orders[0]["items_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_enrich_empty_page_skips_lookup(self):
+        """An empty page makes no profile query."""
+        client = MagicMock()
+        assert await AdminOrdersRepository.enrich_orders(client, []) == []
+        client.table.assert_not_called()
+
+
+class TestAdminOrderListing:
+    """Test keyset pagination of the admin order listing."""
+
+    @staticmethod
+    def _client(orders, count=None):
+        orders_query = query_returning(orders, count=count)
+        client = MagicMock()
+        client.table.side_effect = lambda name: orders_query if name == "orders" else query_returning([])
+
+        @asynccontextmanager
+        async def admin_client():
+            yield client
+
+        return orders_query, admin_client
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_uses_keyset_filter(self):
+        """Pages after a cursor filter on (created_at, id) instead of an offset."""
+        rows = [
+            {"id": _uuid(i), "user_id": "u1", "created_at": f"2024-01-0{i}", "order_items": []}
+            for i in (3, 2, 1)
+        ]
+        query, admin_client = self._client(rows)
+        cursor = encode_cursor("2024-01-04", _uuid(4))
+
+        with patch("app.services.orders.repository.admin_client", admin_client):
+            orders, total, next_cursor = await AdminOrdersRepository.get_all_orders(
+                page_size=2, cursor=cursor, count="none"
+            )
+
+        query.or_.assert_called_once_with(keyset_filter(cursor))
+        query.limit.assert_called_once_with(3)
+        query.range.assert_not_called()
+        assert query.select.call_args.kwargs["count"] is None
+        assert [o["id"] for o in orders] == [_uuid(3), _uuid(2)]
+        assert total is None
+        assert decode_cursor(next_cursor) == ("2024-01-02", _uuid(2))
+
+    @pytest.mark.asyncio
+    async def test_numbered_page_estimates_total(self):
+        """Without a cursor, pages use an offset and an estimated count."""
+        query, admin_client = self._client([], count=1200)
+
+        with patch("app.services.orders.repository.admin_client", admin_client):
+            orders, total, next_cursor = await AdminOrdersRepository.get_all_orders(page=3, page_size=20)
+
+        query.range.assert_called_once_with(40, 60)
+        assert query.select.call_args.kwargs["count"] == "estimated"
+        assert (orders, total, next_cursor) == ([], 1200, None)
+
+
+PRODUCTS = {
+    "p1": {"id": "p1", "name": "Hydrating Serum", "product_type": "Serum", "price": 19.99,
+           "images": ["serum.jpg"], "is_active": True, "in_stock": True, "stock": 10},
+    "p2": {"id": "p2", "name": "Gentle Cleanser", "product_type": "Cleanser", "price": "0.10",
+           "images": [], "is_active": True, "in_stock": True, "stock": 10},
+}
+
+
+class TestOrderPricing:
+    """Test server-side order pricing."""
+
+    def test_totals_use_store_settings(self):
+        """Tax is a percentage of the subtotal; shipping is the flat fee."""
+        settings = {"tax_rate": 7.25, "shipping_fee": 4.5, "free_shipping_threshold": 100, "currency": "EUR"}
+        quote = price_lines({"p1": 3, "p2": 3}, PRODUCTS, settings)
+
+        assert [item["line_total"] for item in quote["items"]] == [Decimal("59.97"), Decimal("0.30")]
+        assert quote["items"][0]["image"] == "serum.jpg"
+        assert quote["subtotal"] == Decimal("60.27")
+        assert quote["tax"] == Decimal("4.37")
+        assert quote["shipping"] == Decimal("4.50")
+        assert quote["total"] == Decimal("69.14")
+        assert quote["currency"] == "EUR"
+
+    def test_free_shipping_threshold(self):
+        """Orders at the threshold ship free; a zero threshold disables it."""
+        settings = {"shipping_fee": 5, "free_shipping_threshold": "39.98"}
+        assert price_lines({"p1": 2}, PRODUCTS, settings)["shipping"] == Decimal("0.00")
+        assert price_lines({"p1": 1}, PRODUCTS, settings)["shipping"] == Decimal("5.00")
+        settings["free_shipping_threshold"] = 0
+        assert price_lines({"p1": 10}, PRODUCTS, settings)["shipping"] == Decimal("5.00")
+
+    def test_unavailable_products_rejected(self):
+        products = {**PRODUCTS, "p2": {**PRODUCTS["p2"], "in_stock": False}}
+        with pytest.raises(ValidationError) as exc:
+            price_lines({"p1": 1, "p2": 1, "gone": 1}, products, None)
+        assert exc.value.detail == "Products not available: p2, gone"
+
+    def test_short_stock_rejected(self):
+        """Lines beyond the stock on hand fail like place_order() would; NULL stock is none."""
+        products = {**PRODUCTS, "p2": {**PRODUCTS["p2"], "stock": None}}
+        with pytest.raises(ValidationError) as exc:
+            price_lines({"p1": 11, "p2": 1}, products, None)
+        assert exc.value.detail == "Products not available: p1, p2"
+        assert price_lines({"p1": 10}, products, None)["subtotal"] == Decimal("199.90")
+
+    @pytest.mark.asyncio
+    async def test_quote_batches_product_lookup(self):
+        """All lines resolve in one query and duplicate lines are merged."""
+        store_config.set_store_settings({"id": "s1", "tax_rate": 0, "shipping_fee": 0})
+        try:
+            with patch("app.services.orders.pricing.ProductRepository.get_by_ids",
+                       AsyncMock(return_value=list(PRODUCTS.values()))) as get_by_ids:
+                quote = await quote_order([
+                    {"product_id": "p1", "quantity": 1},
+                    {"product_id": "p2", "quantity": 2},
+                    {"product_id": "p1", "quantity": 2},
+                ])
+        finally:
+            store_config.invalidate_store_settings()
+
+        get_by_ids.assert_awaited_once_with(["p1", "p2"])
+        assert [(item["product_id"], item["quantity"]) for item in quote["items"]] == [("p1", 3), ("p2", 2)]
+        assert quote["total"] == Decimal("60.17")
+
+    @pytest.mark.asyncio
+    async def test_quote_endpoint_ignores_client_prices(self, client):
+        quote = {
+            "items": [{**PRODUCTS["p1"], "product_id": "p1", "type": "Serum", "price": Decimal("19.99"),
+                       "quantity": 1, "image": None, "line_total": Decimal("19.99")}],
+            "subtotal": Decimal("19.99"), "shipping": Decimal("0.00"), "tax": Decimal("0.00"),
+            "total": Decimal("19.99"), "currency": "USD",
+        }
+        with patch("app.services.orders.service.quote_order", AsyncMock(return_value=quote)) as mock_quote:
+            response = await client.post("/orders/quote", json={
+                "items": [{"product_id": _uuid(1), "quantity": 1, "price": 0.01}],
+            })
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 19.99
+        assert list(mock_quote.call_args.args[0]) == [{"product_id": _uuid(1), "quantity": 1}]
+
+    @pytest.mark.asyncio
+    async def test_quote_endpoint_validates_lines(self, client):
+        assert (await client.post("/orders/quote", json={"items": []})).status_code == 422
+        response = await client.post("/orders/quote", json={"items": [{"product_id": _uuid(1), "quantity": 0}]})
+        assert response.status_code == 422
+        # Non-UUID ids would fail in Postgres; reject them up front
+        response = await client.post("/orders/quote", json={"items": [{"product_id": "p1", "quantity": 1}]})
+        assert response.status_code == 422
+
+
+class TestPlaceOrder:
+    """Test order creation through place_order()."""
+
+    QUOTE = {
+        "items": [{"product_id": "p1", "name": "Hydrating Serum", "type": "Serum", "price": Decimal("19.99"),
+                   "quantity": 2, "image": None, "line_total": Decimal("39.98")}],
+        "subtotal": Decimal("39.98"), "shipping": Decimal("5.00"), "tax": Decimal("0.00"),
+        "total": Decimal("44.98"), "currency": "USD",
+    }
+
+    @pytest.mark.asyncio
+    async def test_single_rpc_call(self):
+        """The order, items and stock go through one RPC with exact amounts."""
+        client = MagicMock()
+        client.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data={"id": "o1"}))
+
+        @asynccontextmanager
+        async def admin_client():
+            yield client
+
+        with patch("app.services.orders.repository.admin_client", admin_client):
+            order = await OrdersRepository.create_order("u1", {**self.QUOTE, "shipping_address": {"city": "Nairobi"}})
+
+        assert order == {"id": "o1"}
+        name, params = client.rpc.call_args.args
+        assert name == "place_order"
+        assert params["p_total"] == "44.98"
+        assert params["p_items"][0]["price"] == "19.99"
+        assert params["p_shipping_address"] == {"city": "Nairobi"}
+        client.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_insufficient_stock_is_conflict(self):
+        error = APIError({"message": "insufficient_stock", "code": "P0001", "details": "p1"})
+        with patch("app.services.orders.service.quote_order", AsyncMock(return_value=dict(self.QUOTE))), \
+             patch("app.services.orders.service.OrdersRepository.create_order", AsyncMock(side_effect=error)):
+            with pytest.raises(ConflictError) as exc:
+                await OrdersService.create_order("u1", OrderCreate(items=[{"product_id": _uuid(1), "quantity": 2}]))
+        assert exc.value.detail == "Insufficient stock: p1"
+
+    @pytest.mark.asyncio
+    async def test_catalog_gets_new_stock(self):
+        """Updated product rows from the RPC refresh the local catalog."""
+        order = {
+            "id": "o1", "user_id": "u1", "status": "pending", "subtotal": 39.98, "shipping": 5, "tax": 0,
+            "total": 44.98, "items": [{"id": "i1", "product_id": "p1", "name": "Hydrating Serum",
+                                       "price": 19.99, "quantity": 2}],
+            "products": [{**PRODUCTS["p1"], "stock": 0, "in_stock": False}],
+        }
+        catalog = MagicMock()
+        publish = AsyncMock()
+        with patch("app.services.orders.service.quote_order", AsyncMock(return_value=dict(self.QUOTE))), \
+             patch("app.services.orders.service.OrdersRepository.create_order", AsyncMock(return_value=order)), \
+             patch("app.services.orders.service.get_product_catalog", return_value=catalog), \
+             patch("app.services.orders.service.event_bus.publish", publish):
+            result = await OrdersService.create_order("u1", OrderCreate(items=[{"product_id": _uuid(1), "quantity": 2}]))
+            await asyncio.sleep(0)
+
+        assert result.total == 44.98
+        catalog.upsert.assert_called_once()
+        assert catalog.upsert.call_args.args[0]["in_stock"] is False
+        # Other workers are told to reload the product
+        publish.assert_awaited_once_with({"type": "stock_updated", "product_ids": ["p1"]}, "catalog")
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+class TestPlaceOrderConcurrency:
+    """Run place_order() against a migrated database (set TEST_DATABASE_URL)."""
+
+    CHECKOUTS = 20
+    STOCK = 5
+
+    @pytest.mark.asyncio
+    async def test_same_product_never_oversells(self):
+        """Concurrent checkouts of one product fill exactly its stock."""
+        import asyncpg
+
+        pool = await asyncpg.create_pool(os.environ["TEST_DATABASE_URL"], min_size=self.CHECKOUTS, max_size=self.CHECKOUTS)
+        user_id, product_id = uuid.uuid4(), uuid.uuid4()
+        items = json.dumps([{"product_id": str(product_id), "name": "Stress Serum", "price": "10.00", "quantity": 1}])
+
+        async def checkout():
+            async with pool.acquire() as conn:
+                try:
+                    return await conn.fetchval(
+                        "SELECT public.place_order($1, $2::jsonb, 10, 0, 0, 10)", user_id, items
+                    )
+                except asyncpg.PostgresError as e:
+                    return e
+
+        try:
+            await pool.execute("INSERT INTO auth.users (id, email) VALUES ($1, $2)", user_id, f"{user_id}@test.local")
+            await pool.execute(
+                "INSERT INTO public.products (id, name, price, stock) VALUES ($1, 'Stress Serum', 10, $2)",
+                product_id, self.STOCK,
+            )
+
+            results = await asyncio.gather(*(checkout() for _ in range(self.CHECKOUTS)))
+
+            placed = [json.loads(r) for r in results if isinstance(r, str)]
+            rejected = [r for r in results if isinstance(r, asyncpg.PostgresError)]
+            assert len(placed) == self.STOCK
+            assert len(rejected) == self.CHECKOUTS - self.STOCK
+            assert all(e.message == "insufficient_stock" for e in rejected)
+            assert all(len(order["items"]) == 1 for order in placed)
+
+            product = await pool.fetchrow("SELECT stock, in_stock FROM public.products WHERE id = $1", product_id)
+            assert (product["stock"], product["in_stock"]) == (0, False)
+            orders = await pool.fetchval("SELECT COUNT(*) FROM public.orders WHERE user_id = $1", user_id)
+            items_count = await pool.fetchval(
+                "SELECT COUNT(*) FROM public.order_items WHERE product_id = $1", str(product_id)
+            )
+            assert orders == items_count == self.STOCK
+        finally:
+            await pool.execute("DELETE FROM auth.users WHERE id = $1", user_id)
+            await pool.execute("DELETE FROM public.products WHERE id = $1", product_id)
+            await pool.close()
@@ -0,0 +1,80 @@
+"""
+Tests for keyset pagination helpers.
+"""
+import pytest
+
+from app.shared.exceptions import ValidationError
+from app.shared.pagination import (
+    count_method,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    paginate_rows,
+    total_pages,
+)
+
+
+class TestCursors:
+    """Test opaque cursor encoding."""
+
+    def test_round_trip(self):
+        """Encoded cursors decode back to the same sort key."""
+        cursor = encode_cursor("2024-01-01T10:00:00+00:00", "6f1c2d3e-0000-4000-8000-000000000001")
+        assert decode_cursor(cursor) == ("2024-01-01T10:00:00+00:00", "6f1c2d3e-0000-4000-8000-000000000001")
+
+    def test_cursor_is_url_safe(self):
+        """Cursors can be passed as query parameters without escaping."""
+        cursor = encode_cursor("2024-01-01T10:00:00.123456+00:00", "abc")
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", [
+        "not-base64!",
+        "e30",
+        encode_cursor('x",id.gt.0', "6f1c2d3e-0000-4000-8000-000000000001"),
+        # Ids must be UUIDs, or Postgres rejects the filter with a 500
+        encode_cursor("2024-01-01", "abc"),
+        encode_cursor("2024-01-01", "1)"),
+    ])
+    def test_invalid_cursor_rejected(self, cursor):
+        """Malformed or tampered cursors raise a validation error."""
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor)
+
+    def test_keyset_filter(self):
+        """The filter resumes strictly after the cursor row."""
+        cursor = encode_cursor("2024-01-01T10:00:00+00:00", "6f1c2d3e-0000-4000-8000-000000000001")
+        assert keyset_filter(cursor) == (
+            'created_at.lt."2024-01-01T10:00:00+00:00",'
+            'and(created_at.eq."2024-01-01T10:00:00+00:00",id.lt.6f1c2d3e-0000-4000-8000-000000000001)'
+        )
+
+
+class TestPaginateRows:
+    """Test trimming an over-fetched page."""
+
+    def test_last_page_has_no_cursor(self):
+        rows = [{"id": "1", "created_at": "2024-01-02"}]
+        assert paginate_rows(rows, limit=2) == (rows, None)
+
+    def test_full_page_returns_cursor_for_last_row(self):
+        rows = [
+            {"id": f"6f1c2d3e-0000-4000-8000-00000000000{i}", "created_at": f"2024-01-0{i}"}
+            for i in (3, 2, 1)
+        ]
+        page, cursor = paginate_rows(rows, limit=2)
+        assert page == rows[:2]
+        assert decode_cursor(cursor) == ("2024-01-02", "6f1c2d3e-0000-4000-8000-000000000002")
+
+
+class TestTotals:
+    """Test optional totals."""
+
+    def test_count_method(self):
+        assert count_method("exact") == "exact"
+        assert count_method("estimated") == "estimated"
+        assert count_method("none") is None
+
+    def test_total_pages(self):
+        assert total_pages(41, 20) == 3
+        assert total_pages(0, 20) == 1
+        assert total_pages(None, 20) is None
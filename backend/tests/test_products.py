@@ -0,0 +1,306 @@
+"""
+Tests for the products catalog and service.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.products.catalog import ProductCatalog
+from app.services.products.service import ProductService
+
+
+def _product(product_id, created_at, **fields):
+    return {
+        "id": product_id,
+        "name": fields.pop("name", f"Product {product_id}"),
+        "price": 10,
+        "is_active": True,
+        "created_at": created_at,
+        **fields,
+    }
+
+
+PRODUCTS = [
+    _product("p1", "2024-01-01", name="Hydrating Serum", product_type="serum",
+             skin_concerns=["dryness"], skin_types=["dry"], usage_time="AM",
+             key_ingredients=["Hyaluronic Acid"]),
+    _product("p2", "2024-01-02", name="Gentle Cleanser", product_type="cleanser",
+             skin_concerns=["acne"], skin_types=["oily", "combination"], usage_time="PM"),
+    _product("p3", "2024-01-03", name="Night Serum", product_type="serum",
+             skin_concerns=["aging", "dryness"], skin_types=["dry"], usage_time="PM",
+             key_ingredients=["Retinol", "Peptides"]),
+    _product("p4", "2024-01-04", name="Old Toner", product_type="toner", is_active=False),
+]
+
+
+@pytest.fixture
+def catalog():
+    catalog = ProductCatalog(ttl=60)
+    with patch("app.services.products.catalog.ProductRepository.get_all_rows",
+               AsyncMock(return_value=[dict(p) for p in PRODUCTS])):
+        yield catalog
+
+
+class TestProductCatalog:
+    """Test filtering and patching the in-memory catalog."""
+
+    @pytest.mark.asyncio
+    async def test_filters_match_repository_semantics(self, catalog):
+        """Filters, ordering and counts mirror ProductRepository.get_all."""
+        assert await catalog.ready()
+
+        rows, total, _ = catalog.list()
+        assert [r["id"] for r in rows] == ["p3", "p2", "p1"]
+        assert total == 3
+
+        assert [r["id"] for r in catalog.list(product_type=["serum"])[0]] == ["p3", "p1"]
+        assert [r["id"] for r in catalog.list(skin_concern=["dryness"], usage_time=["PM"])[0]] == ["p3"]
+        assert [r["id"] for r in catalog.list(skin_type=["oily"])[0]] == ["p2"]
+        assert [r["id"] for r in catalog.list(search="SERUM")[0]] == ["p3", "p1"]
+        assert catalog.list(active_only=False)[1] == 4
+
+    @pytest.mark.asyncio
+    async def test_multi_select_facets(self, catalog):
+        """Values within a facet are OR'ed (or AND'ed with match=all); facets are AND'ed."""
+        await catalog.ready()
+
+        assert [r["id"] for r in catalog.list(product_type=["serum", "cleanser"])[0]] == ["p3", "p2", "p1"]
+        assert [r["id"] for r in catalog.list(skin_concern=["acne", "aging"])[0]] == ["p3", "p2"]
+        assert [r["id"] for r in catalog.list(skin_concern=["aging", "dryness"], match="all")[0]] == ["p3"]
+        assert [r["id"] for r in catalog.list(key_ingredient=["Retinol", "Hyaluronic Acid"])[0]] == ["p3", "p1"]
+        assert catalog.list(product_type=["serum"], skin_type=["oily"]) == ([], 0, None)
+        assert catalog.list(product_type=["unknown"]) == ([], 0, None)
+
+    @pytest.mark.asyncio
+    async def test_index_follows_writes(self, catalog):
+        """The facet index reflects products changed after it was built."""
+        await catalog.ready()
+        assert catalog.list(key_ingredient=["Niacinamide"])[1] == 0
+
+        catalog.upsert(_product("p6", "2024-01-06", key_ingredients=["Niacinamide"]))
+        assert [r["id"] for r in catalog.list(key_ingredient=["Niacinamide"])[0]] == ["p6"]
+
+        catalog.upsert({**catalog.get("p6"), "is_active": False})
+        assert catalog.list(key_ingredient=["Niacinamide"])[1] == 0
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, catalog):
+        await catalog.ready()
+        rows, total, next_cursor = catalog.list(page=2, page_size=2)
+        assert [r["id"] for r in rows] == ["p1"]
+        assert total == 3
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(self):
+        """Cursor pages walk the listing and aren't shifted by new products."""
+        # Cursor ids are UUIDs, as in the products table
+        ids = {f"p{i}": f"6f1c2d3e-0000-4000-8000-00000000000{i}" for i in range(1, 6)}
+        catalog = ProductCatalog(ttl=60)
+        with patch("app.services.products.catalog.ProductRepository.get_all_rows",
+                   AsyncMock(return_value=[{**p, "id": ids[p["id"]]} for p in PRODUCTS])):
+            await catalog.ready()
+        rows, total, cursor = catalog.list(page_size=2, active_only=False)
+        assert [r["id"] for r in rows] == [ids["p4"], ids["p3"]]
+
+        catalog.upsert(_product(ids["p5"], "2024-01-05"))
+        rows, total, cursor = catalog.list(page_size=2, active_only=False, cursor=cursor)
+        assert [r["id"] for r in rows] == [ids["p2"], ids["p1"]]
+        assert total == 5
+        assert cursor is None
+
+        _, _, cursor = catalog.list(page_size=1, product_type=["serum"])
+        assert [r["id"] for r in catalog.list(page_size=1, product_type=["serum"], cursor=cursor)[0]] == [ids["p1"]]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ready_loads_once(self, catalog):
+        """Parallel first requests share one snapshot load."""
+        results = await asyncio.gather(*(catalog.ready() for _ in range(10)))
+        assert all(results)
+        assert catalog.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_patch_snapshot(self, catalog):
+        """Upserts and deletes are visible without a reload."""
+        await catalog.ready()
+        version = catalog.version
+
+        catalog.upsert(_product("p5", "2024-01-05", name="New Mask"))
+        catalog.remove("p2")
+
+        assert [r["id"] for r in catalog.list()[0]] == ["p5", "p3", "p1"]
+        assert catalog.get("p2") is None
+        assert catalog.version > version
+        assert catalog.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_stock_update_keeps_caches(self, catalog):
+        """Changes outside the sort key and indexes patch the row in place."""
+        await catalog.ready()
+        catalog.facet_counts(skin_concern=["dryness"])
+        index, version, fingerprint = catalog.index, catalog.version, catalog.fingerprint
+
+        catalog.upsert({**catalog.get("p1"), "stock": 3, "price": 12, "updated_at": "2024-02-01"})
+
+        assert catalog.version == version
+        assert catalog.index is index
+        assert catalog.facet_cache.get((version, (("skin_concern", ("dryness",)),), None, "any", True))
+        # Reads see the new row, and HTTP validators still change
+        assert [(r["id"], r.get("stock")) for r in catalog.list()[0]] == [("p3", None), ("p2", None), ("p1", 3)]
+        assert catalog.fingerprint != fingerprint
+
+    @pytest.mark.asyncio
+    async def test_indexed_or_order_changes_bump_version(self, catalog):
+        await catalog.ready()
+        version = catalog.version
+
+        catalog.upsert({**catalog.get("p1"), "skin_concerns": ["acne"]})
+        assert catalog.version == version + 1
+        assert catalog.facet_counts(skin_concern=["acne"])[0] == 2
+
+        catalog.upsert({**catalog.get("p1"), "created_at": "2024-01-09"})
+        assert catalog.version == version + 2
+        assert [r["id"] for r in catalog.list()[0]] == ["p1", "p3", "p2"]
+
+    @pytest.mark.asyncio
+    async def test_write_during_load_survives(self):
+        """A write racing a reload is re-applied to the new snapshot."""
+        catalog = ProductCatalog(ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_rows():
+            started.set()
+            await release.wait()
+            return [dict(PRODUCTS[0])]
+
+        with patch("app.services.products.catalog.ProductRepository.get_all_rows", side_effect=slow_rows):
+            load = asyncio.create_task(catalog.ready())
+            await started.wait()
+            catalog.upsert(_product("p9", "2024-02-01"))
+            release.set()
+            await load
+
+        assert catalog.get("p9") is not None
+
+    @pytest.mark.asyncio
+    async def test_load_failure_reports_not_ready(self):
+        """If the snapshot can't load, callers fall back to the database."""
+        catalog = ProductCatalog(ttl=60)
+        with patch("app.services.products.catalog.ProductRepository.get_all_rows",
+                   AsyncMock(side_effect=RuntimeError("down"))):
+            assert await catalog.ready() is False
+        assert catalog.stats()["misses"] == 1
+
+
+class TestFacetCounts:
+    """Test facet counts over the catalog index."""
+
+    @pytest.mark.asyncio
+    async def test_counts_without_selection(self, catalog):
+        await catalog.ready()
+        total, counts = catalog.facet_counts()
+
+        assert total == 3
+        assert counts["product_type"] == {"serum": 2, "cleanser": 1, "toner": 0}
+        assert counts["skin_concern"] == {"dryness": 2, "acne": 1, "aging": 1}
+
+    @pytest.mark.asyncio
+    async def test_each_facet_ignores_its_own_selection(self, catalog):
+        """Selecting a concern still shows counts for the other concerns."""
+        await catalog.ready()
+        total, counts = catalog.facet_counts(skin_concern=["acne"], product_type=["serum"])
+
+        assert total == 0
+        assert counts["skin_concern"] == {"dryness": 2, "acne": 0, "aging": 1}
+        assert counts["product_type"]["cleanser"] == 1
+        assert counts["skin_type"] == {"dry": 0, "oily": 0, "combination": 0}
+
+    @pytest.mark.asyncio
+    async def test_match_all_narrows_own_facet(self, catalog):
+        await catalog.ready()
+        total, counts = catalog.facet_counts(skin_concern=["dryness"], match="all")
+
+        assert total == 2
+        assert counts["skin_concern"] == {"dryness": 2, "acne": 0, "aging": 1}
+
+    @pytest.mark.asyncio
+    async def test_cached_per_selection_and_version(self, catalog):
+        """Repeat selections are served from cache until the catalog changes."""
+        await catalog.ready()
+        with patch.object(catalog.index, "facet_counts", wraps=catalog.index.facet_counts) as compute:
+            catalog.facet_counts(skin_concern=["acne", "aging"])
+            catalog.facet_counts(skin_concern=["aging", "acne"])
+        assert compute.call_count == 1
+
+        catalog.upsert(_product("p7", "2024-01-07", skin_concerns=["acne"]))
+        _, counts = catalog.facet_counts(skin_concern=["acne", "aging"])
+        assert counts["skin_concern"]["acne"] == 2
+
+    @pytest.mark.asyncio
+    async def test_facets_endpoint(self, client, catalog):
+        """Every known option is listed, with zero counts where unused."""
+        with patch("app.services.products.service.get_product_catalog", return_value=catalog):
+            response = await client.get("/products/facets", params={"skin_concern": ["dryness"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        product_types = {o["value"]: o["count"] for o in data["product_types"]}
+        assert product_types["Cleanser"] == 0
+        assert product_types["serum"] == 2
+
+
+class TestSuggestions:
+    """Test typeahead suggestions from the catalog."""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_catalog_changes(self, catalog):
+        await catalog.ready()
+        with patch.object(catalog.suggest_index, "suggest", wraps=catalog.suggest_index.suggest) as compute:
+            assert [s["text"] for s in catalog.suggest("ser")] == ["serum", "Night Serum", "Hydrating Serum"]
+            catalog.suggest("SER ")
+        assert compute.call_count == 1
+
+        catalog.remove("p3")
+        assert [s["text"] for s in catalog.suggest("ser")] == ["serum", "Hydrating Serum"]
+
+    @pytest.mark.asyncio
+    async def test_suggest_endpoint(self, client, catalog):
+        with patch("app.services.products.service.get_product_catalog", return_value=catalog):
+            response = await client.get("/products/suggest", params={"q": "night", "limit": 3})
+
+        assert response.status_code == 200
+        assert response.json()["suggestions"] == [
+            {"text": "Night Serum", "kind": "product", "product_id": "p3", "count": 1},
+        ]
+
+
+class TestProductService:
+    """Test that reads are served from the catalog."""
+
+    @pytest.mark.asyncio
+    async def test_reads_skip_database(self, catalog):
+        with patch("app.services.products.service.get_product_catalog", return_value=catalog), \
+             patch("app.services.products.service.ProductRepository.get_all") as get_all, \
+             patch("app.services.products.service.ProductRepository.get_by_id") as get_by_id:
+            listing = await ProductService.list_products(product_type=["serum"])
+            product = await ProductService.get_product("p1")
+
+        assert [p.id for p in listing.products] == ["p3", "p1"]
+        assert product.name == "Hydrating Serum"
+        get_all.assert_not_called()
+        get_by_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_id_checks_database(self, catalog):
+        """A product missing from the snapshot is looked up and cached."""
+        fresh = _product("p8", "2024-03-01")
+        with patch("app.services.products.service.get_product_catalog", return_value=catalog), \
+             patch("app.services.products.service.ProductRepository.get_by_id",
+                   AsyncMock(return_value=fresh)) as get_by_id:
+            await ProductService.get_product("p8")
+            await ProductService.get_product("p8")
+
+        assert get_by_id.await_count == 1
@@ -0,0 +1,136 @@
+"""
+Tests for rate limit keys, shared limiter storage and login lockouts.
+"""
+import os
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from unittest.mock import AsyncMock, patch
+
+from app.shared.rate_limit import get_limiter
+from app.shared.rate_limit_tracker import LoginAttemptTracker, MemoryAttemptStore
+from app.shared.security import get_current_user
+
+
+def _worker(limiter: Limiter) -> FastAPI:
+    """A one-route app rate limited by `limiter`, standing in for a worker."""
+    worker = FastAPI()
+    worker.state.limiter = limiter
+    worker.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @worker.get("/limited")
+    @limiter.limit("2/minute")
+    async def limited(request: Request, current_user: dict = Depends(get_current_user)):
+        return {"id": current_user["id"]}
+
+    return worker
+
+
+async def _get(worker: FastAPI, token: str) -> int:
+    async with AsyncClient(transport=ASGITransport(app=worker), base_url="http://test") as client:
+        response = await client.get("/limited", headers={"Authorization": f"Bearer {token}"})
+    return response.status_code
+
+
+async def _verify(token: str) -> dict:
+    return {"id": token}
+
+
+class TestRateLimitKeys:
+    """Test per-user limits for authenticated requests."""
+
+    @pytest.mark.asyncio
+    async def test_users_behind_one_ip_get_own_quota(self):
+        """Two users sharing an address are limited separately."""
+        worker = _worker(get_limiter())
+        with patch("app.shared.security.verify_token", side_effect=_verify):
+            assert [await _get(worker, "alice") for _ in range(3)] == [200, 200, 429]
+            assert await _get(worker, "bob") == 200
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="TEST_REDIS_URL not set")
+class TestSharedStorage:
+    """Run limits against a Redis-compatible server (set TEST_REDIS_URL)."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_counters(self):
+        """A user's quota is spent across workers, not per worker."""
+        pytest.importorskip("redis")
+        with patch("app.shared.rate_limit.get_settings") as mock_settings:
+            mock_settings.return_value.rate_limit_storage_uri = os.environ["TEST_REDIS_URL"]
+            mock_settings.return_value.rate_limit_strategy = "sliding-window-counter"
+            workers = [_worker(get_limiter()), _worker(get_limiter())]
+
+        user = f"user-{uuid.uuid4()}"
+        with patch("app.shared.security.verify_token", side_effect=_verify):
+            statuses = [await _get(workers[i % 2], user) for i in range(3)]
+        assert statuses == [200, 200, 429]
+
+
+class TestLoginAttemptTracker:
+    """Test bounded failed-login tracking."""
+
+    @pytest.mark.asyncio
+    async def test_lockout_after_max_attempts(self):
+        tracker = LoginAttemptTracker(MemoryAttemptStore())
+        remaining = [await tracker.record_failed_attempt("Ada@Example.com ") for _ in range(5)]
+
+        assert remaining == [4, 3, 2, 1, 0]
+        locked, seconds = await tracker.is_locked_out("ada@example.com")
+        assert locked and 0 < seconds <= 900
+        assert await tracker.get_remaining_attempts("ada@example.com") == 0
+
+        await tracker.reset_attempts("ADA@example.com")
+        assert await tracker.is_locked_out("ada@example.com") == (False, None)
+        assert await tracker.get_remaining_attempts("ada@example.com") == 5
+
+    @pytest.mark.asyncio
+    async def test_old_failures_fall_out_of_window(self):
+        tracker = LoginAttemptTracker(MemoryAttemptStore())
+        with patch("app.shared.rate_limit_tracker.time.time", return_value=1000.0):
+            for _ in range(4):
+                await tracker.record_failed_attempt("ada@example.com")
+        with patch("app.shared.rate_limit_tracker.time.time", return_value=1000.0 + 601):
+            assert await tracker.record_failed_attempt("ada@example.com") == 4
+            assert await tracker.is_locked_out("ada@example.com") == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_memory_is_bounded(self):
+        """A stuffing run over many emails can't grow the store past its cap."""
+        store = MemoryAttemptStore(max_keys=3)
+        tracker = LoginAttemptTracker(store)
+        for i in range(10):
+            for _ in range(20):
+                await tracker.record_failed_attempt(f"user{i}@example.com")
+
+        assert store.stats()["size"] == 3
+        assert store.stats()["evictions"] == 7
+        assert all(len(entry.failures) == 5 for entry in store._entries.values())
+
+    @pytest.mark.asyncio
+    async def test_sweep_keeps_active_lockouts(self):
+        store = MemoryAttemptStore()
+        tracker = LoginAttemptTracker(store)
+        with patch("app.shared.rate_limit_tracker.time.time", return_value=1000.0):
+            await tracker.record_failed_attempt("stale@example.com")
+            for _ in range(5):
+                await tracker.record_failed_attempt("locked@example.com")
+        with patch("app.shared.rate_limit_tracker.time.time", return_value=1000.0 + 700):
+            assert await tracker.cleanup_old_data() == 1
+            assert (await tracker.is_locked_out("locked@example.com"))[0]
+        assert store.stats()["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_store_errors_fail_open(self):
+        store = MemoryAttemptStore()
+        store.record = AsyncMock(side_effect=ConnectionError("down"))
+        store.locked_until = AsyncMock(side_effect=ConnectionError("down"))
+        tracker = LoginAttemptTracker(store)
+
+        assert await tracker.record_failed_attempt("ada@example.com") == 5
+        assert await tracker.is_locked_out("ada@example.com") == (False, None)
+        assert tracker.stats()["store_errors"] == 2
@@ -0,0 +1,145 @@
+"""
+Tests for ranked product search.
+"""
+from app.services.products.search_index import SearchIndex, stem, tokenize
+from app.services.products.suggest_index import SuggestIndex
+
+
+def _product(product_id, name, description="", product_type=None, key_ingredients=()):
+    return {
+        "id": product_id,
+        "name": name,
+        "description": description,
+        "product_type": product_type,
+        "key_ingredients": list(key_ingredients),
+    }
+
+
+PRODUCTS = [
+    _product("p1", "Hydrating Serum", "Lightweight serum for dry skin.", "Serum", ["Hyaluronic Acid"]),
+    _product("p2", "Daily Moisturizer", "Moisturizes and protects. Contains niacinamide.", "Moisturizer", ["Niacinamide"]),
+    _product("p3", "Clarifying Cleanser", "Gentle foaming cleanser with salicylic acid.", "Cleanser", ["Salicylic Acid"]),
+    _product("p4", "Night Cream", "Rich cream with retinol for overnight renewal.", "Moisturizer", ["Retinol", "Peptides"]),
+    _product("p5", "Crème Brûlée Lip Balm", "Nourishing balm.", "Treatment"),
+]
+
+
+class TestTokenizer:
+    """Test text normalization."""
+
+    def test_inflections_share_a_stem(self):
+        assert len({stem(w) for w in ["moisturizer", "moisturizing", "moisturizes", "moisturize"]}) == 1
+        assert stem("cleansers") == stem("cleansing") == stem("cleanse")
+        assert stem("hydration") == stem("hydrating")
+
+    def test_accents_and_stopwords(self):
+        assert tokenize("Crème Brûlée for the Lips") == ["creme", "brulee", "lips"]
+
+
+class TestSearchIndex:
+    """Test BM25 search over the inverted index."""
+
+    def test_matches_description_and_ingredients(self):
+        """Search covers more than the product name."""
+        index = SearchIndex.build(PRODUCTS)
+        assert set(index.search("salicylic")) == {"p3"}
+        assert set(index.search("retinol")) == {"p4"}
+
+    def test_stemmed_match(self):
+        index = SearchIndex.build(PRODUCTS)
+        assert "p2" in index.search("moisturizing")
+
+    def test_prefix_match(self):
+        """Partially typed words match indexed terms."""
+        index = SearchIndex.build(PRODUCTS)
+        assert set(index.search("hyalu")) == {"p1"}
+        assert set(index.search("clean")) == {"p3"}
+
+    def test_every_word_must_match(self):
+        index = SearchIndex.build(PRODUCTS)
+        assert set(index.search("acid")) == {"p1", "p3"}
+        assert set(index.search("acid serum")) == {"p1"}
+        assert index.search("serum retinol") == {}
+
+    def test_name_matches_rank_higher(self):
+        """A hit in the name outranks one only in the description."""
+        index = SearchIndex.build(PRODUCTS)
+        index.add(_product("p6", "Barrier Balm", "Pairs well with any serum."))
+        scores = index.search("serum")
+        assert scores["p1"] > scores["p6"]
+
+    def test_incremental_updates(self):
+        """Writes are reflected without rebuilding the index."""
+        index = SearchIndex.build(PRODUCTS)
+
+        index.add(_product("p1", "Vitamin C Serum", "Brightening serum."))
+        assert index.search("hyaluronic") == {}
+        assert set(index.search("vitamin")) == {"p1"}
+
+        index.remove("p1")
+        assert index.search("vitamin") == {}
+        assert len(index) == len(PRODUCTS) - 1
+
+    def test_empty_query(self):
+        index = SearchIndex.build(PRODUCTS)
+        assert index.search("the and") == {}
+
+
+class TestSuggestIndex:
+    """Test typeahead suggestions from the prefix trie."""
+
+    def _texts(self, index, query, limit=10):
+        return [s.text for s in index.suggest(query, limit)]
+
+    def test_matches_start_of_any_word(self):
+        index = SuggestIndex.build(PRODUCTS)
+        assert self._texts(index, "hyd") == ["Hydrating Serum"]
+        assert self._texts(index, "acid") == ["Salicylic Acid", "Hyaluronic Acid"]
+        assert self._texts(index, "ydr") == []
+
+    def test_ranked_by_product_count(self):
+        """Suggestions covering more products come first."""
+        index = SuggestIndex.build(PRODUCTS)
+        assert self._texts(index, "mois") == ["Moisturizer", "Daily Moisturizer"]
+        assert index.suggest("mois")[0].count == 2
+        assert index.suggest("mois")[0].kind == "product_type"
+        assert index.suggest("daily")[0].product_id == "p2"
+
+    def test_every_word_must_match(self):
+        index = SuggestIndex.build(PRODUCTS)
+        assert self._texts(index, "night cr") == ["Night Cream"]
+        assert self._texts(index, "cr night") == ["Night Cream"]
+        assert self._texts(index, "night ser") == []
+
+    def test_build_matches_incremental_adds(self):
+        built = SuggestIndex.build(PRODUCTS)
+        added = SuggestIndex()
+        for product in PRODUCTS:
+            added.add(product)
+        for query in ["s", "acid", "mois", "night c", "c"]:
+            assert self._texts(built, query) == self._texts(added, query)
+
+    def test_limit(self):
+        index = SuggestIndex.build(PRODUCTS)
+        assert len(index.suggest("s", limit=2)) == 2
+        assert index.suggest("") == []
+
+    def test_incremental_updates(self):
+        """Cached completions are refreshed after writes."""
+        index = SuggestIndex.build(PRODUCTS)
+        assert self._texts(index, "ret") == ["Retinol"]
+
+        index.add(_product("p4", "Night Cream", product_type="Moisturizer", key_ingredients=["Peptides"]))
+        assert self._texts(index, "ret") == []
+        assert index.suggest("mois")[0].count == 2
+
+        index.add(_product("p6", "Retinol Night Serum", product_type="Serum", key_ingredients=["Retinol"]))
+        assert self._texts(index, "ret") == ["Retinol", "Retinol Night Serum"]
+        assert self._texts(index, "seru")[0] == "Serum"
+        assert index.suggest("seru")[0].count == 2
+
+        index.remove("p2")
+        index.add({**PRODUCTS[0], "is_active": False})
+        assert self._texts(index, "hyd") == []
+        assert self._texts(index, "daily") == []
+        assert index.suggest("mois")[0].count == 1
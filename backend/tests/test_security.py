@@ -0,0 +1,134 @@
+"""
+Tests for local JWT verification.
+"""
+import time
+
+import httpx
+import pytest
+from jose import jwt
+from unittest.mock import AsyncMock, patch
+
+from app.shared.jwt_verifier import (
+    InvalidTokenError,
+    JWTVerifier,
+    LocalVerificationUnavailable,
+)
+
+
+SECRET = "test-jwt-secret"
+JWKS_URL = "https://example.supabase.co/auth/v1/.well-known/jwks.json"
+
+
+def _token(secret=SECRET, expires_in=3600, **claims):
+    payload = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + expires_in,
+        **claims,
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def _mock_jwks(handler):
+    """Route the verifier's JWKS fetches through a mock transport."""
+    real_client = httpx.AsyncClient
+    return patch(
+        "app.shared.jwt_verifier.httpx.AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+
+
+class TestJWTVerifier:
+    """Test verifying tokens without calling the auth server."""
+
+    @pytest.mark.asyncio
+    async def test_valid_hs256_token(self):
+        """A token signed with the project secret is accepted locally."""
+        verifier = JWTVerifier(JWKS_URL, secret=SECRET)
+        claims = await verifier.verify(_token())
+        assert claims["sub"] == "user-1"
+        assert claims["email"] == "user@example.com"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("token", [
+        _token(expires_in=-60),
+        _token(secret="wrong-secret"),
+        _token(aud="anon"),
+        "not-a-jwt",
+    ])
+    async def test_rejected_tokens(self, token):
+        """Expired, forged, wrong-audience and malformed tokens are invalid."""
+        verifier = JWTVerifier(JWKS_URL, secret=SECRET)
+        with pytest.raises(InvalidTokenError):
+            await verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_hs256_without_secret_is_unavailable(self):
+        """Without a configured secret the caller must verify remotely."""
+        verifier = JWTVerifier(JWKS_URL)
+        with pytest.raises(LocalVerificationUnavailable):
+            await verifier.verify(_token())
+
+    @pytest.mark.asyncio
+    async def test_jwks_fetched_once(self):
+        """Signing keys are cached across requests until the TTL expires."""
+        jwk = {"kty": "RSA", "kid": "key-1", "n": "abc", "e": "AQAB"}
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"keys": [jwk]})
+
+        verifier = JWTVerifier(JWKS_URL)
+        with _mock_jwks(handler):
+            for _ in range(3):
+                assert await verifier._get_signing_key("key-1") == jwk
+        assert len(requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_falls_back(self):
+        """A key we can't find (even after refresh) defers to the auth server."""
+        verifier = JWTVerifier(JWKS_URL)
+        with _mock_jwks(lambda request: httpx.Response(200, json={"keys": []})):
+            with pytest.raises(LocalVerificationUnavailable):
+                await verifier._get_signing_key("rotated-key")
+
+
+class TestGetCurrentUser:
+    """Test the auth dependency's local / remote split."""
+
+    @pytest.mark.asyncio
+    @patch("app.shared.security.get_supabase_async_client", new_callable=AsyncMock)
+    @patch("app.services.auth.service.UserRepository.get_profile_by_id")
+    async def test_local_token_skips_auth_server(self, mock_get_profile, mock_supabase, client):
+        """With the secret configured, /me makes no remote get_user call."""
+        mock_get_profile.return_value = {"role": "customer", "created_at": "2024-01-01T00:00:00Z"}
+
+        with patch("app.shared.security.get_jwt_verifier", return_value=JWTVerifier(JWKS_URL, secret=SECRET)):
+            response = await client.get("/auth/me", headers={"Authorization": f"Bearer {_token()}"})
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "user@example.com"
+        mock_supabase.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.shared.security.get_supabase_async_client", new_callable=AsyncMock)
+    async def test_expired_token_rejected_locally(self, mock_supabase, client):
+        """Expired tokens get a 401 without contacting the auth server."""
+        with patch("app.shared.security.get_jwt_verifier", return_value=JWTVerifier(JWKS_URL, secret=SECRET)):
+            response = await client.get(
+                "/auth/me",
+                headers={"Authorization": f"Bearer {_token(expires_in=-60)}"},
+            )
+
+        assert response.status_code == 401
+        mock_supabase.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.shared.security.get_supabase_async_client", new_callable=AsyncMock)
+    async def test_malformed_token_rejected(self, mock_supabase, client):
+        """Garbage bearer tokens are rejected before any network call."""
+        response = await client.get("/auth/me", headers={"Authorization": "Bearer garbage"})
+        assert response.status_code == 401
+        mock_supabase.assert_not_awaited()
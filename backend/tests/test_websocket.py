@@ -0,0 +1,112 @@
+"""
+Tests for WebSocket fan-out.
+"""
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from app.shared.websocket import ConnectionManager
+
+
+class FakeSocket:
+    """Records sent text; `delay` of None blocks sends forever."""
+
+    def __init__(self, delay: float | None = 0):
+        self.delay = delay
+        self.messages: list[str] = []
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.delay is None:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.messages.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestConnectionManager:
+    """Test queued broadcasts."""
+
+    @pytest.mark.asyncio
+    async def test_serializes_once_per_broadcast(self):
+        manager = ConnectionManager()
+        sockets = [FakeSocket() for _ in range(50)]
+        for socket in sockets:
+            await manager.connect(socket)
+
+        with patch("app.shared.websocket.json.dumps", wraps=json.dumps) as dumps:
+            await manager.broadcast({"type": "product_updated", "product": {"id": "p1"}})
+        await _drain()
+
+        assert dumps.call_count == 1
+        assert all(socket.messages == ['{"type":"product_updated","product":{"id":"p1"},"seq":1}'] for socket in sockets)
+        assert manager.stats()["sent"] == 50
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_others(self):
+        """A socket stuck past the send timeout is dropped by the next broadcast; others keep receiving."""
+        manager = ConnectionManager(send_timeout=0.05)
+        stuck, fast = FakeSocket(delay=None), FakeSocket()
+        await manager.connect(stuck)
+        await manager.connect(fast)
+
+        await manager.broadcast({"type": "product_deleted", "product_id": "p1"})
+        await _drain()
+        assert len(fast.messages) == 1
+
+        await asyncio.sleep(0.1)
+        await manager.broadcast({"type": "product_deleted", "product_id": "p2"})
+        # The background close is referenced until it finishes
+        assert len(manager._closing) == 1
+        await _drain()
+        assert not manager._closing
+        assert len(fast.messages) == 2
+        assert stuck.closed_with == 1013
+        assert manager.stats()["connections"] == {"products": 1}
+        assert manager.stats()["dropped"] == 1
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_backlog_keeps_newest_messages(self):
+        manager = ConnectionManager(queue_size=2)
+        slow = FakeSocket(delay=None)
+        await manager.connect(slow)
+
+        await manager.broadcast({"n": 0})
+        await _drain()
+        for i in range(1, 6):
+            await manager.broadcast({"n": i})
+
+        connection = manager.active_connections["products"][slow]
+        assert [json.loads(text)["n"] for text in connection.queue._queue] == [4, 5]
+        # The writer is stuck on message 0; 1-3 were dropped for newer ones
+        assert manager.stats()["coalesced"] == 3
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_writer(self):
+        manager = ConnectionManager()
+        socket = FakeSocket()
+        await manager.connect(socket)
+        writer = manager.active_connections["products"][socket].writer
+
+        manager.disconnect(socket)
+        await _drain()
+
+        assert writer.cancelled()
+        await manager.broadcast({"type": "product_created"})
+        assert socket.messages == []
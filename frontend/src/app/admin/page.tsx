@@ -57,7 +57,7 @@ export default function AdminDashboard() {
                 <div className="text-gray-400 group-hover:text-primary transition-colors">
                   <Icon size={24} strokeWidth={1.5} />
                 </div>
-                <span className={`flex items-center gap-1 text-[10px] font-bold px-2 py-1 rounded-sm uppercase tracking-wider ${
+                <span title={stat.change_label ?? undefined} className={`flex items-center gap-1 text-[10px] font-bold px-2 py-1 rounded-sm uppercase tracking-wider ${
                   stat.change_positive 
                     ? 'text-primary bg-accent' 
                     : 'text-red-600 bg-red-50'
@@ -69,6 +69,9 @@ export default function AdminDashboard() {
               <div>
                 <p className="text-xs font-medium text-gray-400 uppercase tracking-widest mb-2">{stat.name}</p>
                 <h3 className="text-2xl sm:text-3xl font-serif font-bold text-primary">{stat.value}</h3>
+                {stat.change_label && (
+                  <p className="text-[10px] text-gray-400 mt-2 tracking-wide">{stat.change}: {stat.change_label}</p>
+                )}
               </div>
             </div>
           );
@@ -33,7 +33,7 @@ const statusConfig = {
 
 export default function OrdersPage() {
   const router = useRouter();
-  const { data, isLoading, isError } = useOrders();
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } = useOrders();
   const [expandedOrder, setExpandedOrder] = React.useState<string | null>(null);
 
   useEffect(() => {
@@ -58,7 +58,7 @@ export default function OrdersPage() {
     );
   }
 
-  const orders = data?.orders || [];
+  const orders = data?.pages.flatMap((page) => page.orders) || [];
 
   return (
     <main className="flex min-h-screen flex-col bg-white">
@@ -78,7 +78,7 @@ export default function OrdersPage() {
               <h1 className="text-5xl md:text-7xl font-medium leading-none tracking-tight mb-4">
                 ORDER <span className="font-serif italic text-gray-300">HISTORY</span>
               </h1>
-              <p className="text-gray-500">{orders.length} orders placed</p>
+              <p className="text-gray-500">{orders.length}{hasNextPage ? '+' : ''} orders placed</p>
             </FadeIn>
           </div>
 
@@ -213,6 +213,17 @@ export default function OrdersPage() {
                   </FadeIn>
                 );
               })}
+              {hasNextPage && (
+                <div className="text-center pt-6">
+                  <Button onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                    {isFetchingNextPage ? (
+                      <Loader2 size={16} className="animate-spin mx-auto" />
+                    ) : (
+                      'Load more orders'
+                    )}
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </Container>
@@ -1,4 +1,6 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useRef } from 'react';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { ApiError } from '@/lib/api/client';
 import { 
   ordersService, 
   Order, 
@@ -20,11 +22,13 @@ export const ordersKeys = {
   adminDetail: (id: string) => [...ordersKeys.admin, 'detail', id] as const,
 };
 
-// Get all orders (user)
+// Get the user's orders, one cursor page at a time (newest first)
 export function useOrders() {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: ordersKeys.list(),
-    queryFn: () => ordersService.getOrders(),
+    queryFn: ({ pageParam }) => ordersService.getOrders(pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage: OrderListResponse) => lastPage.next_cursor ?? undefined,
     staleTime: 1000 * 60 * 5, // 5 minutes
   });
 }
@@ -38,13 +42,30 @@ export function useOrder(orderId: string) {
   });
 }
 
-// Create order
+// Create order. Each checkout attempt gets one Idempotency-Key, reused by
+// every retry of the same cart (automatic, or placing it again after an
+// error) so the order is placed once. A changed cart or a placed order
+// starts a new attempt.
 export function useCreateOrder() {
   const queryClient = useQueryClient();
+  const attemptRef = useRef<{ body: string; key: string } | null>(null);
+
+  const idempotencyKeyFor = (data: CreateOrderRequest) => {
+    const body = JSON.stringify(data);
+    let attempt = attemptRef.current;
+    if (!attempt || attempt.body !== body) {
+      attempt = attemptRef.current = { body, key: crypto.randomUUID() };
+    }
+    return attempt.key;
+  };
 
   return useMutation({
-    mutationFn: (data: CreateOrderRequest) => ordersService.createOrder(data),
+    mutationFn: (data: CreateOrderRequest) => ordersService.createOrder(data, idempotencyKeyFor(data)),
+    // Network errors and 5xx may have placed the order; the key makes retrying safe
+    retry: (failureCount, error) =>
+      failureCount < 2 && !(error instanceof ApiError && error.status < 500),
     onSuccess: () => {
+      attemptRef.current = null;
       queryClient.invalidateQueries({ queryKey: ordersKeys.all });
       toast.success('Order placed successfully!');
     },
@@ -9,6 +9,8 @@ interface WebSocketMessage {
   type: 'product_created' | 'product_updated' | 'product_deleted';
   product?: Product;
   product_id?: string;
+  // Per-worker sequence number; resets when reconnecting to another worker
+  seq?: number;
 }
 
 export function useProductsWebSocket() {
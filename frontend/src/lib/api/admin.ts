@@ -16,12 +16,15 @@ export interface AdminUser {
 
 export interface AdminUserListResponse {
   users: AdminUser[];
-  total: number;
+  total: number | null;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  next_cursor?: string | null;
 }
 
+export type CountMode = 'exact' | 'estimated' | 'none';
+
 export interface StoreSettings {
   id: string;
   store_name: string;
@@ -56,6 +59,8 @@ export interface DashboardStat {
   value: string;
   change: string;
   change_positive: boolean;
+  // What `change` measures, when it isn't obvious from the name
+  change_label?: string | null;
 }
 
 export interface RecentOrder {
@@ -79,8 +84,15 @@ export const adminService = {
     return apiClient<DashboardResponse>('/admin/dashboard');
   },
 
-  async getUsers(page: number = 1, pageSize: number = 20): Promise<AdminUserListResponse> {
-    return apiClient<AdminUserListResponse>(`/admin/users?page=${page}&page_size=${pageSize}`);
+  async getUsers(
+    page: number = 1,
+    pageSize: number = 20,
+    options: { cursor?: string; count?: CountMode } = {},
+  ): Promise<AdminUserListResponse> {
+    const params = new URLSearchParams({ page: page.toString(), page_size: pageSize.toString() });
+    if (options.cursor) params.set('cursor', options.cursor);
+    if (options.count) params.set('count', options.count);
+    return apiClient<AdminUserListResponse>(`/admin/users?${params.toString()}`);
   },
 
   async getUser(userId: string): Promise<AdminUser> {
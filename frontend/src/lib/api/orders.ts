@@ -27,14 +27,33 @@ export interface Order {
 
 export interface OrderListResponse {
   orders: Order[];
-  total: number;
+  next_cursor?: string | null;
+}
+
+// Lines are priced server-side from product IDs and quantities
+export interface OrderLine {
+  product_id: string;
+  quantity: number;
 }
 
 export interface CreateOrderRequest {
-  items: Omit<OrderItem, 'id'>[];
+  items: OrderLine[];
   shipping_address?: Record<string, unknown>;
 }
 
+export interface OrderQuoteItem extends Omit<OrderItem, 'id'> {
+  line_total: number;
+}
+
+export interface OrderQuote {
+  items: OrderQuoteItem[];
+  subtotal: number;
+  shipping: number;
+  tax: number;
+  total: number;
+  currency: string;
+}
+
 // Admin Types
 export interface AdminOrder {
   id: string;
@@ -60,33 +79,50 @@ export interface AdminOrderDetail extends AdminOrder {
 
 export interface AdminOrderListResponse {
   orders: AdminOrder[];
-  total: number;
+  total: number | null;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  next_cursor?: string | null;
 }
 
 export interface OrderFilters {
   page?: number;
   page_size?: number;
   status?: string;
+  cursor?: string;
+  count?: 'exact' | 'estimated' | 'none';
 }
 
 // API Service
 export const ordersService = {
   // User Orders
-  async getOrders(): Promise<OrderListResponse> {
-    return apiClient<OrderListResponse>('/orders');
+  async getOrders(cursor?: string, limit?: number): Promise<OrderListResponse> {
+    const params = new URLSearchParams();
+    if (cursor) params.append('cursor', cursor);
+    if (limit) params.append('limit', limit.toString());
+
+    const query = params.toString();
+    return apiClient<OrderListResponse>(`/orders${query ? `?${query}` : ''}`);
   },
 
   async getOrder(orderId: string): Promise<Order> {
     return apiClient<Order>(`/orders/${orderId}`);
   },
 
-  async createOrder(data: CreateOrderRequest): Promise<Order> {
+  // Reuse the same idempotencyKey when retrying so the order is placed once
+  async createOrder(data: CreateOrderRequest, idempotencyKey?: string): Promise<Order> {
     return apiClient<Order>('/orders', {
       method: 'POST',
       body: JSON.stringify(data),
+      headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
+    });
+  },
+
+  async quoteOrder(items: OrderLine[]): Promise<OrderQuote> {
+    return apiClient<OrderQuote>('/orders/quote', {
+      method: 'POST',
+      body: JSON.stringify({ items }),
     });
   },
 
@@ -96,6 +132,8 @@ export const ordersService = {
     if (filters.page) params.append('page', filters.page.toString());
     if (filters.page_size) params.append('page_size', filters.page_size.toString());
     if (filters.status) params.append('status', filters.status);
+    if (filters.cursor) params.append('cursor', filters.cursor);
+    if (filters.count) params.append('count', filters.count);
     
     const query = params.toString();
     return apiClient<AdminOrderListResponse>(`/admin/orders${query ? `?${query}` : ''}`);
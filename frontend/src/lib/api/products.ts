@@ -22,10 +22,11 @@ export interface Product {
 
 export interface ProductListResponse {
   products: Product[];
-  total: number;
+  total: number | null;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  next_cursor?: string | null;
 }
 
 export interface ProductFilters {
@@ -36,6 +37,54 @@ export interface ProductFilters {
   usage_times: string[];
 }
 
+export interface FacetOption {
+  value: string;
+  count: number;
+}
+
+export interface ProductFacets {
+  total: number;
+  product_types: FacetOption[];
+  skin_concerns: FacetOption[];
+  skin_types: FacetOption[];
+  key_ingredients: FacetOption[];
+  usage_times: FacetOption[];
+}
+
+export interface ProductSuggestion {
+  text: string;
+  kind: 'product' | 'product_type' | 'ingredient';
+  product_id: string | null;
+  count: number;
+}
+
+export interface ProductSuggestResponse {
+  query: string;
+  suggestions: ProductSuggestion[];
+}
+
+export interface ProductFilterParams {
+  product_type?: string | string[];
+  skin_concern?: string | string[];
+  skin_type?: string | string[];
+  key_ingredient?: string | string[];
+  usage_time?: string | string[];
+  search?: string;
+  match?: 'any' | 'all';
+}
+
+// Facets accept several values; repeat the parameter for each
+function appendFilterParams(searchParams: URLSearchParams, params?: ProductFilterParams) {
+  for (const facet of ['product_type', 'skin_concern', 'skin_type', 'key_ingredient', 'usage_time'] as const) {
+    const values = params?.[facet];
+    for (const value of Array.isArray(values) ? values : values ? [values] : []) {
+      searchParams.append(facet, value);
+    }
+  }
+  if (params?.search) searchParams.set('search', params.search);
+  if (params?.match) searchParams.set('match', params.match);
+}
+
 export interface ProductCreate {
   name: string;
   description?: string;
@@ -57,23 +106,16 @@ export interface ProductUpdate extends Partial<ProductCreate> {}
 // API Service
 export const productsService = {
   // Public endpoints
-  async getProducts(params?: {
+  async getProducts(params?: ProductFilterParams & {
     page?: number;
     page_size?: number;
-    product_type?: string;
-    skin_concern?: string;
-    skin_type?: string;
-    usage_time?: string;
-    search?: string;
+    cursor?: string;
   }): Promise<ProductListResponse> {
     const searchParams = new URLSearchParams();
     if (params?.page) searchParams.set('page', params.page.toString());
     if (params?.page_size) searchParams.set('page_size', params.page_size.toString());
-    if (params?.product_type) searchParams.set('product_type', params.product_type);
-    if (params?.skin_concern) searchParams.set('skin_concern', params.skin_concern);
-    if (params?.skin_type) searchParams.set('skin_type', params.skin_type);
-    if (params?.usage_time) searchParams.set('usage_time', params.usage_time);
-    if (params?.search) searchParams.set('search', params.search);
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
+    appendFilterParams(searchParams, params);
     
     const query = searchParams.toString();
     return apiClient<ProductListResponse>(`/products${query ? `?${query}` : ''}`);
@@ -87,16 +129,32 @@ export const productsService = {
     return apiClient<ProductFilters>('/products/filters');
   },
 
+  async getFacets(params?: ProductFilterParams): Promise<ProductFacets> {
+    const searchParams = new URLSearchParams();
+    appendFilterParams(searchParams, params);
+    
+    const query = searchParams.toString();
+    return apiClient<ProductFacets>(`/products/facets${query ? `?${query}` : ''}`);
+  },
+
+  async getSuggestions(query: string, limit?: number): Promise<ProductSuggestResponse> {
+    const searchParams = new URLSearchParams({ q: query });
+    if (limit) searchParams.set('limit', limit.toString());
+    return apiClient<ProductSuggestResponse>(`/products/suggest?${searchParams.toString()}`);
+  },
+
   // Admin endpoints
   async adminGetProducts(params?: {
     page?: number;
     page_size?: number;
     search?: string;
+    cursor?: string;
   }): Promise<ProductListResponse> {
     const searchParams = new URLSearchParams();
     if (params?.page) searchParams.set('page', params.page.toString());
     if (params?.page_size) searchParams.set('page_size', params.page_size.toString());
     if (params?.search) searchParams.set('search', params.search);
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
     
     const query = searchParams.toString();
     return apiClient<ProductListResponse>(`/admin/products${query ? `?${query}` : ''}`);